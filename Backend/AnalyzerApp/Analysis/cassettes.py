@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from AnalyzerApp.Analysis.providers import LLMProvider, Completion, CancelledError
+
+
+class CassetteMiss(KeyError):
+    """Raised in replay mode when no recording exists for a request."""
+
+
+# Stable hash of everything that determines a completion
+def request_key(messages, model, temperature, max_tokens=None):
+    payload = json.dumps(
+        {"messages": messages, "model": model, "temperature": temperature, "max_tokens": max_tokens},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CassetteProvider(LLMProvider):
+    """
+    Record/replay layer under the LLM client.
+
+    record: forwards to `inner` and stores request hash -> response (content,
+            model, usage and original latency) in the cassette file.
+    replay: serves recorded responses without network access, sleeping for
+            the recorded latency (latency="recorded") or not at all
+            (latency="zero"). Unknown requests raise CassetteMiss.
+    """
+
+    name = "cassette"
+
+    def __init__(self, path, mode="replay", inner=None, latency="recorded"):
+        super().__init__()
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Invalid cassette mode: {mode}. Use record or replay")
+        if mode == "record" and inner is None:
+            raise ValueError("Record mode needs an inner provider")
+        self.path = path
+        self.mode = mode
+        self.inner = inner
+        self.latency = latency
+        self._lock = threading.Lock()
+        self.interactions = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f).get("interactions", {})
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = {"version": 1, "interactions": self.interactions}
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, sort_keys=True, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+    def _complete(self, messages, model, temperature, max_tokens, cancel_event):
+        key = request_key(messages, model, temperature, max_tokens)
+
+        if self.mode == "record":
+            completion = self.inner.complete(messages, model, temperature, max_tokens, cancel_event=cancel_event)
+            with self._lock:
+                self.interactions[key] = {
+                    "content": completion.content,
+                    "model": completion.model,
+                    "usage": completion.usage,
+                    "latency": completion.latency,
+                }
+            self.save()
+            return Completion(completion.content, completion.model, completion.usage)
+
+        recorded = self.interactions.get(key)
+        if recorded is None:
+            raise CassetteMiss(f"No cassette recording for request {key[:12]} in {self.path}")
+        if self.latency == "recorded" and recorded.get("latency"):
+            if cancel_event is not None:
+                if cancel_event.wait(recorded["latency"]):
+                    raise CancelledError("LLM request cancelled")
+            else:
+                time.sleep(recorded["latency"])
+        return Completion(recorded["content"], recorded.get("model", model), recorded.get("usage"))
+
+
+# Wrap a provider with a cassette when LLM_CASSETTE_MODE is set
+def cassette_from_env(provider):
+    """
+    LLM_CASSETTE_MODE     record | replay (unset disables cassettes)
+    LLM_CASSETTE_PATH     cassette file (default llm_cassette.json)
+    LLM_CASSETTE_LATENCY  recorded | zero, replay latency (default recorded)
+    """
+    mode = os.getenv("LLM_CASSETTE_MODE")
+    if not mode:
+        return provider
+    return CassetteProvider(
+        os.getenv("LLM_CASSETTE_PATH", "llm_cassette.json"),
+        mode=mode,
+        inner=provider if mode == "record" else None,
+        latency=os.getenv("LLM_CASSETTE_LATENCY", "recorded"),
+    )
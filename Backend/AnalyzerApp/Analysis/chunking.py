@@ -0,0 +1,158 @@
+import contextvars
+import math
+import os
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from AnalyzerApp.Analysis import metrics
+
+# Large experience/project lists are split into chunks that are generated
+# concurrently, each with the full job description, then merged by id.
+
+CHUNK_SIZE = int(os.getenv("LLM_CHUNK_SIZE", "2"))
+CHUNK_MIN_ITEMS = int(os.getenv("LLM_CHUNK_MIN_ITEMS", "4"))
+CHUNK_MAX_WORKERS = int(os.getenv("LLM_CHUNK_MAX_WORKERS", "6"))
+
+# How often one leading verb may open a bullet across the whole section
+MAX_VERB_REPEATS = 2
+
+# Interchangeable resume action verbs; a repeated verb is swapped for an unused one from its group
+VERB_GROUPS = [
+    ["built", "developed", "engineered", "implemented", "created", "constructed", "assembled"],
+    ["designed", "architected", "devised", "modeled", "drafted", "formulated"],
+    ["led", "spearheaded", "directed", "headed", "championed", "steered"],
+    ["improved", "enhanced", "optimized", "refined", "strengthened", "upgraded", "elevated"],
+    ["reduced", "cut", "decreased", "lowered", "minimized", "trimmed"],
+    ["increased", "boosted", "raised", "grew", "expanded", "amplified"],
+    ["accelerated", "sped", "expedited", "fast-tracked"],
+    ["streamlined", "simplified", "consolidated", "standardized"],
+    ["managed", "oversaw", "coordinated", "supervised", "administered", "orchestrated"],
+    ["automated", "scripted", "mechanized"],
+    ["migrated", "transitioned", "ported", "moved", "modernized"],
+    ["analyzed", "evaluated", "assessed", "examined", "investigated", "audited"],
+    ["collaborated", "partnered", "cooperated", "teamed"],
+    ["deployed", "launched", "released", "shipped", "delivered", "introduced"],
+    ["integrated", "connected", "unified", "combined"],
+    ["maintained", "supported", "sustained", "operated"],
+    ["monitored", "tracked", "measured", "observed"],
+    ["resolved", "fixed", "troubleshot", "debugged", "remediated"],
+    ["mentored", "coached", "trained", "guided"],
+    ["established", "instituted", "founded", "initiated", "pioneered"],
+]
+SYNONYMS = {verb: group for group in VERB_GROUPS for verb in group}
+
+leading_word = re.compile(r"^(\W*)([A-Za-z][A-Za-z-]*)")
+
+
+def split_chunks(items, size=CHUNK_SIZE):
+    """Split items into contiguous chunks of near-equal requested bullet count."""
+    n = math.ceil(len(items) / size)
+    weights = [max(int(item.get("resume_points") or 1), 1) for item in items]
+    target = sum(weights) / n
+    chunks, current, load = [], [], 0
+    for item, weight in zip(items, weights):
+        remaining_chunks = n - len(chunks)
+        if current and (load + weight / 2 > target or len(current) >= size) and remaining_chunks > 1:
+            chunks.append(current)
+            current, load = [], 0
+        current.append(item)
+        load += weight
+    chunks.append(current)
+    return chunks
+
+
+def _id_order(value):
+    try:
+        return 0, int(value)
+    except (TypeError, ValueError):
+        return 1, str(value)
+
+
+def _match_case(word, like):
+    if like.isupper() and len(like) > 1:
+        return word.upper()
+    if like[:1].isupper():
+        return word[:1].upper() + word[1:]
+    return word
+
+
+# Swap repeated leading verbs across all bullets of a section
+def dedupe_leading_verbs(output, points_key):
+    """
+    Args:
+        output: Merged generator output
+        points_key: Key holding the bullet list ("resume_points" or "project_points")
+
+    Returns:
+        int: Number of bullets rewritten (output is updated in place)
+    """
+    uses = Counter()
+    for item in output:
+        for point in item.get(points_key, []):
+            match = leading_word.match(point)
+            if match:
+                uses[match.group(2).lower()] += 1
+
+    seen = Counter()
+    rewritten = 0
+    for item in output:
+        points = item.get(points_key, [])
+        for i, point in enumerate(points):
+            match = leading_word.match(point)
+            if not match:
+                continue
+            verb = match.group(2).lower()
+            seen[verb] += 1
+            if seen[verb] <= MAX_VERB_REPEATS or verb not in SYNONYMS:
+                continue
+            replacement = next((v for v in SYNONYMS[verb] if uses[v] == 0), None)
+            if replacement is None:
+                replacement = min(SYNONYMS[verb], key=lambda v: (uses[v], SYNONYMS[verb].index(v)))
+                if uses[replacement] >= MAX_VERB_REPEATS:
+                    continue
+            uses[replacement] += 1
+            uses[verb] -= 1
+            seen[verb] -= 1
+            points[i] = match.group(1) + _match_case(replacement, match.group(2)) + point[match.end():]
+            rewritten += 1
+    return rewritten
+
+
+# Generate a section in concurrent chunks when it has many items
+def generate_chunked(generate, job_role, job_description, items, additional_instruction, id_key, points_key):
+    """
+    Args:
+        generate: llm_code generator taking (job_role, job_description, items, additional_instruction)
+        job_role: Target job role
+        job_description: Job description shared by every chunk
+        items: Experience or project inputs, each with an id and "resume_points" count
+        additional_instruction: Optional custom instruction passed to every chunk
+        id_key: "experience_id" or "project_id"
+        points_key: Output key holding the bullets
+
+    Returns:
+        list: Merged output in id order
+    """
+    if CHUNK_SIZE <= 0 or len(items) < CHUNK_MIN_ITEMS:
+        return generate(job_role, job_description, items, additional_instruction)
+
+    chunks = split_chunks(items)
+    metrics.incr("chunking.requests")
+    metrics.incr("chunking.chunks", len(chunks))
+    with ThreadPoolExecutor(max_workers=min(CHUNK_MAX_WORKERS, len(chunks))) as executor:
+        # Each worker runs in a copy of the caller's context so token usage is still attributed
+        futures = [
+            executor.submit(contextvars.copy_context().run, generate, job_role, job_description, chunk, additional_instruction)
+            for chunk in chunks
+        ]
+        try:
+            results = [f.result() for f in futures]
+        except Exception:
+            for f in futures:
+                f.cancel()
+            raise
+
+    merged = sorted((item for result in results for item in result), key=lambda item: _id_order(item.get(id_key)))
+    metrics.incr("chunking.verbs_rewritten", dedupe_leading_verbs(merged, points_key))
+    return merged
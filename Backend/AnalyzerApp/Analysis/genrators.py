@@ -1,5 +1,5 @@
 import os
-from AnalyzerApp.Analysis import llm_code
+from AnalyzerApp.Analysis import llm_code, chunking
 import sqlite3
 import pandas as pd
 
@@ -24,8 +24,8 @@ def generate_experience_output(job_role, job_description, experiences_points_cou
         for i in range(len(experiences_input)):
             experiences_input[i]["resume_points"] = experiences_points_count[i]
 
-        # Generate experience output
-        llm_output = llm_code.generate_enhanced_experience_points(job_role, job_description, experiences_input, None if additional_instruction=="" else additional_instruction)
+        # Generate experience output (in concurrent chunks for long lists)
+        llm_output = chunking.generate_chunked(llm_code.generate_enhanced_experience_points, job_role, job_description, experiences_input, None if additional_instruction=="" else additional_instruction, "experience_id", "resume_points")
 
         experience_output= []
         for llm_experience in llm_output:
@@ -67,8 +67,8 @@ def generate_project_output(job_role, job_description, project_points_count, add
         for i in range(len(projects_input)):
             projects_input[i]["resume_points"] = project_points_count[i]
 
-        # Generate project output
-        project_output = llm_code.generate_enhanced_project_points(job_role, job_description, projects_input, None if additional_instruction=="" else additional_instruction)
+        # Generate project output (in concurrent chunks for long lists)
+        project_output = chunking.generate_chunked(llm_code.generate_enhanced_project_points, job_role, job_description, projects_input, None if additional_instruction=="" else additional_instruction, "project_id", "project_points")
 
         return project_output
     except Exception as e:
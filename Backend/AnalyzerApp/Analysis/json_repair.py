@@ -0,0 +1,177 @@
+import json
+import re
+
+# Quote characters LLMs commonly emit instead of plain ASCII quotes
+DOUBLE_SMART_QUOTES = "“”„‟"
+SINGLE_SMART_QUOTES = "‘’‚‛"
+
+CLOSING = {"[": "]", "{": "}"}
+
+fence_pattern = re.compile(r"```[a-zA-Z]*\s*(.*?)\s*(```|$)", re.DOTALL)
+
+
+class JSONRepairError(ValueError):
+    """Raised when a completion cannot be turned into valid JSON."""
+
+
+# Strip markdown code fences and leading/trailing prose around the JSON payload
+def extract_json_candidate(text, root="["):
+    """
+    Return the substring of an LLM completion that most likely holds the JSON
+    document, starting at the first `root` bracket (or any bracket if absent).
+    """
+    fenced = fence_pattern.search(text)
+    if fenced and any(c in fenced.group(1) for c in "[{"):
+        text = fenced.group(1)
+
+    start = text.find(root)
+    if start == -1:
+        starts = [i for i in (text.find("["), text.find("{")) if i != -1]
+        if not starts:
+            return text.strip()
+        start = min(starts)
+    return text[start:]
+
+
+# Single pass scanner that rewrites the common LLM JSON defects
+def repair_json(text):
+    """
+    Rewrite a malformed JSON document into valid JSON where possible.
+
+    Handles smart quotes used as delimiters, single-quoted keys/strings,
+    trailing commas, trailing prose after the root value and truncated
+    output (unterminated strings and unclosed brackets).
+
+    Returns:
+        List of candidate JSON strings, most faithful first. For truncated
+        output that is the document without its incomplete last element; the
+        incomplete element closed in place comes last.
+    """
+    out = []
+    stack = []
+    quote = None          # Characters that close the current string, None outside strings
+    escaped = False
+    last_safe = None      # (output length, stack snapshot) after the last complete element
+
+    i = 0
+    while i < len(text):
+        ch = text[i]
+
+        if quote is not None:
+            if escaped:
+                escaped = False
+                if ch == "'":
+                    # \' is not a valid JSON escape, keep only the quote
+                    out[-1] = "'"
+                else:
+                    out.append(ch)
+            elif ch == "\\":
+                escaped = True
+                out.append(ch)
+            elif ch in quote:
+                quote = None
+                out.append('"')
+            elif ch == '"':
+                out.append('\\"')
+            elif ch == "\n":
+                out.append("\\n")
+            else:
+                out.append(ch)
+            i += 1
+            continue
+
+        if ch == '"':
+            quote = '"'
+            out.append('"')
+        elif ch in DOUBLE_SMART_QUOTES:
+            quote = DOUBLE_SMART_QUOTES + '"'
+            out.append('"')
+        elif ch == "'" or ch in SINGLE_SMART_QUOTES:
+            quote = "'" + SINGLE_SMART_QUOTES
+            out.append('"')
+        elif ch in CLOSING:
+            stack.append(ch)
+            out.append(ch)
+        elif ch in "]}":
+            # Drop a trailing comma before the closing bracket
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+            if stack:
+                out.append(CLOSING[stack.pop()])
+            if not stack:
+                return [''.join(out)]
+            last_safe = (len(out), list(stack))
+        elif ch == ",":
+            last_safe = (len(out), list(stack))
+            out.append(ch)
+        else:
+            out.append(ch)
+        i += 1
+
+    # Input ended before the root value was closed: the completion was truncated.
+    # Prefer dropping the half-written last element over closing it, so a cut-off
+    # bullet never comes back looking complete.
+    candidates = []
+    if last_safe is not None:
+        length, safe_stack = last_safe
+        trimmed = ''.join(out[:length]).rstrip().rstrip(",")
+        candidates.append(trimmed + ''.join(CLOSING[b] for b in reversed(safe_stack)))
+
+    closed = list(out)
+    if quote is not None:
+        closed.append('"')
+    while closed and closed[-1].isspace():
+        closed.pop()
+    if closed and closed[-1] == ",":
+        closed.pop()
+    candidates.append(''.join(closed) + ''.join(CLOSING[b] for b in reversed(stack)))
+    return candidates
+
+
+def _parse(candidates, root):
+    expected = list if root == "[" else dict
+    for candidate in candidates:
+        try:
+            value = json.loads(candidate, strict=False)
+        except ValueError:
+            continue
+        if isinstance(value, expected):
+            return value
+    return None
+
+
+# Parse an LLM completion as JSON, repairing locally before asking the model
+def loads_with_repair(text, root="[", fixer=None):
+    """
+    Parse JSON from an LLM completion with a tolerant repair stage.
+
+    Args:
+        text: Raw completion text
+        root: Expected root bracket, "[" or "{"
+        fixer: Optional callable taking the broken JSON text and returning a
+            corrected completion (e.g. a cheap re-prompt). Only used when
+            local repair fails.
+
+    Returns:
+        Parsed JSON value
+    """
+    candidate = extract_json_candidate(text, root)
+    value = _parse([candidate], root)
+    if value is not None:
+        return value
+
+    value = _parse(repair_json(candidate), root)
+    if value is not None:
+        print("Repaired malformed JSON completion locally")
+        return value
+
+    if fixer is not None:
+        print("Local JSON repair failed, re-prompting with the broken text")
+        fixed = extract_json_candidate(fixer(candidate), root)
+        value = _parse([fixed] + repair_json(fixed), root)
+        if value is not None:
+            return value
+
+    raise JSONRepairError("Could not parse JSON from the model response")
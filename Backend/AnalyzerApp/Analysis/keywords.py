@@ -0,0 +1,67 @@
+import re
+import unicodedata
+
+# Keeps technology tokens intact: c++, c#, node.js, asp.net, s3
+token_pattern = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+
+
+def _stem(token):
+    # Light plural folding so "APIs" matches "API"; applied to catalog and text alike
+    if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+
+STOPWORDS = frozenset(_stem(w) for w in """
+a about above across after all also an and any are as at be been being both but by can could did do does
+doing each either etc for from had has have having he her here his how i if in into is it its just may
+me more most must my no nor not of on one or other our out over own per plus she should so some such than
+that the their them then there these they this those through to too under until up upon us using very via
+was we well were what when where which while who whom why will with within without would you your
+ability able across experience experiences work working team teams role roles strong year years knowledge
+understanding skill skills including include includes require requires required requirements preferred need needs
+looking join help new
+""".split())
+
+
+def normalize(text):
+    return unicodedata.normalize('NFKC', text or '').lower()
+
+
+# Split text into normalized tokens
+def tokenize(text):
+    return [_stem(t) for t in token_pattern.findall(normalize(text))]
+
+
+# Content-bearing tokens of a text (stopwords and single characters removed)
+def keywords(text):
+    return [t for t in tokenize(text) if t not in STOPWORDS and len(t) > 1]
+
+
+class CatalogMatcher:
+    """Finds catalog skill names (single or multi-word) mentioned in free text."""
+
+    def __init__(self, skills):
+        """
+        Args:
+            skills: Iterable of (skill_id, skill_name)
+        """
+        self.phrases = {}
+        self.names = {}
+        for skill_id, name in skills:
+            phrase = tuple(tokenize(name))
+            if phrase:
+                self.phrases.setdefault(phrase, skill_id)
+                self.names[skill_id] = name
+        self.max_len = max((len(p) for p in self.phrases), default=0)
+
+    def match(self, text):
+        """Return the set of skill IDs whose names appear in `text`."""
+        tokens = tokenize(text)
+        found = set()
+        for n in range(1, self.max_len + 1):
+            for i in range(len(tokens) - n + 1):
+                skill_id = self.phrases.get(tuple(tokens[i:i + n]))
+                if skill_id is not None:
+                    found.add(skill_id)
+        return found
@@ -1,29 +1,101 @@
-import groq
+import contextvars
 import dotenv
 import os
-import re
-import json
+from contextlib import contextmanager
+
+from AnalyzerApp.Analysis import usage, metrics, routing
+from AnalyzerApp.Analysis.json_repair import loads_with_repair
+from AnalyzerApp.Analysis.providers import provider_from_env
+from AnalyzerApp.Analysis.cassettes import cassette_from_env
 
 # Load environment variables
 dotenv.load_dotenv()
-groq_api_key = os.getenv("GROQ_API_KEY")
 model_name = os.getenv("MODEL_NAME")
 
-# Initialize Groq client
-client = groq.Client(api_key=groq_api_key)
+# Initialize LLM provider (Groq by default, optionally hedged with a backup,
+# optionally recorded to / replayed from a cassette)
+provider = cassette_from_env(provider_from_env())
 
-# Generate enhanced work experience points for job application
-def generate_enhanced_experience_points(job_role, job_description, work_experience, additional_instruction=None):
+# Cancel event of the work the current calls belong to (see cancellable)
+_cancel_event = contextvars.ContextVar("llm_cancel_event", default=None)
+
+
+# Pass `event` as the cancel event of every chat() made inside the block,
+# including those of chunk workers started with contextvars.copy_context()
+@contextmanager
+def cancellable(event):
+    token = _cancel_event.set(event)
+    try:
+        yield
+    finally:
+        _cancel_event.reset(token)
+
+# Send a chat completion through the configured provider
+def chat(messages, temperature, max_tokens=None, model=None):
+    """
+    Args:
+        messages: Chat messages in OpenAI format
+        temperature: Sampling temperature
+        max_tokens: Optional cap on completion tokens
+        model: Model to use instead of MODEL_NAME (see routing.py)
+
+    Returns:
+        Completion with content, model, usage and latency
+    """
+    completion = provider.complete(
+        messages, model=model or model_name, temperature=temperature, max_tokens=max_tokens,
+        cancel_event=_cancel_event.get(),
+    )
+    usage.record(completion)
+    metrics.observe(f"model.{completion.model}", completion.latency)
+    if max_tokens and (completion.usage.get("completion_tokens") or 0) >= max_tokens:
+        # Hit the cap; the JSON repair step will have to trim a truncated tail
+        metrics.incr(f"model.{completion.model}.capped")
+    return completion
+
+# Ask the model to fix a malformed JSON completion
+def fix_json_with_llm(broken_json):
+    """
+    Cheap low-temperature re-prompt that carries only the broken JSON text,
+    used when local repair cannot recover a completion.
+
+    Args:
+        broken_json: The malformed JSON text extracted from the completion
+
+    Returns:
+        Raw completion text expected to contain the corrected JSON
+    """
+    completion = chat(
+        messages=[
+            {
+                "role": "system",
+                "content": "You repair malformed JSON. Return only the corrected JSON with the same content, no commentary and no markdown."
+            },
+            {
+                "role": "user",
+                "content": broken_json
+            }
+        ],
+        temperature=0,
+        max_tokens=len(broken_json) // 3 + 256,
+    )
+    return completion.content
+
+# Parse a JSON array from a completion, repairing locally before re-prompting
+def parse_json_response(response_content):
+    return loads_with_repair(response_content, root="[", fixer=fix_json_with_llm)
+
+# Build the chat messages for experience generation
+def experience_messages(job_role, job_description, work_experience, additional_instruction=None):
     """
-    Generate enhanced work experience points tailored for a specific job application
-    using Groq API to optimize resume for ATS systems.
-    
     Args:
-        model_name: Groq model to use
         job_role: Target job role
         job_description: Job description with requirements
         work_experience: List of work experience data
-        additional_instruction: Optional custom instruction to modify LLM behavior, output format, or analysis approach
+        additional_instruction: Optional custom instruction
+
+    Returns:
+        System and user messages for the experience prompt
     """
 
     # Construct the prompt for the LLM
@@ -90,35 +162,52 @@ def generate_enhanced_experience_points(job_role, job_description, work_experien
     - Ensure the final bullets would make a recruiter for the target role confident enough to move this candidate to the interview stage and that the resume will pass ATS filters for this job.
     """
 
+    return [
+        {
+            "role": "system",
+            "content": "You are an expert resume writer specializing in ATS optimization and technical resume enhancement."
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+
+# Generate enhanced work experience points for job application
+def generate_enhanced_experience_points(job_role, job_description, work_experience, additional_instruction=None):
+    """
+    Generate enhanced work experience points tailored for a specific job application
+    using Groq API to optimize resume for ATS systems.
+    
+    Args:
+        model_name: Groq model to use
+        job_role: Target job role
+        job_description: Job description with requirements
+        work_experience: List of work experience data
+        additional_instruction: Optional custom instruction to modify LLM behavior, output format, or analysis approach
+    """
+
+    # Build the prompt
+    messages = experience_messages(job_role, job_description, work_experience, additional_instruction)
+
+    # Pick the model and completion cap from the request size
+    route = routing.route("experience", job_description, work_experience)
+
     try:
-        # Make API call to Groq
-        chat_completion = client.chat.completions.create(
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert resume writer specializing in ATS optimization and technical resume enhancement."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            model=model_name,
+        # Make API call to the LLM provider
+        completion = chat(
+            messages=messages,
             temperature=0.8,
+            max_tokens=route.max_tokens,
+            model=route.model,
         )
 
         # Extract the response
-        response_content = chat_completion.choices[0].message.content
+        response_content = completion.content
 
 
-        # Extract JSON from response (in case there's additional text)
-        json_match = re.search(r'\[.*\]', response_content, re.DOTALL)
-        if json_match:
-            json_str = json_match.group()
-            enhanced_experience = json.loads(json_str)
-        else:
-            # Fallback: try to parse entire response as JSON
-            enhanced_experience = json.loads(response_content)
+        # Extract JSON from response, repairing common formatting defects
+        enhanced_experience = parse_json_response(response_content)
 
         return enhanced_experience
 
@@ -126,21 +215,17 @@ def generate_enhanced_experience_points(job_role, job_description, work_experien
         print(f"Error generating enhanced experience points: {str(e)}")
         raise e
 
-# Generate enhanced project points for job application
-def generate_enhanced_project_points(job_role, job_description, project_info, additional_instruction=None):
+# Build the chat messages for project generation
+def project_messages(job_role, job_description, project_info, additional_instruction=None):
     """
-    Generate enhanced project points tailored for a specific job application
-    using Groq API to optimize resume for ATS systems.
-    
     Args:
-        model_name: Groq model to use (e.g., "openai/gpt-oss-120b")
         job_role: Target job role
         job_description: Job description with requirements
         project_info: List of dicts with project_id, project_name, project_description, project_skills, resume_points
-        additional_instruction: Optional custom instruction to modify LLM behavior, output format, or analysis approach
-    
+        additional_instruction: Optional custom instruction
+
     Returns:
-        List of dicts with project_id, project_name, project_points array, and project_skills array
+        System and user messages for the project prompt
     """
     
     # Construct the prompt for the LLM
@@ -189,35 +274,55 @@ def generate_enhanced_project_points(job_role, job_description, project_info, ad
 
     OUTPUT FORMAT: Valid JSON only, no explanations. Ensure project_skills match technologies used in project_points.
     """
+
+    return [
+        {
+            "role": "system",
+            "content": "You are an expert resume writer specializing in ATS optimization and technical resume enhancement for projects."
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+
+# Generate enhanced project points for job application
+def generate_enhanced_project_points(job_role, job_description, project_info, additional_instruction=None):
+    """
+    Generate enhanced project points tailored for a specific job application
+    using Groq API to optimize resume for ATS systems.
+    
+    Args:
+        model_name: Groq model to use (e.g., "openai/gpt-oss-120b")
+        job_role: Target job role
+        job_description: Job description with requirements
+        project_info: List of dicts with project_id, project_name, project_description, project_skills, resume_points
+        additional_instruction: Optional custom instruction to modify LLM behavior, output format, or analysis approach
     
+    Returns:
+        List of dicts with project_id, project_name, project_points array, and project_skills array
+    """
+
+    # Build the prompt
+    messages = project_messages(job_role, job_description, project_info, additional_instruction)
+
+    # Pick the model and completion cap from the request size
+    route = routing.route("project", job_description, project_info)
+
     try:
-        # Make API call to Groq
-        chat_completion = client.chat.completions.create(
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert resume writer specializing in ATS optimization and technical resume enhancement for projects."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            model=model_name,
+        # Make API call to the LLM provider
+        completion = chat(
+            messages=messages,
             temperature=0.8,
+            max_tokens=route.max_tokens,
+            model=route.model,
         )
 
         # Extract the response
-        response_content = chat_completion.choices[0].message.content
+        response_content = completion.content
 
-        # Extract JSON from response (in case there's additional text)
-        json_match = re.search(r'\[.*\]', response_content, re.DOTALL)
-        if json_match:
-            json_str = json_match.group()
-            enhanced_projects = json.loads(json_str)
-        else:
-            # Fallback: try to parse entire response as JSON
-            enhanced_projects = json.loads(response_content)
+        # Extract JSON from response, repairing common formatting defects
+        enhanced_projects = parse_json_response(response_content)
 
         return enhanced_projects
 
@@ -382,23 +487,20 @@ def generate_enhanced_project_points(job_role, job_description, project_info, ad
 #         print(f"Raw response: {response_content}")
 #         raise e
 
-# Enhanced Skills Generator with Web Research Integration
-def generate_optimized_skills_with_research(job_role, job_description, current_skills, enhanced_experience=None, enhanced_projects=None, include_web_research=True, additional_instruction=None):
+# Build the chat messages for skill generation
+def skill_messages(job_role, job_description, current_skills, enhanced_experience=None, enhanced_projects=None, include_web_research=True, additional_instruction=None):
     """
-    Generate an efficient ATS-optimized skills list focused on job description alignment.
-    
     Args:
-        model_name: Groq model to use
         job_role: Target job role
         job_description: Job description with requirements (PRIMARY FOCUS)
-        current_skills: List of dicts with skill_category and skill_names (PRESERVE existing)
+        current_skills: List of dicts with skill_category and skill_names
         enhanced_experience: List of experience data (for validation only)
         enhanced_projects: List of project data (for validation only)
         include_web_research: Whether to enable web research validation
         additional_instruction: Optional custom instruction
-    
+
     Returns:
-        Dict with optimized_skills list (100-120 chars per category) and metadata
+        System and user messages for the skills prompt
     """
     
     research_context = ""
@@ -529,34 +631,57 @@ def generate_optimized_skills_with_research(job_role, job_description, current_s
 
         Focus: Job description alignment + existing skills preservation + 100-120 char limit per category.
     """
+
+    return [
+        {
+            "role": "system",
+            "content": "You are an ATS optimization specialist. Focus on job description keywords, preserve existing relevant skills, and use specific tool names only. Keep each skill category within 100-120 characters total. Follow cloud platform detection rules and avoid generic terms."
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+
+# Enhanced Skills Generator with Web Research Integration
+def generate_optimized_skills_with_research(job_role, job_description, current_skills, enhanced_experience=None, enhanced_projects=None, include_web_research=True, additional_instruction=None):
+    """
+    Generate an efficient ATS-optimized skills list focused on job description alignment.
     
+    Args:
+        model_name: Groq model to use
+        job_role: Target job role
+        job_description: Job description with requirements (PRIMARY FOCUS)
+        current_skills: List of dicts with skill_category and skill_names (PRESERVE existing)
+        enhanced_experience: List of experience data (for validation only)
+        enhanced_projects: List of project data (for validation only)
+        include_web_research: Whether to enable web research validation
+        additional_instruction: Optional custom instruction
+    
+    Returns:
+        Dict with optimized_skills list (100-120 chars per category) and metadata
+    """
+
+    # Build the prompt
+    messages = skill_messages(job_role, job_description, current_skills, enhanced_experience, enhanced_projects, include_web_research, additional_instruction)
+
+    # Pick the model and completion cap from the request size
+    route = routing.route("skill", job_description, current_skills)
+
     try:
-        # Make API call to Groq
-        chat_completion = client.chat.completions.create(
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an ATS optimization specialist. Focus on job description keywords, preserve existing relevant skills, and use specific tool names only. Keep each skill category within 100-120 characters total. Follow cloud platform detection rules and avoid generic terms."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            model=model_name,
+        # Make API call to the LLM provider
+        completion = chat(
+            messages=messages,
             temperature=0.3,
+            max_tokens=route.max_tokens,
+            model=route.model,
         )
 
         # Extract the response
-        response_content = chat_completion.choices[0].message.content
-
-        # Extract JSON from response
-        json_match = re.search(r'\[.*\]', response_content, re.DOTALL)
-        if json_match:
-            json_str = json_match.group()
-            optimized_skills = json.loads(json_str)
-        else:
-            optimized_skills = json.loads(response_content)
+        response_content = completion.content
+
+        # Extract JSON from response, repairing common formatting defects
+        optimized_skills = parse_json_response(response_content)
 
         return optimized_skills
 
@@ -0,0 +1,66 @@
+import math
+import threading
+from collections import defaultdict, deque
+
+# In-process metrics for the LLM layer. Each Gunicorn worker keeps its own
+# counters, so the metrics endpoint reports the worker that served it.
+
+LATENCY_WINDOW = 500
+
+_lock = threading.Lock()
+_counters = defaultdict(int)
+_latencies = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+
+
+# Increment a named counter
+def incr(name, value=1):
+    with _lock:
+        _counters[name] += value
+
+
+# Record a latency sample (seconds) for a named timer
+def observe(name, seconds):
+    with _lock:
+        _latencies[name].append(seconds)
+
+
+# Percentile over a list of samples (nearest-rank)
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[index]
+
+
+# Recent samples recorded for a timer
+def samples(name):
+    with _lock:
+        return list(_latencies.get(name, ()))
+
+
+# Snapshot of all counters and latency summaries
+def snapshot():
+    with _lock:
+        counters = dict(_counters)
+        latencies = {name: list(values) for name, values in _latencies.items()}
+
+    latency_summary = {}
+    for name, values in latencies.items():
+        if not values:
+            continue
+        latency_summary[name] = {
+            "count": len(values),
+            "avg_ms": round(sum(values) / len(values) * 1000, 1),
+            "p50_ms": round(percentile(values, 50) * 1000, 1),
+            "p95_ms": round(percentile(values, 95) * 1000, 1),
+            "p99_ms": round(percentile(values, 99) * 1000, 1),
+        }
+    return {"counters": counters, "latency": latency_summary}
+
+
+# Clear all recorded metrics
+def reset():
+    with _lock:
+        _counters.clear()
+        _latencies.clear()
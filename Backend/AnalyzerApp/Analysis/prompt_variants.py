@@ -0,0 +1,83 @@
+from AnalyzerApp.Analysis import llm_code
+
+# Prompt variants compared by `manage.py benchmark_prompts`. "baseline" is
+# what production sends; a variant that wins is promoted by editing the
+# builder in llm_code.py and re-recording the benchmark baseline.
+
+
+# Build a shorter experience prompt with the same input block and output contract
+def compact_experience_messages(job_role, job_description, work_experience, additional_instruction=None):
+    """
+    Args:
+        job_role: Target job role
+        job_description: Job description with requirements
+        work_experience: List of work experience data
+        additional_instruction: Optional custom instruction
+
+    Returns:
+        System and user messages
+    """
+    prompt = f"""
+    Rewrite the candidate's experience as ATS-optimized resume bullets for this job.
+
+    Job Role: {job_role}
+    Job Description: {job_description}
+    Candidate Work Experience:"""
+
+    for i in work_experience:
+        prompt += f"""
+        Experience ID: {i["experience_id"]}:
+        Company: {i["experience_company_name"]}
+        Role: {i["experience_role"]}
+        Description: {i["experience_description"]}
+        Experience Points: {i["resume_points"]}
+        """
+
+    if additional_instruction:
+        prompt += f"""
+    ADDITIONAL INSTRUCTION (PRIORITY OVERRIDE): {additional_instruction}
+    """
+
+    prompt += """
+    Rules:
+    - First bullet summarizes the role; the rest follow What + How + Impact with a quantified outcome.
+    - 25-30 words per bullet, strong action verbs, JD keywords where credible, no skill more than 4 times overall.
+    - Keep each experience's real use cases; reframe them toward the job instead of inventing new projects.
+    - Exactly "Experience Points" bullets per experience.
+
+    Return only JSON:
+    [{"experience_id": "experience_id_from_input", "experience_role": "role_from_input", "resume_points": ["..."]}]
+    """
+
+    return [
+        {
+            "role": "system",
+            "content": "You are an expert resume writer specializing in ATS optimization."
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+
+
+# section -> variant name -> prompt builder
+VARIANTS = {
+    "experience": {
+        "baseline": llm_code.experience_messages,
+        "compact": compact_experience_messages,
+    },
+    "project": {
+        "baseline": llm_code.project_messages,
+    },
+    "skill": {
+        "baseline": llm_code.skill_messages,
+    },
+}
+
+# Sampling temperature production uses for each section
+TEMPERATURES = {
+    "experience": 0.8,
+    "project": 0.8,
+    "skill": 0.3,
+}
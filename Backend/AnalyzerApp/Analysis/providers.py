@@ -0,0 +1,412 @@
+import json
+import os
+import re
+import threading
+import time
+import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from AnalyzerApp.Analysis import metrics
+
+
+class Completion:
+    """Normalized chat completion returned by every provider."""
+
+    def __init__(self, content, model, usage=None, latency=0.0, provider=None):
+        self.content = content
+        self.model = model
+        self.usage = usage or {}
+        self.latency = latency
+        self.provider = provider
+
+    @property
+    def total_tokens(self):
+        return self.usage.get("total_tokens") or (
+            self.usage.get("prompt_tokens", 0) + self.usage.get("completion_tokens", 0)
+        )
+
+
+class LLMProvider:
+    """
+    Base provider. Subclasses implement `_complete`; `complete` adds timing
+    and metrics. `cancel_event` is a threading.Event the caller sets when the
+    result is no longer needed (e.g. the other side of a hedged request won).
+    """
+
+    name = "base"
+
+    def __init__(self, model=None):
+        # Optional model override, otherwise the caller's model is used
+        self.model = model
+
+    def complete(self, messages, model, temperature, max_tokens=None, cancel_event=None):
+        model = self.model or model
+        start = time.perf_counter()
+        try:
+            completion = self._complete(messages, model, temperature, max_tokens, cancel_event)
+        except Exception:
+            metrics.incr(f"llm.{self.name}.errors")
+            raise
+        completion.latency = time.perf_counter() - start
+        completion.provider = self.name
+        metrics.incr(f"llm.{self.name}.requests")
+        metrics.observe(f"llm.{self.name}", completion.latency)
+        return completion
+
+    def _complete(self, messages, model, temperature, max_tokens, cancel_event):
+        raise NotImplementedError
+
+
+class CancelledError(Exception):
+    """Raised by a provider that noticed its request was cancelled."""
+
+
+def _check_cancelled(cancel_event):
+    if cancel_event is not None and cancel_event.is_set():
+        raise CancelledError("LLM request cancelled")
+
+
+class GroqProvider(LLMProvider):
+    name = "groq"
+
+    def __init__(self, api_key=None, model=None):
+        super().__init__(model)
+        self.api_key = api_key
+        self._client = None
+
+    @property
+    def client(self):
+        # Created lazily so importing the analyzer does not require an API key
+        if self._client is None:
+            import groq
+            self._client = groq.Client(api_key=self.api_key)
+        return self._client
+
+    def _complete(self, messages, model, temperature, max_tokens, cancel_event):
+        _check_cancelled(cancel_event)
+        kwargs = {"messages": messages, "model": model, "temperature": temperature}
+        if max_tokens:
+            kwargs["max_tokens"] = max_tokens
+        chat_completion = self.client.chat.completions.create(**kwargs)
+        usage = {}
+        if chat_completion.usage is not None:
+            usage = {
+                "prompt_tokens": chat_completion.usage.prompt_tokens,
+                "completion_tokens": chat_completion.usage.completion_tokens,
+                "total_tokens": chat_completion.usage.total_tokens,
+            }
+        return Completion(chat_completion.choices[0].message.content, chat_completion.model or model, usage)
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """Any endpoint implementing POST {base_url}/chat/completions (vLLM, Ollama, OpenAI, ...)."""
+
+    name = "openai"
+
+    def __init__(self, base_url, api_key=None, model=None, timeout=60):
+        super().__init__(model)
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def _complete(self, messages, model, temperature, max_tokens, cancel_event):
+        _check_cancelled(cancel_event)
+        payload = {"model": model, "messages": messages, "temperature": temperature}
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        request = urllib.request.Request(
+            f"{self.base_url}/chat/completions",
+            data=json.dumps(payload).encode("utf-8"),
+            headers=headers,
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            body = json.loads(response.read().decode("utf-8"))
+        _check_cancelled(cancel_event)
+        return Completion(body["choices"][0]["message"]["content"], body.get("model", model), body.get("usage"))
+
+
+# Deterministic, schema-valid responses for the analyzer prompts
+def default_stub_response(messages):
+    prompt = messages[-1]["content"]
+
+    experience_ids = re.findall(r"Experience ID: (.+?):\s*\n", prompt)
+    if experience_ids:
+        roles = re.findall(r"\n\s*Role: (.*)", prompt)
+        counts = re.findall(r"Experience Points: (\d+)", prompt)
+        return json.dumps([
+            {
+                "experience_id": exp_id,
+                "experience_role": roles[i] if i < len(roles) else "",
+                "resume_points": [
+                    f"Delivered {roles[i] if i < len(roles) else 'role'} initiative {k + 1} aligned with the target job requirements, improving delivery speed by {10 + k}%."
+                    for k in range(int(counts[i]) if i < len(counts) else 1)
+                ],
+            }
+            for i, exp_id in enumerate(experience_ids)
+        ])
+
+    project_ids = re.findall(r"Project ID: (.+)", prompt)
+    if project_ids:
+        names = re.findall(r"\n\s*Name: (.*)", prompt)
+        counts = re.findall(r"Points Needed: (\d+)", prompt)
+        return json.dumps([
+            {
+                "project_id": int(project_id) if project_id.strip().isdigit() else project_id.strip(),
+                "project_name": names[i] if i < len(names) else "",
+                "project_points": [
+                    f"Built {names[i] if i < len(names) else 'project'} feature {k + 1} with job-relevant tooling, cutting processing time by {20 + k}%."
+                    for k in range(int(counts[i]) if i < len(counts) else 1)
+                ],
+                "project_skills": ["Python", "SQL"],
+            }
+            for i, project_id in enumerate(project_ids)
+        ])
+
+    if "broken" in messages[0]["content"].lower() or "malformed" in messages[0]["content"].lower():
+        return prompt
+
+    return json.dumps([
+        {"skill_category": "Programming Languages", "skills": ["Python", "SQL", "JavaScript"]},
+        {"skill_category": "Web Frameworks", "skills": ["Django", "ReactJS"]},
+    ])
+
+
+class StubProvider(LLMProvider):
+    """Local provider for development, tests and benchmarks. No network access."""
+
+    name = "stub"
+
+    def __init__(self, responder=None, latency=0.0, model=None):
+        super().__init__(model)
+        self.responder = responder or default_stub_response
+        self.latency = latency
+
+    def _complete(self, messages, model, temperature, max_tokens, cancel_event):
+        if self.latency:
+            if cancel_event is not None:
+                if cancel_event.wait(self.latency):
+                    raise CancelledError("LLM request cancelled")
+            else:
+                time.sleep(self.latency)
+        _check_cancelled(cancel_event)
+        content = self.responder(messages)
+        prompt_tokens = sum(len(m["content"]) for m in messages) // 4
+        completion_tokens = len(content) // 4
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        return Completion(content, model or "stub", usage)
+
+
+class HedgedProvider(LLMProvider):
+    """
+    Sends the request to `primary`; if it has not answered by the hedge
+    deadline, fires the same request at `backup` and returns whichever
+    finishes first. The loser is cancelled: it is dropped if it has not
+    started yet, otherwise its cancel event is set and its result discarded.
+
+    The deadline is the `percentile` of recent primary latencies, clamped to
+    [min_delay, max_delay]; until `min_samples` latencies are known,
+    `default_delay` is used. Every primary call that ran is sampled,
+    including those that lose: a cancelled one contributes the time it had
+    run, a lower bound, so slow primaries keep the deadline up. Primaries
+    dropped before they started, or cancelled by the caller, only measured
+    the queue or the caller and are not sampled. A primary error before the
+    deadline fails over to the backup immediately.
+
+    The caller's `cancel_event` is relayed to both requests: it is checked
+    every `cancel_poll` seconds while waiting, and once set the requests in
+    flight are cancelled and CancelledError is raised.
+
+    Primary and backup calls run on separate pools, so losers that ignore
+    cancellation (blocking HTTP calls) cannot queue the other side. At most
+    `max_hedges` hedges are in flight; past that the request waits for the
+    primary alone.
+    """
+
+    name = "hedged"
+
+    def __init__(self, primary, backup, percentile=95, min_delay=1.0, max_delay=30.0,
+                 default_delay=8.0, min_samples=20, window=200, max_workers=16, max_hedges=None,
+                 cancel_poll=0.05):
+        super().__init__()
+        self.primary = primary
+        self.backup = backup
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.default_delay = default_delay
+        self.min_samples = min_samples
+        self.cancel_poll = cancel_poll
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._hedge_slots = threading.BoundedSemaphore(max_hedges or max(1, max_workers // 2))
+        self._primary_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-primary")
+        self._backup_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-backup")
+
+    def hedge_delay(self):
+        with self._lock:
+            samples = list(self._latencies)
+        if len(samples) < self.min_samples:
+            return self.default_delay
+        return min(self.max_delay, max(self.min_delay, metrics.percentile(samples, self.percentile)))
+
+    def _record_primary(self, latency):
+        with self._lock:
+            self._latencies.append(latency)
+
+    def _sample_primary(self, future, start, cancel_event):
+        # Done-callback of every primary call, whether it won, lost or was dropped
+        if future.cancelled() or (cancel_event is not None and cancel_event.is_set()):
+            return
+        error = future.exception()
+        if error is None:
+            self._record_primary(future.result().latency)
+        elif isinstance(error, CancelledError):
+            self._record_primary(time.perf_counter() - start)
+
+    def _wait(self, futures, timeout, cancel_event):
+        """wait(FIRST_COMPLETED) that raises CancelledError once the caller's `cancel_event` is set."""
+        if cancel_event is None:
+            return wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            _check_cancelled(cancel_event)
+            step = self.cancel_poll if deadline is None else max(0, min(self.cancel_poll, deadline - time.perf_counter()))
+            done, pending = wait(futures, timeout=step, return_when=FIRST_COMPLETED)
+            if done or (deadline is not None and time.perf_counter() >= deadline):
+                return done, pending
+
+    def complete(self, messages, model, temperature, max_tokens=None, cancel_event=None):
+        start = time.perf_counter()
+        completion = self._complete(messages, model, temperature, max_tokens, cancel_event)
+        metrics.observe("llm.hedged", time.perf_counter() - start)
+        return completion
+
+    def _complete(self, messages, model, temperature, max_tokens, cancel_event):
+        metrics.incr("hedge.requests")
+        _check_cancelled(cancel_event)
+        args = (messages, model, temperature, max_tokens)
+        primary_cancel = threading.Event()
+        submitted = time.perf_counter()
+        primary_future = self._primary_executor.submit(self.primary.complete, *args, cancel_event=primary_cancel)
+        primary_future.add_done_callback(lambda f: self._sample_primary(f, submitted, cancel_event))
+        contenders = {primary_future: primary_cancel}
+        try:
+            return self._race(primary_future, contenders, args, cancel_event)
+        except CancelledError:
+            if cancel_event is not None and cancel_event.is_set():
+                metrics.incr("hedge.cancelled")
+                for future, future_cancel in contenders.items():
+                    future_cancel.set()
+                    future.cancel()
+            raise
+
+    def _race(self, primary_future, contenders, args, cancel_event):
+        done, _ = self._wait([primary_future], self.hedge_delay(), cancel_event)
+        if done and primary_future.exception() is None:
+            metrics.incr("hedge.not_fired")
+            return primary_future.result()
+
+        if done:
+            # Failing over is not duplicate work, so it does not need a hedge slot
+            metrics.incr("hedge.failover")
+            print(f"Primary LLM provider failed, failing over: {primary_future.exception()}")
+            slot = False
+        else:
+            slot = self._hedge_slots.acquire(blocking=False)
+            if not slot:
+                metrics.incr("hedge.suppressed")
+                self._wait([primary_future], None, cancel_event)
+                return primary_future.result()
+            metrics.incr("hedge.fired")
+
+        backup_cancel = threading.Event()
+        backup_future = self._backup_executor.submit(self.backup.complete, *args, cancel_event=backup_cancel)
+        if slot:
+            backup_future.add_done_callback(lambda f: self._hedge_slots.release())
+        contenders[backup_future] = backup_cancel
+        pending = set(contenders)
+        if done:
+            pending.discard(primary_future)
+
+        error = primary_future.exception() if done else None
+        while pending:
+            finished, pending = self._wait(pending, None, cancel_event)
+            for future in finished:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                # Cancel the loser
+                for other, other_cancel in contenders.items():
+                    if other is not future:
+                        other_cancel.set()
+                        other.cancel()
+                metrics.incr("hedge.primary_wins" if future is primary_future else "hedge.backup_wins")
+                return future.result()
+        raise error
+
+    def stats(self):
+        counters = metrics.snapshot()["counters"]
+        requests = counters.get("hedge.requests", 0)
+        fired = counters.get("hedge.fired", 0)
+        return {
+            "hedge_delay_s": round(self.hedge_delay(), 3),
+            "percentile": self.percentile,
+            "requests": requests,
+            "hedged": fired,
+            "failovers": counters.get("hedge.failover", 0),
+            "suppressed": counters.get("hedge.suppressed", 0),
+            "hedge_rate": round(fired / requests, 4) if requests else 0,
+            "primary_wins": counters.get("hedge.primary_wins", 0),
+            "backup_wins": counters.get("hedge.backup_wins", 0),
+        }
+
+
+# Build a single provider from environment variables with the given prefix
+def build_provider(kind, prefix="LLM"):
+    kind = (kind or "groq").lower()
+    model = os.getenv(f"{prefix}_MODEL_NAME") or None
+    if kind == "groq":
+        return GroqProvider(api_key=os.getenv("GROQ_API_KEY"), model=model)
+    if kind == "openai":
+        return OpenAICompatibleProvider(
+            base_url=os.getenv(f"{prefix}_BASE_URL", "http://localhost:8080/v1"),
+            api_key=os.getenv(f"{prefix}_API_KEY"),
+            model=model,
+            timeout=float(os.getenv(f"{prefix}_TIMEOUT", "60")),
+        )
+    if kind == "stub":
+        return StubProvider(latency=float(os.getenv(f"{prefix}_STUB_LATENCY", "0")), model=model)
+    raise ValueError(f"Unknown LLM provider: {kind}. Use groq, openai, or stub")
+
+
+# Build the analyzer's provider (optionally hedged) from environment variables
+def provider_from_env():
+    """
+    LLM_PROVIDER          groq | openai | stub (default groq)
+    LLM_BACKUP_PROVIDER   enables hedging when set; configured with LLM_BACKUP_* variables
+    LLM_HEDGE_PERCENTILE  primary latency percentile used as the hedge deadline (default 95)
+    LLM_HEDGE_MIN_DELAY / LLM_HEDGE_MAX_DELAY / LLM_HEDGE_DEFAULT_DELAY  seconds
+    LLM_HEDGE_MAX_IN_FLIGHT  hedges allowed at once (default 8)
+    """
+    primary = build_provider(os.getenv("LLM_PROVIDER", "groq"), "LLM")
+    backup_kind = os.getenv("LLM_BACKUP_PROVIDER")
+    if not backup_kind:
+        return primary
+    return HedgedProvider(
+        primary,
+        build_provider(backup_kind, "LLM_BACKUP"),
+        percentile=float(os.getenv("LLM_HEDGE_PERCENTILE", "95")),
+        min_delay=float(os.getenv("LLM_HEDGE_MIN_DELAY", "1")),
+        max_delay=float(os.getenv("LLM_HEDGE_MAX_DELAY", "30")),
+        default_delay=float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", "8")),
+        max_hedges=int(os.getenv("LLM_HEDGE_MAX_IN_FLIGHT", "8")),
+    )
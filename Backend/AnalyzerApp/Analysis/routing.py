@@ -0,0 +1,79 @@
+import os
+from collections import namedtuple
+
+from AnalyzerApp.Analysis import metrics
+
+# Picks the model and completion cap for each generation call. Small requests
+# go to FAST_MODEL_NAME when it is set, everything else to MODEL_NAME.
+
+strong_model = os.getenv("MODEL_NAME")
+fast_model = os.getenv("FAST_MODEL_NAME")
+
+# A request is "small" when it stays under all of these
+FAST_MAX_ITEMS = int(os.getenv("ROUTING_FAST_MAX_ITEMS", "2"))
+FAST_MAX_POINTS = int(os.getenv("ROUTING_FAST_MAX_POINTS", "8"))
+FAST_MAX_JD_CHARS = int(os.getenv("ROUTING_FAST_MAX_JD_CHARS", "2000"))
+
+# Completion budget: JSON framing + per item fields + per bullet text, with headroom.
+# A 25-30 word bullet is about 40-45 tokens; quoting and commas add the rest.
+BASE_TOKENS = 64
+ITEM_TOKENS = {"experience": 40, "project": 80, "skill": 60}
+POINT_TOKENS = 70
+EXTRA_SKILL_CATEGORIES = 4
+HEADROOM = 1.25
+# Reasoning models (e.g. gpt-oss) spend completion tokens before the answer
+REASONING_TOKENS = int(os.getenv("ROUTING_REASONING_TOKENS", "1024"))
+MAX_TOKENS_CEILING = int(os.getenv("ROUTING_MAX_TOKENS_CEILING", "8192"))
+
+Route = namedtuple("Route", ["model", "tier", "max_tokens"])
+
+
+def _points(items):
+    total = 0
+    for item in items:
+        try:
+            total += int(item.get("resume_points") or 0)
+        except (TypeError, ValueError):
+            continue
+    return total
+
+
+# Completion token cap for a section
+def max_tokens_for(section, items):
+    """
+    Args:
+        section: "experience", "project" or "skill"
+        items: Experiences/projects carrying a "resume_points" count, or skill categories
+
+    Returns:
+        int: Cap on completion tokens
+    """
+    if section == "skill":
+        # The model may add a few categories for job requirements not yet covered
+        budget = BASE_TOKENS + ITEM_TOKENS[section] * (len(items) + EXTRA_SKILL_CATEGORIES)
+    else:
+        budget = BASE_TOKENS + ITEM_TOKENS[section] * len(items) + POINT_TOKENS * _points(items)
+    return min(int(budget * HEADROOM) + REASONING_TOKENS, MAX_TOKENS_CEILING)
+
+
+# Choose model and max_tokens for a generation request and record the decision
+def route(section, job_description, items):
+    """
+    Args:
+        section: "experience", "project" or "skill"
+        job_description: Target job description
+        items: Experiences/projects carrying a "resume_points" count, or skill categories
+
+    Returns:
+        Route(model, tier, max_tokens)
+    """
+    small = (
+        len(items) <= FAST_MAX_ITEMS
+        and (section == "skill" or _points(items) <= FAST_MAX_POINTS)
+        and len(job_description or "") <= FAST_MAX_JD_CHARS
+    )
+    tier = "fast" if small and fast_model else "strong"
+    decision = Route(fast_model if tier == "fast" else strong_model, tier, max_tokens_for(section, items))
+    metrics.incr(f"routing.{tier}")
+    metrics.incr(f"routing.{section}.{tier}")
+    return decision
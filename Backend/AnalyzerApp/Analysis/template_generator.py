@@ -0,0 +1,253 @@
+import math
+import re
+import sqlite3
+from collections import Counter
+
+from AnalyzerApp.Analysis import genrators
+from AnalyzerApp.Analysis.keywords import CatalogMatcher, keywords
+
+# Deterministic, LLM-free versions of the generators. The user's own text is
+# split into candidate bullets and ordered by how much of the job description
+# they cover; profile skills the job description asks for are woven in.
+
+sentence_split = re.compile(r"(?<=[.!?])\s+|\n+|\s*[•▪●]\s*|;\s+")
+
+# Same limit the LLM prompts use for skill repetition across the resume
+MAX_SKILL_REPEATS = 4
+SKILLS_PER_BULLET = 2
+
+
+def _connect():
+    conn = sqlite3.connect(genrators.db_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _join(names):
+    if len(names) < 2:
+        return "".join(names)
+    return ", ".join(names[:-1]) + " and " + names[-1]
+
+
+def _as_bullet(text):
+    text = text.strip().strip("-*• ").rstrip(".;,").strip()
+    if not text:
+        return ""
+    return text[0].upper() + text[1:] + "."
+
+
+def job_weights(job_description):
+    """Weight of each job description keyword, damped so repeated terms do not dominate."""
+    return {k: 1 + math.log(n) for k, n in Counter(keywords(job_description)).items()}
+
+
+def rank_bullets(candidates, weights):
+    """
+    Greedy ordering by marginal keyword coverage: once a keyword is covered,
+    its weight is halved so later picks favour bullets covering something new.
+    """
+    weights = dict(weights)
+    remaining = [(i, text, set(keywords(text))) for i, text in enumerate(candidates)]
+    ordered = []
+    while remaining:
+        best = max(
+            remaining,
+            key=lambda c: (sum(weights.get(k, 0) for k in c[2]) / math.sqrt(len(c[2]) or 1), -c[0]),
+        )
+        remaining.remove(best)
+        ordered.append(best[1])
+        for k in best[2]:
+            if k in weights:
+                weights[k] /= 2
+    return ordered
+
+
+def _candidates(text):
+    seen = set()
+    bullets = []
+    for part in sentence_split.split(text or ""):
+        bullet = _as_bullet(part)
+        key = bullet.casefold()
+        if len(bullet.split()) >= 3 and key not in seen:
+            seen.add(key)
+            bullets.append(bullet)
+    return bullets
+
+
+def build_points(text, count, skills, weights, skill_uses, context):
+    """
+    Bullets for one experience or project.
+
+    Args:
+        text: The user's own description
+        count: Number of bullets to return
+        skills: Profile skill names the job description asks for, most relevant first
+        weights: Output of job_weights()
+        skill_uses: Counter of skill mentions so far across the resume (updated in place)
+        context: Phrase naming the role or project, used when the text runs out of sentences
+
+    Returns:
+        list: Exactly `count` bullet strings
+    """
+    count = max(int(count or 0), 0)
+    points = rank_bullets(_candidates(text), weights)[:count]
+
+    # Skills the job wants that the chosen bullets do not already mention
+    mentioned = {s for s in skills if any(s.casefold() in p.casefold() for p in points)}
+    for s in mentioned:
+        skill_uses[s] += 1
+    pending = [s for s in skills if s not in mentioned and skill_uses[s] < MAX_SKILL_REPEATS]
+
+    for i, point in enumerate(points):
+        if not pending:
+            break
+        chunk, pending = pending[:SKILLS_PER_BULLET], pending[SKILLS_PER_BULLET:]
+        points[i] = point[:-1] + f", using {_join(chunk)}."
+        for s in chunk:
+            skill_uses[s] += 1
+
+    while len(points) < count:
+        if not pending:
+            # Out of unused skills: repeat the relevant ones while the repeat limit allows
+            pending = [s for s in skills if skill_uses[s] < MAX_SKILL_REPEATS]
+        if pending:
+            chunk, pending = pending[:SKILLS_PER_BULLET], pending[SKILLS_PER_BULLET:]
+            for s in chunk:
+                skill_uses[s] += 1
+            points.append(f"Applied {_join(chunk)} in {context}.")
+        else:
+            points.append(f"Supported day-to-day delivery in {context}.")
+    return points
+
+
+def _matched_skill_names(skills, job_description):
+    """Names among (id, name) pairs that the job description mentions."""
+    matcher = CatalogMatcher(skills)
+    return [matcher.names[i] for i in matcher.match(job_description)]
+
+
+def _rank_skills(names, weights):
+    return sorted(names, key=lambda s: (-sum(weights.get(k, 0) for k in keywords(s)), s.casefold()))
+
+
+# Generate experience output without the LLM
+def generate_experience_output(job_role, job_description, experiences_points_count, additional_instruction=None):
+    """
+    Args:
+        job_role: Target job role
+        job_description: Target job description
+        experiences_points_count: Bullet count per experience, in display order
+        additional_instruction: Ignored; accepted for signature parity
+
+    Returns:
+        list: Same shape as genrators.generate_experience_output
+    """
+    conn = _connect()
+    cursor = conn.cursor()
+    experiences = cursor.execute("SELECT * FROM experiences ORDER BY display_order").fetchall()
+    skill_rows = cursor.execute("SELECT id, skill_name FROM skills").fetchall()
+    conn.close()
+
+    weights = job_weights(job_description)
+    wanted = _rank_skills(_matched_skill_names([tuple(r) for r in skill_rows], job_description), weights)
+    skill_uses = Counter()
+
+    experience_output = []
+    for i, exp in enumerate(experiences):
+        count = experiences_points_count[i] if i < len(experiences_points_count) else 0
+        context = f"the {exp['role']} role at {exp['experience_name']}" if exp["role"] else exp["experience_name"]
+        experience_output.append({
+            "experience_id": exp["display_order"] + 1,
+            "experience_role": exp["role"],
+            "resume_points": build_points(exp["experience_explanation"], count, wanted, weights, skill_uses, context),
+            "experience_company_name": exp["experience_name"],
+            "start_date": exp["start_date"],
+            "end_date": exp["end_date"],
+        })
+    return experience_output
+
+
+# Generate project output without the LLM
+def generate_project_output(job_role, job_description, project_points_count, additional_instruction=None):
+    """
+    Args:
+        job_role: Target job role
+        job_description: Target job description
+        project_points_count: Bullet count per project, in display order
+        additional_instruction: Ignored; accepted for signature parity
+
+    Returns:
+        list: Same shape as genrators.generate_project_output
+    """
+    conn = _connect()
+    cursor = conn.cursor()
+    projects = cursor.execute("""
+        SELECT p.*, GROUP_CONCAT(s.skill_name, ', ') as skills FROM project_skills as ps
+        INNER JOIN projects as p ON ps.project_id = p.id
+        INNER JOIN skills as s ON ps.skill_id = s.id
+        GROUP BY p.id
+        ORDER BY p.display_order
+    """).fetchall()
+    conn.close()
+
+    weights = job_weights(job_description)
+    skill_uses = Counter()
+
+    project_output = []
+    for i, project in enumerate(projects):
+        count = project_points_count[i] if i < len(project_points_count) else 0
+        own_skills = project["skills"].split(", ")
+        relevant = set(_matched_skill_names(enumerate(own_skills), job_description))
+        ranked = _rank_skills(own_skills, weights)
+        wanted = [s for s in ranked if s in relevant]
+        project_output.append({
+            "project_id": project["display_order"] + 1,
+            "project_name": project["project_name"],
+            "project_points": build_points(
+                project["project_info"], count, wanted, weights, skill_uses, f"the {project['project_name']} project",
+            ),
+            "project_skills": wanted + [s for s in ranked if s not in relevant],
+        })
+    return project_output
+
+
+# Generate skill output without the LLM
+def generate_skill_output(job_role, job_description, additional_instruction=None, include_web_research=False,
+                          experience_data=None, project_data=None):
+    """
+    Args:
+        job_role: Target job role
+        job_description: Target job description
+        additional_instruction, include_web_research: Ignored; accepted for signature parity
+        experience_data, project_data: Generated sections; their skills count as evidence
+
+    Returns:
+        list: Same shape as genrators.generate_skill_output
+    """
+    conn = _connect()
+    cursor = conn.cursor()
+    rows = cursor.execute("SELECT category, skill_name FROM skills ORDER BY category, skill_name").fetchall()
+    conn.close()
+
+    weights = job_weights(job_description)
+    evidence = " ".join(
+        p for item in (experience_data or []) for p in item.get("resume_points", [])
+    ) + " " + " ".join(
+        s for item in (project_data or []) for s in item.get("project_skills", []) + item.get("project_points", [])
+    )
+    evidence_keys = set(keywords(evidence))
+
+    categories = {}
+    for row in rows:
+        categories.setdefault(row["category"] or "Other", []).append(row["skill_name"])
+
+    def relevance(name):
+        keys = keywords(name)
+        return (-sum(weights.get(k, 0) for k in keys), -len(evidence_keys.intersection(keys)), name.casefold())
+
+    output = [
+        {"skill_category": category, "skills": sorted(names, key=relevance)}
+        for category, names in categories.items()
+    ]
+    output.sort(key=lambda c: min(relevance(s) for s in c["skills"]))
+    return output
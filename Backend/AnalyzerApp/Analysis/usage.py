@@ -0,0 +1,49 @@
+import contextvars
+import threading
+from contextlib import contextmanager
+
+# Token usage of the LLM calls made while handling the current request.
+# Worker threads must be started with contextvars.copy_context() to report here.
+
+_current = contextvars.ContextVar("llm_usage", default=None)
+
+
+class UsageTracker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latency = 0.0
+        self.models = []
+
+    @property
+    def total_tokens(self):
+        return self.prompt_tokens + self.completion_tokens
+
+    def add(self, completion):
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += completion.usage.get("prompt_tokens") or 0
+            self.completion_tokens += completion.usage.get("completion_tokens") or 0
+            self.latency += completion.latency or 0.0
+            if completion.model not in self.models:
+                self.models.append(completion.model)
+
+
+# Collect usage for every completion made inside the block
+@contextmanager
+def track():
+    tracker = UsageTracker()
+    token = _current.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current.reset(token)
+
+
+# Report a completion to the active tracker, if any
+def record(completion):
+    tracker = _current.get()
+    if tracker is not None:
+        tracker.add(completion)
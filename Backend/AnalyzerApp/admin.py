@@ -1,3 +1,17 @@
 from django.contrib import admin
+from .models import GeneratedBullet, TailoredSection
 
-# Register your models here.
+
+@admin.register(GeneratedBullet)
+class GeneratedBulletAdmin(admin.ModelAdmin):
+    list_display = ('text', 'created_at')
+    search_fields = ('text', 'content_hash')
+    list_filter = ('created_at',)
+
+
+@admin.register(TailoredSection)
+class TailoredSectionAdmin(admin.ModelAdmin):
+    list_display = ('application', 'section', 'version', 'job_role', 'created_at')
+    search_fields = ('job_role', 'application__company_name', 'application__job_name')
+    list_filter = ('section', 'created_at')
+    ordering = ('-created_at',)
@@ -0,0 +1,90 @@
+"""
+Buffered audit log of analyzer generations.
+
+Requests only append an event to an in-process buffer; a writer thread
+stores the buffer with one bulk_create when it reaches AUDIT_FLUSH_SIZE
+events or every AUDIT_FLUSH_INTERVAL seconds, and the remainder is flushed
+when the worker exits. When the database falls behind and the buffer holds
+AUDIT_BUFFER_SIZE events, new events are dropped (counted in `audit.dropped`)
+instead of slowing requests down.
+"""
+import atexit
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from AnalyzerApp.Analysis import metrics
+from .models import GenerationEvent
+
+
+class EventWriter:
+    def __init__(self):
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+
+    def record(self, **fields):
+        """Queue an event. Returns False when it was dropped."""
+        event = GenerationEvent(**fields)
+        with self._cond:
+            if len(self._buffer) >= settings.AUDIT_BUFFER_SIZE:
+                metrics.incr('audit.dropped')
+                return False
+            self._buffer.append(event)
+            # Started lazily so it runs in the worker process, not a preforking master
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='analyzer-audit', daemon=True)
+                self._thread.start()
+            if len(self._buffer) >= settings.AUDIT_FLUSH_SIZE:
+                self._cond.notify()
+        return True
+
+    def flush(self):
+        """Write every buffered event. Returns the number written."""
+        with self._flush_lock:
+            with self._cond:
+                batch = list(self._buffer)
+                self._buffer.clear()
+            if not batch:
+                return 0
+            try:
+                GenerationEvent.objects.bulk_create(batch, batch_size=500)
+            except Exception as e:
+                metrics.incr('audit.lost', len(batch))
+                print(f"Audit flush failed, {len(batch)} events lost: {e}")
+                return 0
+            metrics.incr('audit.written', len(batch))
+            return len(batch)
+
+    def pending(self):
+        with self._cond:
+            return len(self._buffer)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: len(self._buffer) >= settings.AUDIT_FLUSH_SIZE,
+                    timeout=settings.AUDIT_FLUSH_INTERVAL,
+                )
+            self.flush()
+            close_old_connections()
+
+
+writer = EventWriter()
+
+
+def record(**fields):
+    if settings.AUDIT_LOG_ENABLED:
+        writer.record(**fields)
+
+
+def shutdown():
+    """Flush what is left; called from atexit and gunicorn's worker_exit hook."""
+    writer.flush()
+
+
+atexit.register(shutdown)
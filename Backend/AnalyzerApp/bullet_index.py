@@ -0,0 +1,168 @@
+import math
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+from AnalyzerApp.Analysis.keywords import keywords
+from .models import TailoredSection, UserBullet, BulletPosting
+from .skill_demand import catalog_matcher
+from .tailoring import BULLET_KEYS, hydrate, bullet_hash, _store_bullets
+
+# Output key naming the experience or project a bullet belongs to
+ITEM_KEYS = {
+    'experience': 'experience_company_name',
+    'project': 'project_name',
+}
+
+# Catalog skills count for more than plain keywords when scoring
+SKILL_TERM_WEIGHT = 3.0
+
+
+def bullet_terms(text, matcher):
+    """Index terms of a bullet: distinct keywords plus `skill:<id>` for catalog skills it names."""
+    terms = set(keywords(text))
+    terms.update(f"skill:{skill_id}" for skill_id in matcher.match(text))
+    return {t[:100] for t in terms}
+
+
+def query_terms(job_description, skill_ids):
+    """Weighted terms of a job description naming `skill_ids`; repeated keywords are damped with a log."""
+    weights = {k: 1 + math.log(n) for k, n in Counter(keywords(job_description)).items()}
+    for skill_id in skill_ids:
+        weights[f"skill:{skill_id}"] = SKILL_TERM_WEIGHT
+    return weights
+
+
+def index_output(user, section, output, bullet_ids=None, matcher=None):
+    """
+    Add the bullets of one generation (hydrated output) to the user's index.
+    `bullet_ids` is the {hash: bullet_id} map when the bullets were just stored.
+    """
+    bullet_key = BULLET_KEYS.get(section)
+    if not bullet_key:
+        return 0
+
+    pairs = [
+        (str(item.get(ITEM_KEYS[section]) or '')[:255], text)
+        for item in output for text in item.get(bullet_key, [])
+    ]
+    if not pairs:
+        return 0
+    matcher = matcher or catalog_matcher()
+    ids = bullet_ids or _store_bullets([text for _, text in pairs])
+
+    entries = {}
+    for item, text in pairs:
+        entries.setdefault((ids[bullet_hash(text)], item), text)
+
+    with transaction.atomic():
+        existing = set(
+            UserBullet.objects.filter(user=user, section=section, bullet_id__in={b for b, _ in entries})
+            .values_list('bullet_id', 'item')
+        )
+        new = {key: text for key, text in entries.items() if key not in existing}
+        if not new:
+            return 0
+        terms = {key: bullet_terms(text, matcher) for key, text in new.items()}
+        UserBullet.objects.bulk_create(
+            [
+                UserBullet(user=user, bullet_id=bullet_id, section=section, item=item, term_count=len(terms[(bullet_id, item)]))
+                for bullet_id, item in new
+            ],
+            ignore_conflicts=True,
+        )
+        # Re-read the ids; rows created concurrently were skipped by ignore_conflicts
+        rows = UserBullet.objects.filter(user=user, section=section, bullet_id__in={b for b, _ in new})
+        BulletPosting.objects.bulk_create(
+            [
+                BulletPosting(user=user, term=term, user_bullet_id=row.id)
+                for row in rows if (row.bullet_id, row.item) in new
+                for term in terms[(row.bullet_id, row.item)]
+            ],
+            ignore_conflicts=True,
+            batch_size=1000,
+        )
+    return len(new)
+
+
+def suggest(user, job_description, section=None, limit=10):
+    """
+    Best-matching bullets from the user's history for a job description.
+
+    Scored by BM25-style term weights: JD term weight × idf over the user's
+    bullets, normalized by bullet length. Coverage is the share of the JD's
+    term weight that the returned bullets cover together.
+    """
+    matcher = catalog_matcher()
+    skill_ids = matcher.match(job_description)
+    # Only the JD's skills can be matched terms; name those rather than the catalog
+    skill_names = {f"skill:{k}": matcher.names[k] for k in skill_ids}
+    weights = query_terms(job_description, skill_ids)
+    if not weights:
+        return {"suggestions": [], "coverage": 0.0, "needs_llm": True}
+
+    history = UserBullet.objects.filter(user=user)
+    postings = BulletPosting.objects.filter(user=user, term__in=list(weights))
+    if section:
+        history = history.filter(section=section)
+        postings = postings.filter(user_bullet__section=section)
+    total = history.count()
+    if not total:
+        return {"suggestions": [], "coverage": 0.0, "needs_llm": True}
+
+    matched = defaultdict(set)
+    for bullet_id, term in postings.values_list('user_bullet_id', 'term'):
+        matched[bullet_id].add(term)
+    doc_freq = Counter(term for terms in matched.values() for term in terms)
+    idf = {t: math.log(1 + (total - n + 0.5) / (n + 0.5)) for t, n in doc_freq.items()}
+
+    rows = list(UserBullet.objects.filter(id__in=list(matched)).select_related('bullet'))
+    avg_len = sum(r.term_count for r in rows) / len(rows) if rows else 1
+    scored = []
+    for row in rows:
+        norm = 0.25 + 0.75 * (row.term_count or 1) / (avg_len or 1)
+        score = sum(weights[t] * idf[t] for t in matched[row.id]) / norm
+        scored.append((score, row))
+    scored.sort(key=lambda s: (-s[0], s[1].bullet.text))
+    top, seen = [], set()
+    for score, row in scored:
+        # The same text may be filed under several experiences; suggest it once
+        if row.bullet_id not in seen:
+            seen.add(row.bullet_id)
+            top.append((score, row))
+        if len(top) >= limit:
+            break
+
+    covered = set().union(*(matched[row.id] for _, row in top)) if top else set()
+    coverage = sum(weights[t] for t in covered) / sum(weights.values())
+    return {
+        "suggestions": [
+            {
+                "section": row.section,
+                "item": row.item,
+                "text": row.bullet.text,
+                "score": round(score, 4),
+                "matched_terms": sorted(skill_names.get(t, t) for t in matched[row.id]),
+            }
+            for score, row in top
+        ],
+        "coverage": round(coverage, 4),
+        "needs_llm": coverage < settings.BULLET_SUGGEST_MIN_COVERAGE,
+    }
+
+
+def rebuild(user=None):
+    """Re-index stored tailoring from scratch. Used for backfills and after catalog changes."""
+    matcher = catalog_matcher()
+    sections = TailoredSection.objects.filter(section__in=list(BULLET_KEYS)).order_by('created_at')
+    history = UserBullet.objects.all()
+    if user is not None:
+        sections = sections.filter(user=user)
+        history = history.filter(user=user)
+    history.delete()
+    count = 0
+    rows = list(sections.select_related('user'))
+    for ts, output in zip(rows, hydrate(rows)):
+        count += index_output(ts.user, ts.section, output, matcher=matcher)
+    return count
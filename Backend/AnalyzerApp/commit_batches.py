@@ -0,0 +1,49 @@
+from django.db import transaction
+
+
+class _Batch:
+    """on_commit callback collecting the items added during one transaction."""
+
+    def __init__(self, flush):
+        self.flush = flush
+        self.items = set()
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        self.flush(self.items)
+
+
+def _queued_batch(connection, flush):
+    """
+    The batch for `flush` already queued in the current transaction, if any.
+
+    Django has no public API listing queued on_commit callbacks, so this reads
+    `connection.run_on_commit`, whose entries are (savepoint ids, callback,
+    robust) tuples in Django 4.2 and 5.x. Reading it keeps Django's own
+    handling of rolled-back transactions and savepoints, which a batch kept
+    outside the connection cannot see. Should the layout change, nothing is
+    found and every add() queues its own callback: still correct, only not
+    merged. CommitBatchTests pins the layout.
+    """
+    for entry in getattr(connection, 'run_on_commit', ()):
+        callback = entry[1] if isinstance(entry, tuple) and len(entry) == 3 else None
+        if isinstance(callback, _Batch) and callback.flush == flush and not callback.done:
+            return callback
+    return None
+
+
+def add(flush, item):
+    """
+    Call `flush(items)` once when the current transaction commits (or now,
+    outside one), with every item added for the same `flush` meanwhile.
+    A rolled-back transaction discards its batch along with its callbacks.
+    """
+    batch = _queued_batch(transaction.get_connection(), flush)
+    if batch is not None:
+        batch.items.add(item)
+        return
+    batch = _Batch(flush)
+    batch.items.add(item)
+    # Runs at once outside a transaction, so the item must be in first
+    transaction.on_commit(batch)
@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand, CommandError
+import json
+
+from AnalyzerApp import prompt_benchmark
+from AnalyzerApp.Analysis import routing
+from AnalyzerApp.Analysis.cassettes import CassetteProvider
+from AnalyzerApp.Analysis.providers import StubProvider, provider_from_env
+
+
+class Command(BaseCommand):
+    help = 'Compare prompt variants on the benchmark corpus (tokens, latency, output validity) against a baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--provider', choices=['stub', 'live'], default='stub',
+                            help='stub runs offline; live uses the LLM_* provider settings')
+        parser.add_argument('--cassette', help='Replay responses from this cassette (records it with --provider live)')
+        parser.add_argument('--model', help='Model name sent with each request (default MODEL_NAME)')
+        parser.add_argument('--section', action='append', choices=list(prompt_benchmark.VARIANTS))
+        parser.add_argument('--variant', action='append')
+        parser.add_argument('--baseline', default=prompt_benchmark.BASELINE_PATH)
+        parser.add_argument('--tolerance', type=float, default=0.05)
+        parser.add_argument('--write-baseline', action='store_true', help='Store this run as the new baseline')
+
+    def handle(self, *args, **options):
+        provider = StubProvider() if options['provider'] == 'stub' else provider_from_env()
+        if options['cassette']:
+            mode = 'record' if options['provider'] == 'live' else 'replay'
+            provider = CassetteProvider(options['cassette'], mode=mode, inner=provider if mode == 'record' else None)
+
+        report = prompt_benchmark.run(
+            provider,
+            model=options['model'] or routing.strong_model,
+            sections=options['section'],
+            variants=options['variant'],
+        )
+
+        self.stdout.write(
+            f"{'section':<12}{'variant':<12}{'calls':>6}{'prompt':>9}{'completion':>12}"
+            f"{'p50 ms':>9}{'p95 ms':>9}{'valid':>8}{'strict':>8}"
+        )
+        for section, variants in report.items():
+            for name, r in variants.items():
+                self.stdout.write(
+                    f"{section:<12}{name:<12}{r['calls']:>6}{r['avg_prompt_tokens']:>9}{r['avg_completion_tokens']:>12}"
+                    f"{r['p50_ms']:>9}{r['p95_ms']:>9}{r['valid_rate']:>8}{r['strict_json_rate']:>8}"
+                )
+
+        if options['write_baseline']:
+            with open(options['baseline'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+                f.write('\n')
+            self.stdout.write(self.style.SUCCESS(f"✅ Baseline written to {options['baseline']}"))
+            return
+
+        try:
+            with open(options['baseline'], encoding='utf-8') as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            self.stdout.write(self.style.WARNING('No baseline found; run with --write-baseline to record one'))
+            return
+
+        problems = prompt_benchmark.regressions(report, baseline, tolerance=options['tolerance'])
+        if problems:
+            for problem in problems:
+                self.stderr.write(f'❌ {problem}')
+            raise CommandError(f'{len(problems)} prompt regression(s) against {options["baseline"]}')
+        self.stdout.write(self.style.SUCCESS('✅ No regressions against the baseline'))
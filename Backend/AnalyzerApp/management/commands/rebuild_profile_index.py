@@ -0,0 +1,29 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+import time
+
+from AnalyzerApp import profile_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the profile term index from experiences, projects, achievements and skills (backfill)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            type=str,
+            help='Only rebuild the index for the user with this email'
+        )
+
+    def handle(self, *args, **options):
+        user = None
+        if options['user']:
+            user = get_user_model().objects.filter(email=options['user']).first()
+            if user is None:
+                raise CommandError(f"No user with email {options['user']}")
+
+        start_time = time.time()
+        count = profile_index.rebuild(user)
+        elapsed = (time.time() - start_time) * 1000
+        scope = f"user {options['user']}" if user else 'all users'
+        self.stdout.write(self.style.SUCCESS(f'✅ Indexed {count} profile rows for {scope} in {elapsed:.2f}ms'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+import time
+
+from AnalyzerApp import skill_cooccurrence
+
+
+class Command(BaseCommand):
+    help = 'Rebuild skill co-occurrence counts from UserSkills and ProjectSkills (backfill)'
+
+    def handle(self, *args, **options):
+        start_time = time.time()
+        baskets, pairs = skill_cooccurrence.rebuild()
+        elapsed = (time.time() - start_time) * 1000
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Counted {pairs} skill pairs across {baskets} users and projects in {elapsed:.2f}ms'
+        ))
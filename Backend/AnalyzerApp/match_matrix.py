@@ -0,0 +1,111 @@
+import math
+from collections import Counter
+
+import numpy as np
+
+from BackendApp.models import Applications, Skills
+from AnalyzerApp.Analysis.keywords import keywords
+from .models import ApplicationSkill
+from . import profile_index
+
+# Catalog skill terms weigh more than plain keywords on both sides of the product
+SKILL_TERM_WEIGHT = 3.0
+
+
+def _tf(counts):
+    return {term: 1 + math.log(n) for term, n in counts.items()}
+
+
+def profile_terms(user):
+    """
+    Term weights of the user's profile (skills, experiences, projects,
+    achievements) and the set of catalog skill IDs the profile evidences.
+    Read from the profile term index rather than re-tokenizing the profile.
+    """
+    counts, skill_ids = profile_index.profile_terms(user)
+    weights = _tf(counts)
+    for skill_id in skill_ids:
+        weights[f"skill:{skill_id}"] = SKILL_TERM_WEIGHT
+    return weights, skill_ids
+
+
+def match_applications(user, limit=None, status=None):
+    """
+    Score every stored job description of the user against their profile.
+
+    The JDs form a sparse tf-idf matrix (COO arrays) and all cosine scores
+    come from one sparse matrix-vector product; missing skills are the JD's
+    catalog skills the profile does not evidence.
+    """
+    apps = Applications.objects.filter(user=user).exclude(job_description__isnull=True).exclude(job_description='')
+    if status:
+        apps = apps.filter(status=status)
+    apps = list(apps.values('id', 'job_name', 'company_name', 'status', 'job_description'))
+    if not apps:
+        return []
+
+    jd_skills = {}
+    for app_id, skill_id in ApplicationSkill.objects.filter(
+        application_id__in=[a['id'] for a in apps],
+    ).values_list('application_id', 'skill_id'):
+        jd_skills.setdefault(app_id, set()).add(skill_id)
+
+    # Sparse JD × term matrix in COO form
+    vocab = {}
+    rows, cols, data = [], [], []
+    for r, app in enumerate(apps):
+        weights = _tf(Counter(keywords(app['job_description'])))
+        for skill_id in jd_skills.get(app['id'], ()):
+            weights[f"skill:{skill_id}"] = SKILL_TERM_WEIGHT
+        for term, w in weights.items():
+            rows.append(r)
+            cols.append(vocab.setdefault(term, len(vocab)))
+            data.append(w)
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    data = np.asarray(data, dtype=np.float64)
+    n_docs = len(apps)
+
+    # Each (row, col) pair is unique, so column counts are document frequencies
+    doc_freq = np.bincount(cols, minlength=len(vocab))
+    idf = np.log((1 + n_docs) / (1 + doc_freq)) + 1
+    data *= idf[cols]
+    row_norms = np.sqrt(np.bincount(rows, weights=data ** 2, minlength=n_docs))
+
+    profile_weights, have = profile_terms(user)
+    profile = np.zeros(len(vocab))
+    outside = 0.0
+    unseen_idf = math.log(1 + n_docs) + 1
+    for term, w in profile_weights.items():
+        col = vocab.get(term)
+        if col is None:
+            outside += (w * unseen_idf) ** 2
+        else:
+            profile[col] = w * idf[col]
+    profile_norm = math.sqrt(float(profile @ profile) + outside)
+
+    # One sparse matrix-vector product for all JDs
+    dots = np.bincount(rows, weights=data * profile[cols], minlength=n_docs)
+    denom = row_norms * profile_norm
+    scores = np.divide(dots, denom, out=np.zeros(n_docs), where=denom > 0)
+
+    top = np.argsort(-scores, kind='stable')[:limit]
+    # Names of just the skills the returned JDs ask for
+    names = dict(Skills.objects.filter(
+        id__in={s for r in top for s in jd_skills.get(apps[r]['id'], ())},
+    ).values_list('id', 'skill_name'))
+    results = []
+    for r in top:
+        app = apps[r]
+        wanted = jd_skills.get(app['id'], set())
+        results.append({
+            "applicationId": str(app['id']),
+            "jobName": app['job_name'],
+            "companyName": app['company_name'],
+            "status": app['status'],
+            "score": round(float(scores[r]), 4),
+            "skillCoverage": round(len(wanted & have) / len(wanted), 4) if wanted else None,
+            "matchedSkills": sorted(names[s] for s in wanted & have if s in names),
+            "missingSkills": sorted(names[s] for s in wanted - have if s in names),
+        })
+    return results
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:23
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('BackendApp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeneratedBullet',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('content_hash', models.CharField(max_length=64, unique=True)),
+                ('text', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Generated Bullet',
+                'verbose_name_plural': 'Generated Bullets',
+                'db_table': '"resumeanalyzer"."generated_bullets"',
+            },
+        ),
+        migrations.CreateModel(
+            name='TailoredSection',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('section', models.CharField(choices=[('experience', 'Experience'), ('project', 'Project'), ('skill', 'Skill')], max_length=20)),
+                ('version', models.PositiveIntegerField()),
+                ('request_hash', models.CharField(max_length=64)),
+                ('job_role', models.CharField(blank=True, max_length=255, null=True)),
+                ('content', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tailored_sections', to='BackendApp.applications')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tailored_sections', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Tailored Section',
+                'verbose_name_plural': 'Tailored Sections',
+                'db_table': '"resumeanalyzer"."tailored_sections"',
+                'indexes': [models.Index(fields=['application', 'section', '-version'], name='idx_tailored_app_section_ver'), models.Index(fields=['application', 'section', 'request_hash'], name='idx_tailored_app_request')],
+                'unique_together': {('application', 'section', 'version')},
+            },
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:25
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('BackendApp', '0002_applications_job_description'),
+        ('AnalyzerApp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GlobalSkillDemand',
+            fields=[
+                ('skill', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='global_demand', serialize=False, to='BackendApp.skills')),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Global Skill Demand',
+                'verbose_name_plural': 'Global Skill Demand',
+                'db_table': '"resumeanalyzer"."global_skill_demand"',
+                'indexes': [models.Index(fields=['-count'], name='idx_global_skill_demand_count')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SkillDemand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.IntegerField(default=0)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_demand', to='BackendApp.skills')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_demand', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Skill Demand',
+                'verbose_name_plural': 'Skill Demand',
+                'db_table': '"resumeanalyzer"."skill_demand"',
+                'indexes': [models.Index(fields=['user', '-count'], name='idx_skill_demand_user_count')],
+                'unique_together': {('user', 'skill')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ApplicationSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='demanded_skills', to='BackendApp.applications')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_demands', to='BackendApp.skills')),
+            ],
+            options={
+                'verbose_name': 'Application Skill',
+                'verbose_name_plural': 'Application Skills',
+                'db_table': '"resumeanalyzer"."application_skills"',
+                'unique_together': {('application', 'skill')},
+            },
+        ),
+    ]
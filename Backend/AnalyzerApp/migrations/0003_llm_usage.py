@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:26
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('AnalyzerApp', '0002_skill_demand'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LLMUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('day', 'Day'), ('month', 'Month')], max_length=10)),
+                ('period_start', models.DateField()),
+                ('tokens', models.BigIntegerField(default=0)),
+                ('requests', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='llm_usage', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'LLM Usage',
+                'verbose_name_plural': 'LLM Usage',
+                'db_table': '"resumeanalyzer"."llm_usage"',
+                'unique_together': {('user', 'period', 'period_start')},
+            },
+        ),
+    ]
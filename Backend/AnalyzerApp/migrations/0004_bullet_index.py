@@ -0,0 +1,51 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:33
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('AnalyzerApp', '0003_llm_usage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserBullet',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('section', models.CharField(choices=[('experience', 'Experience'), ('project', 'Project'), ('skill', 'Skill')], max_length=20)),
+                ('item', models.CharField(blank=True, default='', max_length=255)),
+                ('term_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('bullet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='owners', to='AnalyzerApp.generatedbullet')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bullet_history', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'User Bullet',
+                'verbose_name_plural': 'User Bullets',
+                'db_table': '"resumeanalyzer"."user_bullets"',
+                'unique_together': {('user', 'bullet', 'section', 'item')},
+            },
+        ),
+        migrations.CreateModel(
+            name='BulletPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bullet_postings', to=settings.AUTH_USER_MODEL)),
+                ('user_bullet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='AnalyzerApp.userbullet')),
+            ],
+            options={
+                'verbose_name': 'Bullet Posting',
+                'verbose_name_plural': 'Bullet Postings',
+                'db_table': '"resumeanalyzer"."bullet_postings"',
+                'indexes': [models.Index(fields=['user', 'term'], name='idx_bullet_postings_user_term')],
+                'unique_together': {('user_bullet', 'term')},
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BackendApp', '0002_applications_job_description'),
+        ('AnalyzerApp', '0004_bullet_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillOccurrence',
+            fields=[
+                ('skill', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='occurrence', serialize=False, to='BackendApp.skills')),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Skill Occurrence',
+                'verbose_name_plural': 'Skill Occurrence',
+                'db_table': '"resumeanalyzer"."skill_occurrence"',
+            },
+        ),
+        migrations.CreateModel(
+            name='SkillBasket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('user', 'User'), ('project', 'Project')], max_length=10)),
+                ('key', models.CharField(max_length=64)),
+                ('skills', models.JSONField(default=list)),
+            ],
+            options={
+                'verbose_name': 'Skill Basket',
+                'verbose_name_plural': 'Skill Baskets',
+                'db_table': '"resumeanalyzer"."skill_baskets"',
+                'unique_together': {('kind', 'key')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SkillCooccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.IntegerField(default=0)),
+                ('other', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='BackendApp.skills')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cooccurrences', to='BackendApp.skills')),
+            ],
+            options={
+                'verbose_name': 'Skill Co-occurrence',
+                'verbose_name_plural': 'Skill Co-occurrence',
+                'db_table': '"resumeanalyzer"."skill_cooccurrence"',
+                'indexes': [models.Index(fields=['skill', '-count'], name='idx_skill_cooc_skill_count')],
+                'unique_together': {('skill', 'other')},
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:39
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('AnalyzerApp', '0005_skill_cooccurrence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.CharField(choices=[('experience', 'Experience'), ('project', 'Project'), ('achievement', 'Achievement'), ('skill', 'Skill')], max_length=20)),
+                ('row', models.UUIDField()),
+                ('term', models.CharField(max_length=100)),
+                ('tf', models.PositiveIntegerField(default=1)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='profile_terms', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Profile Term',
+                'verbose_name_plural': 'Profile Terms',
+                'db_table': '"resumeanalyzer"."profile_terms"',
+                'indexes': [models.Index(fields=['user', 'term'], name='idx_profile_terms_user_term')],
+                'unique_together': {('section', 'row', 'term')},
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:41
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('AnalyzerApp', '0006_profile_terms'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GenerationEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('endpoint', models.CharField(max_length=100)),
+                ('section', models.CharField(choices=[('experience', 'Experience'), ('project', 'Project'), ('skill', 'Skill')], max_length=20)),
+                ('mode', models.CharField(max_length=10)),
+                ('model', models.CharField(blank=True, default='', max_length=100)),
+                ('prompt_tokens', models.IntegerField(default=0)),
+                ('completion_tokens', models.IntegerField(default=0)),
+                ('latency_ms', models.IntegerField(default=0)),
+                ('cache_status', models.CharField(choices=[('hit', 'Hit'), ('miss', 'Miss'), ('bypass', 'Bypass')], max_length=10)),
+                ('status', models.CharField(choices=[('success', 'Success'), ('fallback', 'Template Fallback'), ('over_quota', 'Over Quota'), ('error', 'Error')], default='success', max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='generation_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Generation Event',
+                'verbose_name_plural': 'Generation Events',
+                'db_table': '"resumeanalyzer"."generation_events"',
+                'indexes': [models.Index(fields=['user', '-created_at'], name='idx_generation_events_user')],
+            },
+        ),
+    ]
@@ -1,3 +1,347 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
+import uuid
 
-# Create your models here.
+
+# ─── Tailored Resume Store ────────────────────────────────────────────────────
+
+class GeneratedBullet(models.Model):
+    """Content-addressed generated bullet text, stored once and shared by every tailoring."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    content_hash = models.CharField(max_length=64, unique=True)
+    text = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = '"resumeanalyzer"."generated_bullets"'
+        verbose_name = 'Generated Bullet'
+        verbose_name_plural = 'Generated Bullets'
+
+    def __str__(self):
+        return self.text[:50] + '...' if len(self.text) > 50 else self.text
+
+
+class TailoredSection(models.Model):
+    """One generated version of a resume section for an application; bullets are referenced by ID."""
+    SECTION_CHOICES = [
+        ('experience', 'Experience'),
+        ('project', 'Project'),
+        ('skill', 'Skill'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='tailored_sections',
+    )
+    application = models.ForeignKey(
+        'BackendApp.Applications',
+        on_delete=models.CASCADE,
+        related_name='tailored_sections',
+    )
+    section = models.CharField(max_length=20, choices=SECTION_CHOICES)
+    version = models.PositiveIntegerField()
+    request_hash = models.CharField(max_length=64)
+    job_role = models.CharField(max_length=255, blank=True, null=True)
+    content = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = '"resumeanalyzer"."tailored_sections"'
+        verbose_name = 'Tailored Section'
+        verbose_name_plural = 'Tailored Sections'
+        unique_together = [['application', 'section', 'version']]
+        indexes = [
+            models.Index(fields=['application', 'section', '-version'], name='idx_tailored_app_section_ver'),
+            models.Index(fields=['application', 'section', 'request_hash'], name='idx_tailored_app_request'),
+        ]
+
+    def __str__(self):
+        return f"{self.application_id} — {self.section} v{self.version}"
+
+
+# ─── Skill Demand Analytics ───────────────────────────────────────────────────
+
+class ApplicationSkill(models.Model):
+    """Catalog skills mentioned in an application's job description."""
+    application = models.ForeignKey(
+        'BackendApp.Applications',
+        on_delete=models.CASCADE,
+        related_name='demanded_skills',
+    )
+    skill = models.ForeignKey('BackendApp.Skills', on_delete=models.CASCADE, related_name='application_demands')
+
+    class Meta:
+        db_table = '"resumeanalyzer"."application_skills"'
+        verbose_name = 'Application Skill'
+        verbose_name_plural = 'Application Skills'
+        unique_together = [['application', 'skill']]
+
+    def __str__(self):
+        return f"{self.application_id} — {self.skill_id}"
+
+
+class SkillDemand(models.Model):
+    """Per-user count of stored job descriptions asking for a skill, maintained incrementally."""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='skill_demand',
+    )
+    skill = models.ForeignKey('BackendApp.Skills', on_delete=models.CASCADE, related_name='user_demand')
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = '"resumeanalyzer"."skill_demand"'
+        verbose_name = 'Skill Demand'
+        verbose_name_plural = 'Skill Demand'
+        unique_together = [['user', 'skill']]
+        indexes = [
+            models.Index(fields=['user', '-count'], name='idx_skill_demand_user_count'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} — {self.skill_id}: {self.count}"
+
+
+class GlobalSkillDemand(models.Model):
+    """Count of stored job descriptions across all users asking for a skill."""
+    skill = models.OneToOneField(
+        'BackendApp.Skills',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='global_demand',
+    )
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = '"resumeanalyzer"."global_skill_demand"'
+        verbose_name = 'Global Skill Demand'
+        verbose_name_plural = 'Global Skill Demand'
+        indexes = [
+            models.Index(fields=['-count'], name='idx_global_skill_demand_count'),
+        ]
+
+    def __str__(self):
+        return f"{self.skill_id}: {self.count}"
+
+
+# ─── LLM Token Quotas ─────────────────────────────────────────────────────────
+
+class LLMUsage(models.Model):
+    """Tokens consumed by a user in one day or month; updated only with single-statement increments."""
+    PERIOD_CHOICES = [
+        ('day', 'Day'),
+        ('month', 'Month'),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='llm_usage',
+    )
+    period = models.CharField(max_length=10, choices=PERIOD_CHOICES)
+    period_start = models.DateField()
+    tokens = models.BigIntegerField(default=0)
+    requests = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = '"resumeanalyzer"."llm_usage"'
+        verbose_name = 'LLM Usage'
+        verbose_name_plural = 'LLM Usage'
+        unique_together = [['user', 'period', 'period_start']]
+
+    def __str__(self):
+        return f"{self.user_id} — {self.period} {self.period_start}: {self.tokens}"
+
+
+# ─── Bullet Retrieval Index ───────────────────────────────────────────────────
+
+class UserBullet(models.Model):
+    """A generated bullet in a user's history, with the experience or project it was written for."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='bullet_history',
+    )
+    bullet = models.ForeignKey(GeneratedBullet, on_delete=models.CASCADE, related_name='owners')
+    section = models.CharField(max_length=20, choices=TailoredSection.SECTION_CHOICES)
+    item = models.CharField(max_length=255, blank=True, default='')
+    term_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = '"resumeanalyzer"."user_bullets"'
+        verbose_name = 'User Bullet'
+        verbose_name_plural = 'User Bullets'
+        unique_together = [['user', 'bullet', 'section', 'item']]
+
+    def __str__(self):
+        return f"{self.user_id} — {self.section}: {self.item}"
+
+
+class BulletPosting(models.Model):
+    """Inverted index entry: a keyword or `skill:<id>` term appearing in a user's bullet."""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='bullet_postings',
+    )
+    term = models.CharField(max_length=100)
+    user_bullet = models.ForeignKey(UserBullet, on_delete=models.CASCADE, related_name='postings')
+
+    class Meta:
+        db_table = '"resumeanalyzer"."bullet_postings"'
+        verbose_name = 'Bullet Posting'
+        verbose_name_plural = 'Bullet Postings'
+        unique_together = [['user_bullet', 'term']]
+        indexes = [
+            models.Index(fields=['user', 'term'], name='idx_bullet_postings_user_term'),
+        ]
+
+    def __str__(self):
+        return f"{self.term} → {self.user_bullet_id}"
+
+
+# ─── Skill Co-occurrence ──────────────────────────────────────────────────────
+
+class SkillBasket(models.Model):
+    """Last counted skill set of one user (UserSkills) or one project (ProjectSkills)."""
+    KIND_CHOICES = [
+        ('user', 'User'),
+        ('project', 'Project'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    key = models.CharField(max_length=64)
+    skills = models.JSONField(default=list)
+
+    class Meta:
+        db_table = '"resumeanalyzer"."skill_baskets"'
+        verbose_name = 'Skill Basket'
+        verbose_name_plural = 'Skill Baskets'
+        unique_together = [['kind', 'key']]
+
+    def __str__(self):
+        return f"{self.kind} {self.key}: {len(self.skills)} skills"
+
+
+class SkillOccurrence(models.Model):
+    """Number of baskets containing a skill."""
+    skill = models.OneToOneField(
+        'BackendApp.Skills',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='occurrence',
+    )
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = '"resumeanalyzer"."skill_occurrence"'
+        verbose_name = 'Skill Occurrence'
+        verbose_name_plural = 'Skill Occurrence'
+
+    def __str__(self):
+        return f"{self.skill_id}: {self.count}"
+
+
+class SkillCooccurrence(models.Model):
+    """Number of baskets containing both skills; stored in both directions for lookups by `skill`."""
+    skill = models.ForeignKey('BackendApp.Skills', on_delete=models.CASCADE, related_name='cooccurrences')
+    other = models.ForeignKey('BackendApp.Skills', on_delete=models.CASCADE, related_name='+')
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = '"resumeanalyzer"."skill_cooccurrence"'
+        verbose_name = 'Skill Co-occurrence'
+        verbose_name_plural = 'Skill Co-occurrence'
+        unique_together = [['skill', 'other']]
+        indexes = [
+            models.Index(fields=['skill', '-count'], name='idx_skill_cooc_skill_count'),
+        ]
+
+    def __str__(self):
+        return f"{self.skill_id} + {self.other_id}: {self.count}"
+
+
+# ─── Profile Term Index ───────────────────────────────────────────────────────
+
+class ProfileTerm(models.Model):
+    """Term frequency of a keyword or `skill:<id>` term in one row of a user's profile."""
+    SECTION_CHOICES = [
+        ('experience', 'Experience'),
+        ('project', 'Project'),
+        ('achievement', 'Achievement'),
+        ('skill', 'Skill'),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='profile_terms',
+    )
+    section = models.CharField(max_length=20, choices=SECTION_CHOICES)
+    row = models.UUIDField()
+    term = models.CharField(max_length=100)
+    tf = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        db_table = '"resumeanalyzer"."profile_terms"'
+        verbose_name = 'Profile Term'
+        verbose_name_plural = 'Profile Terms'
+        unique_together = [['section', 'row', 'term']]
+        indexes = [
+            models.Index(fields=['user', 'term'], name='idx_profile_terms_user_term'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} — {self.section} {self.row}: {self.term} ×{self.tf}"
+
+
+# ─── Generation Audit Log ─────────────────────────────────────────────────────
+
+class GenerationEvent(models.Model):
+    """One analyzer generation request; written in batches by AnalyzerApp.audit."""
+    CACHE_CHOICES = [
+        ('hit', 'Hit'),
+        ('miss', 'Miss'),
+        ('bypass', 'Bypass'),
+    ]
+    STATUS_CHOICES = [
+        ('success', 'Success'),
+        ('fallback', 'Template Fallback'),
+        ('over_quota', 'Over Quota'),
+        ('error', 'Error'),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='generation_events',
+    )
+    endpoint = models.CharField(max_length=100)
+    section = models.CharField(max_length=20, choices=TailoredSection.SECTION_CHOICES)
+    mode = models.CharField(max_length=10)
+    model = models.CharField(max_length=100, blank=True, default='')
+    prompt_tokens = models.IntegerField(default=0)
+    completion_tokens = models.IntegerField(default=0)
+    latency_ms = models.IntegerField(default=0)
+    cache_status = models.CharField(max_length=10, choices=CACHE_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='success')
+    # Set when the event happens, not when the batch is written
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = '"resumeanalyzer"."generation_events"'
+        verbose_name = 'Generation Event'
+        verbose_name_plural = 'Generation Events'
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='idx_generation_events_user'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} — {self.endpoint} {self.status} ({self.cache_status})"
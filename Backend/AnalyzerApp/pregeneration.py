@@ -0,0 +1,269 @@
+"""
+Speculative tailoring for newly created applications.
+
+Creating an application with a job description queues a background job that
+generates the experience, project and skill sections with the defaults the
+generator pages start from, so the first analyzer request for the application
+is served from the tailored store. Jobs run on one worker thread per process,
+behind a token bucket and the user's token quota, and yield to interactive
+generations. Deleting the application cancels its job, including the LLM
+call in flight: the job's cancel event is passed to the provider, and only
+the calls that completed are charged to the quota.
+"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from BackendApp.models import Applications, Experiences, Projects
+from AnalyzerApp import tailoring, quotas, audit
+from AnalyzerApp.Analysis import llm_code, metrics, usage
+from AnalyzerApp.Analysis.genrators import (
+    generate_experience_output,
+    generate_project_output,
+    generate_skill_output,
+)
+from AnalyzerApp.Analysis.providers import CancelledError
+
+logger = logging.getLogger(__name__)
+
+SECTIONS = ('experience', 'project', 'skill')
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per minute with bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate / 60.0
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        """Take a token, or return the seconds until one is available."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+class Job:
+    def __init__(self, application_id, user_id):
+        self.application_id = application_id
+        self.user_id = user_id
+        self.cancelled = threading.Event()
+        self.running = None
+        self.done = {section: threading.Event() for section in SECTIONS}
+
+    def finish(self):
+        for event in self.done.values():
+            event.set()
+
+
+class Scheduler:
+    def __init__(self):
+        self._queue = []
+        self._seq = itertools.count()
+        self._jobs = {}
+        self._cond = threading.Condition()
+        self._thread = None
+        self._interactive = 0
+        self.bucket = TokenBucket(settings.ANALYZER_PREGENERATE_RATE, settings.ANALYZER_PREGENERATE_BURST)
+
+    def enqueue(self, application, priority=10):
+        with self._cond:
+            if application.pk in self._jobs:
+                return self._jobs[application.pk]
+            job = Job(application.pk, application.user_id)
+            self._jobs[application.pk] = job
+            heapq.heappush(self._queue, (priority, next(self._seq), job))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='analyzer-pregeneration', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        metrics.incr('pregen.queued')
+        return job
+
+    def cancel(self, application_id):
+        with self._cond:
+            job = self._jobs.pop(application_id, None)
+        if job is not None:
+            job.cancelled.set()
+            job.finish()
+            metrics.incr('pregen.cancelled')
+
+    def pending(self, application_id):
+        with self._cond:
+            return self._jobs.get(application_id)
+
+    def begin_interactive(self):
+        with self._cond:
+            self._interactive += 1
+
+    def end_interactive(self):
+        with self._cond:
+            self._interactive -= 1
+            self._cond.notify_all()
+
+    def _wait_turn(self, job):
+        """Block until no interactive generation is running and the rate limit allows a call."""
+        while not job.cancelled.is_set():
+            with self._cond:
+                while self._interactive > 0 and not job.cancelled.is_set():
+                    self._cond.wait(1.0)
+            delay = self.bucket.try_acquire()
+            if not delay:
+                return True
+            job.cancelled.wait(delay)
+        return False
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                _, _, job = heapq.heappop(self._queue)
+            try:
+                if not job.cancelled.is_set():
+                    run_job(job, self._wait_turn)
+            except Exception:
+                metrics.incr('pregen.errors')
+                logger.exception("Pre-generation failed for application %s", job.application_id)
+            finally:
+                job.finish()
+                with self._cond:
+                    if self._jobs.get(job.application_id) is job:
+                        del self._jobs[job.application_id]
+                close_old_connections()
+
+
+def default_inputs(application, section, experience_output=None, project_output=None):
+    """
+    Request inputs the generator pages send by default for an application they
+    were opened from, so the analyzer request hashes match: the application's
+    job title and description and the bullet counts from analyzer/defaults.
+    """
+    base = {
+        "job_role": application.job_name,
+        "job_description": application.job_description,
+    }
+    if section == 'experience':
+        count = Experiences.objects.filter(user_id=application.user_id).count()
+        return {**base, "points_count": [settings.ANALYZER_EXPERIENCE_POINTS] * count, "additional_instruction": ""}
+    if section == 'project':
+        count = Projects.objects.filter(user_id=application.user_id).count()
+        return {**base, "points_count": [settings.ANALYZER_PROJECT_POINTS] * count, "additional_instruction": ""}
+    return {
+        **base,
+        "additional_instruction": "",
+        "include_web_research": False,
+        "experience_data": experience_output,
+        "project_data": project_output,
+    }
+
+
+def _generate(section, inputs):
+    if section == 'experience':
+        return generate_experience_output(
+            inputs["job_role"], inputs["job_description"], inputs["points_count"], inputs["additional_instruction"],
+        )
+    if section == 'project':
+        return generate_project_output(
+            inputs["job_role"], inputs["job_description"], inputs["points_count"], inputs["additional_instruction"],
+        )
+    return generate_skill_output(
+        inputs["job_role"], inputs["job_description"], inputs["additional_instruction"],
+        inputs["include_web_research"], inputs["experience_data"], inputs["project_data"],
+    )
+
+
+def run_job(job, wait_turn):
+    application = Applications.objects.filter(id=job.application_id).select_related('user').first()
+    if application is None or not application.job_description:
+        return
+    outputs = {}
+    for section in SECTIONS:
+        if job.cancelled.is_set():
+            return
+        inputs = default_inputs(application, section, outputs.get('experience'), outputs.get('project'))
+        req_hash = tailoring.request_hash(section, **inputs)
+        cached, output = tailoring.find_cached(application, section, req_hash)
+        if cached is None:
+            if not wait_turn(job):
+                return
+            job.running = section
+            try:
+                reservation = quotas.reserve(application.user, quotas.estimate(section, inputs))
+            except quotas.QuotaExceeded:
+                metrics.incr('pregen.over_quota')
+                return
+            started = time.perf_counter()
+            try:
+                with usage.track() as tracker, llm_code.cancellable(job.cancelled):
+                    try:
+                        output = _generate(section, inputs)
+                    finally:
+                        quotas.settle(reservation, tracker.total_tokens)
+            except CancelledError:
+                if not job.cancelled.is_set():
+                    raise
+                metrics.incr('pregen.cancelled_in_flight')
+                return
+            audit.record(
+                user_id=application.user_id, endpoint='pregeneration', section=section, mode='llm',
+                model=', '.join(m for m in tracker.models if m)[:100],
+                prompt_tokens=tracker.prompt_tokens, completion_tokens=tracker.completion_tokens,
+                latency_ms=int((time.perf_counter() - started) * 1000), cache_status='miss',
+            )
+            if job.cancelled.is_set():
+                return
+            tailoring.save_tailoring(application.user, application, section, req_hash, inputs["job_role"], output)
+            metrics.incr('pregen.sections')
+            job.running = None
+        outputs[section] = output
+        job.done[section].set()
+
+
+scheduler = Scheduler()
+
+
+def schedule(application):
+    if settings.ANALYZER_PREGENERATE and application.job_description:
+        return scheduler.enqueue(application)
+    return None
+
+
+def cancel(application_id):
+    scheduler.cancel(application_id)
+
+
+def wait_for(application_id, section, timeout=None):
+    """
+    Wait for a pre-generation of `section` that is already running for the
+    application, so an analyzer request does not pay for the same call twice.
+    Returns immediately when the section is not being generated.
+    """
+    job = scheduler.pending(application_id)
+    if job is None or job.running != section:
+        return
+    job.done[section].wait(settings.ANALYZER_PREGENERATE_WAIT if timeout is None else timeout)
+
+
+# Mark an interactive generation; background jobs wait until none are running
+@contextmanager
+def interactive():
+    scheduler.begin_interactive()
+    try:
+        yield
+    finally:
+        scheduler.end_interactive()
@@ -0,0 +1,160 @@
+"""
+Per-user term index of the profile (experiences, projects, achievements and
+skills), kept in ProfileTerm and refreshed row by row after profile writes.
+
+Profile scoring (match_matrix) reads it instead of re-tokenizing the profile.
+The template generators do not: they rank sentences of the generators'
+profile snapshot (genrators.db_path), which has its own rows and needs
+per-sentence terms rather than per-row totals. Catalog skill terms come from
+skill_demand.catalog_matcher(), cached per catalog version, so a refresh
+costs one stamp read on top of the rows it indexes.
+"""
+import uuid
+from collections import Counter, defaultdict
+
+from django.db import transaction
+
+from BackendApp.models import Experiences, Projects, Achievements, UserSkills, ProjectSkills
+from AnalyzerApp.Analysis.keywords import keywords
+from .models import ProfileTerm
+from . import commit_batches
+from .skill_demand import catalog_matcher
+
+# Profile fields whose text is indexed, per source model
+INDEXED_FIELDS = {
+    Experiences: ('role', 'experience_explanation'),
+    Projects: ('project_name', 'project_info'),
+    Achievements: ('achievement_point',),
+}
+
+SECTIONS = {
+    Experiences: 'experience',
+    Projects: 'project',
+    Achievements: 'achievement',
+    UserSkills: 'skill',
+}
+
+
+def text_terms(text, matcher, skill_ids=()):
+    """Term frequencies of a text: keywords plus `skill:<id>` for catalog skills it names."""
+    counts = Counter(t[:100] for t in keywords(text))
+    for skill_id in {str(s) for s in matcher.match(text)} | {str(s) for s in skill_ids}:
+        counts[f"skill:{skill_id}"] = max(counts[f"skill:{skill_id}"], 1)
+    return counts
+
+
+def _rows(section, row_ids):
+    """{row_id: (user_id, text, linked skill ids)} for the given rows of a section."""
+    if section == 'experience':
+        return {
+            str(pk): (user_id, f"{role or ''} {explanation}", ())
+            for pk, user_id, role, explanation in Experiences.objects.filter(id__in=row_ids)
+            .values_list('id', 'user_id', 'role', 'experience_explanation')
+        }
+    if section == 'achievement':
+        return {
+            str(pk): (user_id, point, ())
+            for pk, user_id, point in Achievements.objects.filter(id__in=row_ids)
+            .values_list('id', 'user_id', 'achievement_point')
+        }
+    if section == 'project':
+        skills = defaultdict(list)
+        for project_id, skill_id, name in ProjectSkills.objects.filter(project_id__in=row_ids).values_list(
+            'project_id', 'skill_id', 'skill__skill_name',
+        ):
+            skills[str(project_id)].append((skill_id, name))
+        return {
+            str(pk): (
+                user_id,
+                ' '.join([name, info] + [n for _, n in skills[str(pk)]]),
+                [s for s, _ in skills[str(pk)]],
+            )
+            for pk, user_id, name, info in Projects.objects.filter(id__in=row_ids)
+            .values_list('id', 'user_id', 'project_name', 'project_info')
+        }
+    return {
+        str(pk): (user_id, name, (skill_id,))
+        for pk, user_id, skill_id, name in UserSkills.objects.filter(id__in=row_ids)
+        .values_list('id', 'user_id', 'skill_id', 'skill__skill_name')
+    }
+
+
+def refresh_rows(rows, matcher=None):
+    """
+    Re-index the given (section, row_id) pairs. Rows whose terms changed are
+    rewritten with one delete and one bulk insert per section, however many
+    rows there are; rows that no longer exist lose their terms.
+    """
+    by_section = defaultdict(set)
+    for section, row_id in rows:
+        by_section[section].add(str(row_id))
+
+    with transaction.atomic():
+        for section, row_ids in by_section.items():
+            sources = _rows(section, row_ids)
+            existing = defaultdict(dict)
+            for row_id, term, tf in ProfileTerm.objects.filter(section=section, row__in=row_ids).values_list(
+                'row', 'term', 'tf',
+            ):
+                existing[str(row_id)][term] = tf
+
+            stale = {row_id for row_id in row_ids - set(sources) if existing[row_id]}
+            created = []
+            for row_id, (user_id, text, skill_ids) in sources.items():
+                if matcher is None:
+                    matcher = catalog_matcher()
+                old, new = existing[row_id], text_terms(text, matcher, skill_ids)
+                if old == new:
+                    continue
+                if old:
+                    stale.add(row_id)
+                created.extend(
+                    ProfileTerm(user_id=user_id, section=section, row=row_id, term=term, tf=tf)
+                    for term, tf in new.items()
+                )
+            if stale:
+                ProfileTerm.objects.filter(section=section, row__in=stale).delete()
+            ProfileTerm.objects.bulk_create(created, ignore_conflicts=True, batch_size=1000)
+
+
+def schedule_refresh(section, row_id):
+    """
+    Re-index a row once the current transaction commits (or now, outside one).
+    Rows touched in the same transaction are refreshed together.
+    """
+    commit_batches.add(refresh_rows, (section, str(row_id)))
+
+
+def profile_terms(user, sections=None):
+    """
+    The user's indexed profile as {term: tf} summed over rows, and the set
+    of catalog skill IDs it evidences.
+    """
+    qs = ProfileTerm.objects.filter(user=user)
+    if sections:
+        qs = qs.filter(section__in=sections)
+    counts = Counter()
+    skill_ids = set()
+    for term, tf in qs.values_list('term', 'tf'):
+        if term.startswith('skill:'):
+            skill_ids.add(uuid.UUID(term[len('skill:'):]))
+        else:
+            counts[term] += tf
+    return counts, skill_ids
+
+
+def rebuild(user=None):
+    """Re-index every profile row from scratch. Used for backfills and after catalog changes."""
+    terms = ProfileTerm.objects.all()
+    if user is not None:
+        terms = terms.filter(user=user)
+    rows = []
+    for model, section in SECTIONS.items():
+        qs = model.objects.all()
+        if user is not None:
+            qs = qs.filter(user=user)
+        rows.extend((section, pk) for pk in qs.values_list('id', flat=True))
+    with transaction.atomic():
+        terms.delete()
+        refresh_rows(rows, matcher=catalog_matcher())
+    return len(rows)
@@ -0,0 +1,143 @@
+"""
+Runs a fixed corpus of profiles and job descriptions through every prompt
+variant and reports token counts, latency and output validity per variant.
+Results can be compared with a stored baseline to catch prompt changes that
+make calls slower, more expensive or less reliable.
+"""
+import json
+import os
+
+from AnalyzerApp.Analysis import metrics, routing
+from AnalyzerApp.Analysis.json_repair import loads_with_repair, JSONRepairError
+from AnalyzerApp.Analysis.prompt_variants import VARIANTS, TEMPERATURES
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks')
+CORPUS_PATH = os.path.join(BENCHMARK_DIR, 'corpus.json')
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'baseline.json')
+
+
+def load_corpus(path=CORPUS_PATH):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _points_ok(items, output, id_key, points_key):
+    expected = {str(i[id_key]): int(i["resume_points"]) for i in items}
+    got = {}
+    for item in output:
+        if not isinstance(item, dict) or not isinstance(item.get(points_key), list):
+            return False
+        if not all(isinstance(p, str) and p.strip() for p in item[points_key]):
+            return False
+        got[str(item.get(id_key))] = len(item[points_key])
+    return got == expected
+
+
+def validate(section, items, output):
+    """True when the output matches the schema the views and genrators.py rely on."""
+    if not isinstance(output, list) or not output:
+        return False
+    if section == "experience":
+        return all("experience_role" in i for i in output) and _points_ok(items, output, "experience_id", "resume_points")
+    if section == "project":
+        return (
+            all(isinstance(i.get("project_skills"), list) and "project_name" in i for i in output)
+            and _points_ok(items, output, "project_id", "project_points")
+        )
+    return all(
+        isinstance(i, dict) and isinstance(i.get("skill_category"), str)
+        and isinstance(i.get("skills"), list) and all(isinstance(s, str) for s in i["skills"])
+        for i in output
+    )
+
+
+def _section_args(section, profile, jd):
+    if section == "experience":
+        items = profile["experiences"]
+        return items, (jd["job_role"], jd["job_description"], items, None)
+    if section == "project":
+        items = profile["projects"]
+        return items, (jd["job_role"], jd["job_description"], items, None)
+    items = profile["skills"]
+    # Earlier sections stand in as the generated evidence the skill prompt validates against
+    experience = [
+        {"experience_role": e["experience_role"], "resume_points": [e["experience_description"]]}
+        for e in profile["experiences"]
+    ]
+    projects = [
+        {"project_name": p["project_name"], "project_points": [p["project_description"]], "project_skills": p["project_skills"]}
+        for p in profile["projects"]
+    ]
+    return items, (jd["job_role"], jd["job_description"], items, experience, projects, False, None)
+
+
+def run(provider, model=None, corpus=None, sections=None, variants=None):
+    """
+    Returns:
+        dict: {section: {variant: summary}} with average tokens, latency percentiles and validity rates
+    """
+    corpus = corpus or load_corpus()
+    report = {}
+    for section, section_variants in VARIANTS.items():
+        if sections and section not in sections:
+            continue
+        for name, build in section_variants.items():
+            if variants and name not in variants:
+                continue
+            prompt_tokens, completion_tokens, latencies = [], [], []
+            valid = strict = 0
+            calls = 0
+            for profile in corpus["profiles"]:
+                for jd in corpus["job_descriptions"]:
+                    items, args = _section_args(section, profile, jd)
+                    completion = provider.complete(
+                        build(*args), model=model, temperature=TEMPERATURES[section],
+                        max_tokens=routing.max_tokens_for(section, items),
+                    )
+                    calls += 1
+                    prompt_tokens.append(completion.usage.get("prompt_tokens") or 0)
+                    completion_tokens.append(completion.usage.get("completion_tokens") or 0)
+                    latencies.append(completion.latency or 0.0)
+                    try:
+                        json.loads(completion.content)
+                        strict += 1
+                    except ValueError:
+                        pass
+                    try:
+                        output = loads_with_repair(completion.content, root="[")
+                    except JSONRepairError:
+                        continue
+                    valid += validate(section, items, output)
+            report.setdefault(section, {})[name] = {
+                "calls": calls,
+                "avg_prompt_tokens": round(sum(prompt_tokens) / calls, 1),
+                "avg_completion_tokens": round(sum(completion_tokens) / calls, 1),
+                "p50_ms": round(metrics.percentile(latencies, 50) * 1000, 1),
+                "p95_ms": round(metrics.percentile(latencies, 95) * 1000, 1),
+                "valid_rate": round(valid / calls, 4),
+                "strict_json_rate": round(strict / calls, 4),
+            }
+    return report
+
+
+def regressions(report, baseline, tolerance=0.05, latency_floor_ms=5.0):
+    """
+    Variants that got worse than the baseline: more prompt or completion
+    tokens or higher p50 latency beyond `tolerance`, or a lower validity rate.
+    Latency is only compared when the baseline is above `latency_floor_ms`,
+    so zero-latency stub runs do not flap.
+    """
+    problems = []
+    for section, section_report in report.items():
+        for name, current in section_report.items():
+            before = baseline.get(section, {}).get(name)
+            if not before:
+                continue
+            for key in ("avg_prompt_tokens", "avg_completion_tokens"):
+                if current[key] > before[key] * (1 + tolerance):
+                    problems.append(f"{section}/{name}: {key} {before[key]} -> {current[key]}")
+            if before["p50_ms"] >= latency_floor_ms and current["p50_ms"] > before["p50_ms"] * (1 + tolerance):
+                problems.append(f"{section}/{name}: p50_ms {before['p50_ms']} -> {current['p50_ms']}")
+            if current["valid_rate"] < before["valid_rate"]:
+                problems.append(f"{section}/{name}: valid_rate {before['valid_rate']} -> {current['valid_rate']}")
+    return problems
@@ -0,0 +1,123 @@
+import json
+import math
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from AnalyzerApp.Analysis import chunking, routing
+from .models import LLMUsage
+
+# Prompt tokens per call beyond the request text: instructions and the profile
+PROMPT_OVERHEAD_TOKENS = 1500
+CHARS_PER_TOKEN = 4
+
+
+class QuotaExceeded(Exception):
+    def __init__(self, period, limit, used):
+        self.period = period
+        self.limit = limit
+        self.used = used
+        super().__init__(f"{period.capitalize()} token quota of {limit} exceeded")
+
+
+@dataclass
+class Reservation:
+    user_id: object
+    tokens: int
+    periods: list = field(default_factory=list)
+
+
+def limits():
+    return {
+        'day': settings.LLM_DAILY_TOKEN_QUOTA or None,
+        'month': settings.LLM_MONTHLY_TOKEN_QUOTA or None,
+    }
+
+
+def period_starts(today=None):
+    today = today or timezone.now().date()
+    return {'day': today, 'month': today.replace(day=1)}
+
+
+def estimate(section, inputs):
+    """
+    Tokens a generation may use: its prompt text plus the completion cap
+    routing will give it, per call when the section is generated in chunks.
+    The profile part of the prompt is covered by PROMPT_OVERHEAD_TOKENS.
+    """
+    items = [{"resume_points": n} for n in inputs.get("points_count") or []]
+    text = sum(len(str(inputs.get(k) or "")) for k in ("job_role", "job_description", "additional_instruction"))
+    text += sum(len(json.dumps(inputs.get(k) or [])) for k in ("experience_data", "project_data"))
+    calls = 1
+    if len(items) >= chunking.CHUNK_MIN_ITEMS:
+        calls = math.ceil(len(items) / chunking.CHUNK_SIZE)
+    per_call = PROMPT_OVERHEAD_TOKENS + text // CHARS_PER_TOKEN
+    return calls * per_call + routing.max_tokens_for(section, items)
+
+
+def reserve(user, tokens=None):
+    """
+    Reserve up to `tokens` against every period of the user's quota before an
+    LLM call, capped at what is left in the tightest period; settle() later
+    replaces it with the real usage. The period rows are locked while
+    reserving, so concurrent requests can never reserve past a limit.
+    Raises QuotaExceeded when a period has nothing left.
+    """
+    tokens = settings.LLM_QUOTA_RESERVE_TOKENS if tokens is None else tokens
+    if not settings.LLM_TOKEN_ACCOUNTING:
+        return Reservation(user.pk, 0)
+    starts = period_starts()
+    with transaction.atomic():
+        LLMUsage.objects.bulk_create(
+            [LLMUsage(user=user, period=p, period_start=s) for p, s in starts.items()], ignore_conflicts=True,
+        )
+        rows = {
+            row.period: row
+            for row in LLMUsage.objects.select_for_update().filter(user=user, period_start__in=set(starts.values()))
+            if starts[row.period] == row.period_start
+        }
+        for period, limit in limits().items():
+            if limit is not None:
+                left = limit - rows[period].tokens
+                if left <= 0:
+                    raise QuotaExceeded(period, limit, rows[period].tokens)
+                tokens = min(tokens, left)
+        LLMUsage.objects.filter(pk__in=[row.pk for row in rows.values()]).update(
+            tokens=F('tokens') + tokens, requests=F('requests') + 1,
+        )
+    return Reservation(user.pk, tokens, list(starts.items()))
+
+
+def settle(reservation, used_tokens):
+    """Replace the reserved amount with the tokens the provider actually reported."""
+    delta = used_tokens - reservation.tokens
+    if not reservation.periods or not delta:
+        return
+    for period, start in reservation.periods:
+        LLMUsage.objects.filter(
+            user_id=reservation.user_id, period=period, period_start=start,
+        ).update(tokens=F('tokens') + delta)
+
+
+def usage_summary(user):
+    starts = period_starts()
+    rows = {
+        row.period: row
+        for row in LLMUsage.objects.filter(user=user, period_start__in=set(starts.values()))
+        if starts[row.period] == row.period_start
+    }
+    summary = {}
+    for period, limit in limits().items():
+        row = rows.get(period)
+        used = row.tokens if row else 0
+        summary[period] = {
+            "period_start": starts[period],
+            "used_tokens": used,
+            "requests": row.requests if row else 0,
+            "limit": limit,
+            "remaining": max(limit - used, 0) if limit is not None else None,
+        }
+    return summary
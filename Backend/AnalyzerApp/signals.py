@@ -0,0 +1,102 @@
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from BackendApp.models import Applications, UserSkills, ProjectSkills, Experiences, Projects, Achievements
+from . import skill_demand, pregeneration, skill_cooccurrence, profile_index
+
+_NOT_LOADED = object()
+
+
+# ─── Skill demand counters ────────────────────────────────────────────────────
+
+@receiver(post_init, sender=Applications)
+def remember_job_description(sender, instance, **kwargs):
+    # Read from __dict__ so deferred fields are not fetched
+    instance._saved_job_description = instance.__dict__.get('job_description', _NOT_LOADED)
+
+
+@receiver(post_save, sender=Applications)
+def update_skill_demand(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and 'job_description' not in update_fields:
+        return
+    if created and not instance.job_description:
+        return
+    if not created and instance._saved_job_description == instance.job_description:
+        return
+    skill_demand.record_job_description(instance)
+    instance._saved_job_description = instance.job_description
+
+
+@receiver(pre_delete, sender=Applications)
+def release_skill_demand(sender, instance, **kwargs):
+    skill_demand.forget_application(instance)
+
+
+# ─── Speculative pre-generation ───────────────────────────────────────────────
+
+@receiver(post_save, sender=Applications)
+def schedule_pregeneration(sender, instance, created, **kwargs):
+    if created and instance.job_description:
+        transaction.on_commit(lambda: pregeneration.schedule(instance))
+
+
+@receiver(pre_delete, sender=Applications)
+def cancel_pregeneration(sender, instance, **kwargs):
+    pregeneration.cancel(instance.pk)
+
+
+# ─── Skill co-occurrence ──────────────────────────────────────────────────────
+# bulk_create and queryset.update() skip these; such paths must call
+# skill_cooccurrence.schedule_refresh() for the baskets they touch.
+
+@receiver([post_save, post_delete], sender=UserSkills)
+def refresh_user_basket(sender, instance, **kwargs):
+    skill_cooccurrence.schedule_refresh('user', instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=ProjectSkills)
+def refresh_project_basket(sender, instance, **kwargs):
+    skill_cooccurrence.schedule_refresh('project', instance.project_id)
+
+
+# ─── Profile term index ───────────────────────────────────────────────────────
+# Same caveat as above: bulk paths must call profile_index.schedule_refresh().
+
+@receiver(post_init, sender=Experiences)
+@receiver(post_init, sender=Projects)
+@receiver(post_init, sender=Achievements)
+def remember_indexed_text(sender, instance, **kwargs):
+    instance._indexed_text = tuple(
+        instance.__dict__.get(f, _NOT_LOADED) for f in profile_index.INDEXED_FIELDS[sender]
+    )
+
+
+@receiver(post_save, sender=Experiences)
+@receiver(post_save, sender=Projects)
+@receiver(post_save, sender=Achievements)
+def reindex_profile_row(sender, instance, created, **kwargs):
+    # Reorders and other saves that leave the text alone skip the index
+    text = tuple(getattr(instance, f) for f in profile_index.INDEXED_FIELDS[sender])
+    if created or text != instance._indexed_text:
+        profile_index.schedule_refresh(profile_index.SECTIONS[sender], instance.pk)
+    instance._indexed_text = text
+
+
+@receiver(post_save, sender=UserSkills)
+def index_user_skill(sender, instance, created, **kwargs):
+    if created:
+        profile_index.schedule_refresh('skill', instance.pk)
+
+
+@receiver(post_delete, sender=Experiences)
+@receiver(post_delete, sender=Projects)
+@receiver(post_delete, sender=Achievements)
+@receiver(post_delete, sender=UserSkills)
+def unindex_profile_row(sender, instance, **kwargs):
+    profile_index.schedule_refresh(profile_index.SECTIONS[sender], instance.pk)
+
+
+@receiver([post_save, post_delete], sender=ProjectSkills)
+def reindex_project_skills(sender, instance, **kwargs):
+    profile_index.schedule_refresh('project', instance.project_id)
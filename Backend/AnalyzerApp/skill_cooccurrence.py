@@ -0,0 +1,219 @@
+import math
+from collections import Counter, defaultdict
+from itertools import combinations
+
+from django.db import transaction
+from django.db.models import Q
+
+from BackendApp.models import Skills, UserSkills, ProjectSkills
+from .models import SkillBasket, SkillOccurrence, SkillCooccurrence
+from .skill_demand import catalog_matcher
+from . import commit_batches
+
+# Pairs seen in fewer baskets are too noisy to recommend from
+MIN_SUPPORT = 2
+
+
+def _basket_skills(kind, key):
+    if kind == 'user':
+        qs = UserSkills.objects.filter(user_id=key)
+    else:
+        qs = ProjectSkills.objects.filter(project_id=key)
+    return {str(s) for s in qs.values_list('skill_id', flat=True)}
+
+
+def _pairs(skill_ids):
+    """Directed pairs for a basket; both directions are stored."""
+    return {(a, b) for x, y in combinations(sorted(skill_ids), 2) for a, b in ((x, y), (y, x))}
+
+
+def _move(model, fields, deltas):
+    """
+    Add `deltas` ({key tuple of `fields`: n}) to the counters of `model` in a
+    fixed number of statements: insert missing counters, lock and read the
+    affected ones, write the new counts with one bulk_update, and drop those
+    that reached zero.
+    """
+    deltas = {k: n for k, n in deltas.items() if n}
+    if not deltas:
+        return
+    model.objects.bulk_create(
+        [model(**dict(zip(fields, k))) for k, n in deltas.items() if n > 0],
+        ignore_conflicts=True, batch_size=1000,
+    )
+    qs = model.objects.select_for_update().order_by('pk')
+    for i, field in enumerate(fields):
+        qs = qs.filter(**{f'{field}__in': {k[i] for k in deltas}})
+    changed = []
+    for row in qs:
+        n = deltas.get(tuple(str(getattr(row, f)) for f in fields))
+        if n:
+            row.count += n
+            changed.append(row)
+    model.objects.bulk_update(changed, ['count'], batch_size=1000)
+    model.objects.filter(pk__in=[r.pk for r in changed if r.count <= 0]).delete()
+
+
+def refresh_baskets(baskets):
+    """
+    Re-read the given (kind, key) baskets and move the counters by the
+    difference from their last counted snapshots. The statement count does
+    not depend on how many baskets changed, so bulk profile writes stay
+    cheap. Idempotent, so it is safe to call after any change.
+    """
+    keys = defaultdict(set)
+    for kind, key in baskets:
+        keys[kind].add(str(key))
+    if not keys:
+        return
+
+    with transaction.atomic():
+        scope = Q(pk__in=[])
+        for kind, kind_keys in keys.items():
+            scope |= Q(kind=kind, key__in=kind_keys)
+        stored = {(b.kind, b.key): b for b in SkillBasket.objects.select_for_update().filter(scope)}
+        current = defaultdict(set)
+        if keys['user']:
+            for user_id, skill_id in UserSkills.objects.filter(user_id__in=keys['user']).values_list('user_id', 'skill_id'):
+                current[('user', str(user_id))].add(str(skill_id))
+        if keys['project']:
+            for project_id, skill_id in ProjectSkills.objects.filter(project_id__in=keys['project']).values_list(
+                'project_id', 'skill_id',
+            ):
+                current[('project', str(project_id))].add(str(skill_id))
+
+        occurrences, pairs = Counter(), Counter()
+        emptied, changed, created = [], [], []
+        for kind, kind_keys in keys.items():
+            for key in kind_keys:
+                basket = stored.get((kind, key))
+                old = set(basket.skills) if basket else set()
+                new = current[(kind, key)]
+                if old == new:
+                    continue
+                occurrences.update((s,) for s in new - old)
+                occurrences.subtract((s,) for s in old - new)
+                old_pairs, new_pairs = _pairs(old), _pairs(new)
+                pairs.update(new_pairs - old_pairs)
+                pairs.subtract(old_pairs - new_pairs)
+                if not new:
+                    emptied.append(basket.pk)
+                elif basket:
+                    basket.skills = sorted(new)
+                    changed.append(basket)
+                else:
+                    created.append(SkillBasket(kind=kind, key=key, skills=sorted(new)))
+
+        _move(SkillOccurrence, ('skill_id',), occurrences)
+        _move(SkillCooccurrence, ('skill_id', 'other_id'), pairs)
+        if emptied:
+            SkillBasket.objects.filter(pk__in=emptied).delete()
+        SkillBasket.objects.bulk_update(changed, ['skills'], batch_size=1000)
+        SkillBasket.objects.bulk_create(created, batch_size=1000)
+
+
+def refresh_basket(kind, key):
+    refresh_baskets([(kind, key)])
+
+
+def schedule_refresh(kind, key):
+    """
+    Refresh a basket once the current transaction commits (or now, outside one).
+    A basket touched several times in one transaction is refreshed once.
+    """
+    commit_batches.add(refresh_baskets, (kind, str(key)))
+
+
+def rebuild():
+    """Recount every basket from UserSkills and ProjectSkills. Used for backfills."""
+    baskets = defaultdict(set)
+    for user_id, skill_id in UserSkills.objects.values_list('user_id', 'skill_id').iterator():
+        baskets[('user', str(user_id))].add(str(skill_id))
+    for project_id, skill_id in ProjectSkills.objects.values_list('project_id', 'skill_id').iterator():
+        baskets[('project', str(project_id))].add(str(skill_id))
+
+    occurrences = Counter()
+    pairs = Counter()
+    for skills in baskets.values():
+        occurrences.update(skills)
+        pairs.update(_pairs(skills))
+
+    with transaction.atomic():
+        SkillBasket.objects.all().delete()
+        SkillOccurrence.objects.all().delete()
+        SkillCooccurrence.objects.all().delete()
+        SkillBasket.objects.bulk_create(
+            [SkillBasket(kind=kind, key=key, skills=sorted(s)) for (kind, key), s in baskets.items()], batch_size=1000,
+        )
+        SkillOccurrence.objects.bulk_create(
+            [SkillOccurrence(skill_id=s, count=n) for s, n in occurrences.items()], batch_size=1000,
+        )
+        SkillCooccurrence.objects.bulk_create(
+            [SkillCooccurrence(skill_id=a, other_id=b, count=n) for (a, b), n in pairs.items()], batch_size=1000,
+        )
+    return len(baskets), len(pairs) // 2
+
+
+def recommend(seed_ids, limit=20, min_support=MIN_SUPPORT):
+    """
+    Skills that co-occur with the seed skills, scored by summed positive PMI.
+
+    PMI and lift are derived from the stored counts at read time, so they
+    never go stale as the counts move incrementally.
+    """
+    seed_ids = {str(s) for s in seed_ids}
+    if not seed_ids:
+        return []
+    rows = list(
+        SkillCooccurrence.objects.filter(skill_id__in=seed_ids, count__gte=min_support)
+        .exclude(other_id__in=seed_ids)
+        .values_list('skill_id', 'other_id', 'count')
+    )
+    if not rows:
+        return []
+    total = SkillBasket.objects.count()
+    involved = {str(a) for a, _, _ in rows} | {str(b) for _, b, _ in rows}
+    occurrence = {str(k): v for k, v in SkillOccurrence.objects.filter(skill_id__in=involved).values_list('skill_id', 'count')}
+
+    scores = defaultdict(lambda: {"score": 0.0, "lift": 0.0, "support": 0, "via": []})
+    for a, b, n in rows:
+        a, b = str(a), str(b)
+        if not occurrence.get(a) or not occurrence.get(b):
+            continue
+        lift = n * total / (occurrence[a] * occurrence[b])
+        entry = scores[b]
+        entry["score"] += max(math.log(lift), 0.0)
+        entry["lift"] = max(entry["lift"], lift)
+        entry["support"] += n
+        entry["via"].append((lift, a))
+
+    ranked = sorted(
+        ((s, e) for s, e in scores.items() if e["score"] > 0),
+        key=lambda item: (-item[1]["score"], -item[1]["support"]),
+    )[:limit]
+    names = {
+        str(k): (v.skill_name, v.category)
+        for k, v in Skills.objects.in_bulk([s for s, _ in ranked] + [a for _, e in ranked for _, a in e["via"]]).items()
+    }
+    return [
+        {
+            "skillId": skill_id,
+            "skillName": names[skill_id][0],
+            "category": names[skill_id][1],
+            "score": round(e["score"], 4),
+            "lift": round(e["lift"], 4),
+            "support": e["support"],
+            "relatedTo": [names[a][0] for _, a in sorted(e["via"], reverse=True)[:3] if a in names],
+        }
+        for skill_id, e in ranked if skill_id in names
+    ]
+
+
+def recommend_for_user(user, limit=20):
+    seeds = set(UserSkills.objects.filter(user=user).values_list('skill_id', flat=True))
+    seeds.update(ProjectSkills.objects.filter(project__user=user).values_list('skill_id', flat=True))
+    return recommend(seeds, limit)
+
+
+def recommend_for_text(job_description, limit=20):
+    return recommend(catalog_matcher().match(job_description), limit)
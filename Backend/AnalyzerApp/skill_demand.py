@@ -0,0 +1,147 @@
+import uuid
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from BackendApp import skill_catalog
+from BackendApp.models import Applications
+from AnalyzerApp.Analysis.keywords import CatalogMatcher
+from .models import ApplicationSkill, SkillDemand, GlobalSkillDemand
+
+# (catalog index, matcher built from it)
+_matcher = (None, None)
+
+
+def catalog_matcher():
+    """
+    Matcher over the skills catalog, built once per worker and catalog version
+    from the in-memory catalog index, so a call costs one stamp read.
+    """
+    global _matcher
+    catalog = skill_catalog.current()
+    built_from, matcher = _matcher
+    if built_from is not catalog:
+        matcher = CatalogMatcher((uuid.UUID(s['id']), s['skillName']) for s in catalog.skills)
+        _matcher = (catalog, matcher)
+    return matcher
+
+
+def _apply_delta(user_id, skill_ids, delta):
+    """Add `delta` to the user and global counters of `skill_ids` with single-statement updates."""
+    if not skill_ids:
+        return
+    if delta > 0:
+        SkillDemand.objects.bulk_create(
+            [SkillDemand(user_id=user_id, skill_id=s) for s in skill_ids], ignore_conflicts=True,
+        )
+        GlobalSkillDemand.objects.bulk_create(
+            [GlobalSkillDemand(skill_id=s) for s in skill_ids], ignore_conflicts=True,
+        )
+    SkillDemand.objects.filter(user_id=user_id, skill_id__in=skill_ids).update(count=F('count') + delta)
+    GlobalSkillDemand.objects.filter(skill_id__in=skill_ids).update(count=F('count') + delta)
+    if delta < 0:
+        SkillDemand.objects.filter(user_id=user_id, skill_id__in=skill_ids, count__lte=0).delete()
+        GlobalSkillDemand.objects.filter(skill_id__in=skill_ids, count__lte=0).delete()
+
+
+def record_job_description(application, matcher=None):
+    """
+    Sync the skills demanded by an application's stored job description and
+    move the counters by the difference only.
+    """
+    matcher = matcher or catalog_matcher()
+    with transaction.atomic():
+        # Concurrent saves of one application queue on its row, so each diffs against
+        # the skills the previous one stored and a change is counted once
+        locked = list(
+            Applications.objects.select_for_update().filter(pk=application.pk).values_list('job_description', flat=True)
+        )
+        if not locked:
+            return
+        job_description = locked[0]
+        new_ids = matcher.match(job_description) if job_description else set()
+        old_ids = set(
+            ApplicationSkill.objects.filter(application=application).values_list('skill_id', flat=True)
+        )
+        added = new_ids - old_ids
+        removed = old_ids - new_ids
+        if removed:
+            ApplicationSkill.objects.filter(application=application, skill_id__in=removed).delete()
+            _apply_delta(application.user_id, removed, -1)
+        if added:
+            ApplicationSkill.objects.bulk_create(
+                [ApplicationSkill(application=application, skill_id=s) for s in added], ignore_conflicts=True,
+            )
+            _apply_delta(application.user_id, added, 1)
+
+
+def forget_application(application):
+    """Decrement the counters for an application that is being deleted."""
+    skill_ids = list(ApplicationSkill.objects.filter(application=application).values_list('skill_id', flat=True))
+    _apply_delta(application.user_id, skill_ids, -1)
+
+
+def top_skills(user=None, limit=20, category=None):
+    """Most demanded skills for a user (or globally when `user` is None), served from the counter index."""
+    if user is not None:
+        qs = SkillDemand.objects.filter(user=user)
+    else:
+        qs = GlobalSkillDemand.objects.all()
+    if category:
+        qs = qs.filter(skill__category=category)
+    qs = qs.filter(count__gt=0).select_related('skill').order_by('-count')[:limit]
+    return [
+        {
+            "skillId": str(row.skill_id),
+            "skillName": row.skill.skill_name,
+            "category": row.skill.category,
+            "count": row.count,
+        }
+        for row in qs
+    ]
+
+
+def rebuild(user=None):
+    """
+    Recompute application skills and both counter tables from stored job
+    descriptions. Used for backfills and after catalog changes.
+    """
+    matcher = catalog_matcher()
+    apps = Applications.objects.exclude(job_description__isnull=True).exclude(job_description='')
+    if user is not None:
+        apps = apps.filter(user=user)
+
+    with transaction.atomic():
+        links = ApplicationSkill.objects.all()
+        if user is not None:
+            links = links.filter(application__user=user)
+        links.delete()
+        ApplicationSkill.objects.bulk_create(
+            [
+                ApplicationSkill(application_id=app_id, skill_id=skill_id)
+                for app_id, jd in apps.values_list('id', 'job_description').iterator()
+                for skill_id in matcher.match(jd)
+            ],
+            batch_size=1000,
+        )
+
+        demand = SkillDemand.objects.all()
+        if user is not None:
+            demand = demand.filter(user=user)
+        demand.delete()
+        per_user = ApplicationSkill.objects.values('application__user', 'skill').annotate(n=Count('id'))
+        if user is not None:
+            per_user = per_user.filter(application__user=user)
+        SkillDemand.objects.bulk_create(
+            [SkillDemand(user_id=r['application__user'], skill_id=r['skill'], count=r['n']) for r in per_user],
+            batch_size=1000,
+        )
+
+        GlobalSkillDemand.objects.all().delete()
+        GlobalSkillDemand.objects.bulk_create(
+            [
+                GlobalSkillDemand(skill_id=r['skill'], count=r['n'])
+                for r in ApplicationSkill.objects.values('skill').annotate(n=Count('id'))
+            ],
+            batch_size=1000,
+        )
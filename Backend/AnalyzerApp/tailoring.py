@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import unicodedata
+
+from django.db import transaction, IntegrityError
+from django.db.models import Max
+
+from AnalyzerApp.Analysis import genrators
+from .models import GeneratedBullet, TailoredSection
+
+# Output key holding the bullet list for each section
+BULLET_KEYS = {
+    'experience': 'resume_points',
+    'project': 'project_points',
+}
+
+# Tables of the generators' profile snapshot read by each section's generator
+PROFILE_TABLES = {
+    'experience': ('experiences',),
+    'project': ('projects', 'project_skills', 'skills'),
+    'skill': ('skills',),
+}
+
+_whitespace = re.compile(r'\s+')
+_quote_map = str.maketrans({'‘': "'", '’': "'", '“': '"', '”': '"', '–': '-', '—': '-'})
+
+
+def normalize_bullet(text):
+    """Normalize bullet text so near-identical generations share one stored row."""
+    text = unicodedata.normalize('NFKC', text).translate(_quote_map)
+    text = _whitespace.sub(' ', text).strip().lstrip('•-* ').rstrip('.').strip()
+    return text.casefold()
+
+
+def bullet_hash(text):
+    return hashlib.sha256(normalize_bullet(text).encode('utf-8')).hexdigest()
+
+
+def profile_fingerprint(section):
+    """
+    Hash of the profile rows the generator of `section` reads from the
+    generators' snapshot (genrators.db_path), or '' when it cannot be read.
+    """
+    path = genrators.db_path
+    if not path or not os.path.exists(path):
+        return ''
+    digest = hashlib.sha256()
+    conn = sqlite3.connect(path)
+    try:
+        for table in PROFILE_TABLES.get(section, ()):
+            rows = conn.execute(f'SELECT * FROM {table} ORDER BY rowid').fetchall()
+            digest.update(json.dumps([table, rows], default=str).encode('utf-8'))
+    except sqlite3.Error:
+        # The generator reports the broken snapshot itself
+        return ''
+    finally:
+        conn.close()
+    return digest.hexdigest()
+
+
+def request_hash(section, **inputs):
+    """
+    Hash of everything that determines a generation, used to serve repeats
+    from the store: the request inputs and the profile rows the generator
+    reads, so editing the profile misses the store.
+    """
+    payload = json.dumps(
+        {'section': section, 'profile': profile_fingerprint(section), **inputs}, sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _store_bullets(texts):
+    """Return {hash: bullet_id} for the given texts, inserting only unseen content."""
+    hashes = {}
+    for text in texts:
+        hashes.setdefault(bullet_hash(text), text)
+    existing = dict(
+        GeneratedBullet.objects.filter(content_hash__in=hashes).values_list('content_hash', 'id')
+    )
+    missing = [GeneratedBullet(content_hash=h, text=t) for h, t in hashes.items() if h not in existing]
+    if missing:
+        GeneratedBullet.objects.bulk_create(missing, ignore_conflicts=True)
+        existing.update(
+            GeneratedBullet.objects.filter(content_hash__in=[b.content_hash for b in missing])
+            .values_list('content_hash', 'id')
+        )
+    return existing
+
+
+def save_tailoring(user, application, section, req_hash, job_role, output):
+    """
+    Persist a generation result as the next version of `section` for `application`,
+    or return the latest version unchanged when it holds the same content.
+    Bullet text is replaced by content-addressed bullet IDs, and the bullets
+    are added to the user's retrieval index.
+    """
+    bullet_key = BULLET_KEYS.get(section)
+    content = output
+    if bullet_key:
+        texts = [p for item in output for p in item.get(bullet_key, [])]
+        ids = _store_bullets(texts)
+        content = [
+            {**item, bullet_key: [str(ids[bullet_hash(p)]) for p in item.get(bullet_key, [])]}
+            for item in output
+        ]
+        # Imported here: bullet_index builds on this module
+        from .bullet_index import index_output
+        index_output(user, section, output, bullet_ids=ids)
+
+    for _ in range(3):
+        try:
+            with transaction.atomic():
+                latest = TailoredSection.objects.filter(
+                    application=application, section=section,
+                ).order_by('-version').first()
+                if latest is not None and latest.content == content:
+                    # Same bullets as the latest version: keep it, answering this request too
+                    if (latest.request_hash, latest.job_role) != (req_hash, job_role):
+                        latest.request_hash, latest.job_role = req_hash, job_role
+                        latest.save(update_fields=['request_hash', 'job_role'])
+                    return latest
+                return TailoredSection.objects.create(
+                    user=user,
+                    application=application,
+                    section=section,
+                    version=(latest.version if latest else 0) + 1,
+                    request_hash=req_hash,
+                    job_role=job_role,
+                    content=content,
+                )
+        except IntegrityError:
+            # A concurrent save took the same version number, retry with the next one
+            continue
+    raise IntegrityError(f"Could not allocate a version for {section} of application {application.pk}")
+
+
+def hydrate(tailored_sections):
+    """Replace bullet IDs with text for a list of TailoredSection rows using one query."""
+    bullet_ids = set()
+    for ts in tailored_sections:
+        key = BULLET_KEYS.get(ts.section)
+        if key:
+            for item in ts.content:
+                bullet_ids.update(item.get(key, []))
+    texts = {str(k): v.text for k, v in GeneratedBullet.objects.in_bulk(list(bullet_ids)).items()} if bullet_ids else {}
+
+    result = []
+    for ts in tailored_sections:
+        key = BULLET_KEYS.get(ts.section)
+        output = ts.content
+        if key:
+            output = [{**item, key: [texts[b] for b in item.get(key, []) if b in texts]} for item in ts.content]
+        result.append(output)
+    return result
+
+
+def serialize_tailoring(ts, output):
+    return {
+        "section": ts.section,
+        "version": ts.version,
+        "job_role": ts.job_role,
+        "created_at": ts.created_at,
+        "output": output,
+    }
+
+
+def find_cached(application, section, req_hash):
+    """Latest stored output for an identical request, or None."""
+    ts = (
+        TailoredSection.objects
+        .filter(application=application, section=section, request_hash=req_hash)
+        .order_by('-version')
+        .first()
+    )
+    if ts is None:
+        return None, None
+    return ts, hydrate([ts])[0]
+
+
+def load_tailoring(application, section=None, version=None):
+    """
+    Stored tailoring for an application: the requested version of one
+    section, or the latest version of every section.
+    """
+    qs = TailoredSection.objects.filter(application=application)
+    if section:
+        qs = qs.filter(section=section)
+    if version is not None:
+        rows = list(qs.filter(version=version))
+    else:
+        latest = qs.values('section').annotate(v=Max('version'))
+        rows = []
+        if latest:
+            pairs = {(row['section'], row['v']) for row in latest}
+            rows = [
+                ts for ts in qs.filter(version__in={v for _, v in pairs})
+                if (ts.section, ts.version) in pairs
+            ]
+    return [serialize_tailoring(ts, output) for ts, output in zip(rows, hydrate(rows))]
+
+
+def list_versions(application):
+    rows = TailoredSection.objects.filter(application=application).values_list('section', 'version', 'created_at')
+    versions = {}
+    for section, version, created_at in rows.order_by('section', '-version'):
+        versions.setdefault(section, []).append({"version": version, "created_at": created_at})
+    return versions
@@ -1,3 +1,1090 @@
-from django.test import TestCase
+import json
+import os
+import runpy
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from AnalyzerApp import (
+    views, prompt_benchmark, tailoring, skill_demand, quotas, pregeneration, bullet_index, match_matrix,
+    skill_cooccurrence, profile_index, audit, commit_batches,
+)
+from AnalyzerApp.models import (
+    GeneratedBullet, TailoredSection, SkillDemand, GlobalSkillDemand, UserBullet, BulletPosting,
+    SkillBasket, SkillOccurrence, SkillCooccurrence, ProfileTerm, GenerationEvent,
+)
+from BackendApp import skill_catalog
+from BackendApp.models import Achievements, Applications, Experiences, Projects, ProjectSkills, Skills, UserSkills
+from AnalyzerApp.Analysis import genrators, llm_code, chunking, metrics, routing
+from AnalyzerApp.Analysis.cassettes import CassetteProvider, CassetteMiss
+from AnalyzerApp.Analysis.json_repair import JSONRepairError, loads_with_repair
+from AnalyzerApp.Analysis.providers import CancelledError, HedgedProvider, StubProvider, default_stub_response
+
+
+JOB_ROLE = "Backend Engineer"
+JOB_DESCRIPTION = "Build Python and Django REST APIs on AWS with PostgreSQL, Docker and CI/CD."
+
+
+def create_profile_db(path, experiences=3, projects=2):
+    """Create the sqlite profile database read by genrators.py."""
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE experiences (id INTEGER PRIMARY KEY, experience_name TEXT, start_date TEXT, end_date TEXT,
+            role TEXT, location TEXT, experience_explanation TEXT, display_order INTEGER);
+        CREATE TABLE projects (id INTEGER PRIMARY KEY, project_name TEXT, project_info TEXT, display_order INTEGER);
+        CREATE TABLE skills (id INTEGER PRIMARY KEY, skill_name TEXT, category TEXT);
+        CREATE TABLE project_skills (id INTEGER PRIMARY KEY, project_id INTEGER, skill_id INTEGER);
+    """)
+    for i in range(experiences):
+        conn.execute(
+            "INSERT INTO experiences VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (i + 1, f"Company {i}", "Jan 2020", "Dec 2021", f"Engineer {i}", "Remote",
+             f"Built data pipelines and REST services for team {i}.", i),
+        )
+    conn.executemany("INSERT INTO skills VALUES (?, ?, ?)", [
+        (1, "Python", "Programming Languages"),
+        (2, "Django", "Web Frameworks"),
+        (3, "PostgreSQL", "Database Management"),
+    ])
+    for i in range(projects):
+        conn.execute("INSERT INTO projects VALUES (?, ?, ?, ?)", (i + 1, f"Project {i}", f"Analytics tool {i}.", i))
+        conn.execute("INSERT INTO project_skills (project_id, skill_id) VALUES (?, ?)", (i + 1, 1))
+        conn.execute("INSERT INTO project_skills (project_id, skill_id) VALUES (?, ?)", (i + 1, 2))
+    conn.commit()
+    conn.close()
+
+
+class OverlapRecorder:
+    """Stub responder counting calls in flight; the first `expected` calls wait until all of them have started."""
+
+    def __init__(self, expected):
+        self.expected = expected
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self.all_started = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self, messages):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            if self.active >= self.expected:
+                self.all_started.set()
+        try:
+            # Sequential calls never get here together: the first waits out the timeout alone
+            self.all_started.wait(5)
+            return default_stub_response(messages)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+@override_settings(LLM_TOKEN_ACCOUNTING=False, AUDIT_LOG_ENABLED=False)
+class AnalyzerPipelineTests(SimpleTestCase):
+    """
+    Runs genrators.py -> llm_code.py -> views against cassettes recorded from
+    the local stub provider, so no network access is needed.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db_path = os.path.join(self.tmp.name, "profile.sqlite3")
+        self.cassette_path = os.path.join(self.tmp.name, "cassette.json")
+        create_profile_db(self.db_path)
+
+        db_patch = mock.patch.object(genrators, "db_path", self.db_path)
+        db_patch.start()
+        self.addCleanup(db_patch.stop)
+
+        self.factory = APIRequestFactory()
+        self.user = get_user_model()(id=1, username="tester", email="tester@example.com")
+
+    def use_provider(self, provider):
+        patcher = mock.patch.object(llm_code, "provider", provider)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, view, path, data):
+        request = self.factory.post(path, data, format="json")
+        force_authenticate(request, user=self.user)
+        return view(request)
+
+    def run_pipeline(self):
+        experience = self.post(views.experience_generation, "/analyzer/experience-gen", {
+            "job_role": JOB_ROLE, "job_description": JOB_DESCRIPTION,
+            "points_count": [3, 2, 2], "additional_instruction": "",
+        })
+        project = self.post(views.project_generation, "/analyzer/project-gen", {
+            "job_role": JOB_ROLE, "job_description": JOB_DESCRIPTION,
+            "points_count": [2, 2], "additional_instruction": "",
+        })
+        skill = self.post(views.skill_generation, "/analyzer/skill-gen", {
+            "job_role": JOB_ROLE, "job_description": JOB_DESCRIPTION,
+            "additional_instruction": "", "include_web_research": False,
+            "experience_data": experience.data.get("output"),
+            "project_data": project.data.get("output"),
+        })
+        return experience, project, skill
+
+    def record(self, latency=0.0):
+        recorder = CassetteProvider(self.cassette_path, mode="record", inner=StubProvider(latency=latency))
+        with mock.patch.object(llm_code, "provider", recorder):
+            return self.run_pipeline()
+
+    def test_replay_matches_recording(self):
+        recorded = self.record()
+        self.use_provider(CassetteProvider(self.cassette_path, mode="replay", latency="zero"))
+        replayed = self.run_pipeline()
+
+        for original, replay in zip(recorded, replayed):
+            self.assertEqual(replay.status_code, 200)
+            self.assertEqual(replay.data["status"], "success")
+            self.assertEqual(replay.data["output"], original.data["output"])
+
+        experience_output = replayed[0].data["output"]
+        self.assertEqual([len(e["resume_points"]) for e in experience_output], [3, 2, 2])
+        self.assertEqual(experience_output[0]["experience_company_name"], "Company 0")
+
+    def test_replay_miss_is_reported(self):
+        replayer = CassetteProvider(self.cassette_path, mode="replay", latency="zero")
+        with self.assertRaises(CassetteMiss):
+            replayer.complete([{"role": "user", "content": "unrecorded"}], "model", 0.3)
+
+        self.use_provider(replayer)
+        response = self.post(views.experience_generation, "/analyzer/experience-gen", {
+            "job_role": JOB_ROLE, "job_description": JOB_DESCRIPTION,
+            "points_count": [1, 1, 1], "additional_instruction": "",
+        })
+        self.assertEqual(response.status_code, 500)
+
+    def test_replay_with_recorded_latency(self):
+        self.record(latency=0.05)
+        replayer = CassetteProvider(self.cassette_path, mode="replay", latency="recorded")
+        self.use_provider(replayer)
+        with mock.patch("AnalyzerApp.Analysis.cassettes.time.sleep") as sleep:
+            self.run_pipeline()
+        recorded = sorted(i["latency"] for i in replayer.interactions.values())
+        self.assertEqual(sorted(c.args[0] for c in sleep.call_args_list), recorded)
+        self.assertTrue(all(latency >= 0.05 for latency in recorded))
+
+    def test_zero_latency_replay_serves_every_call_from_the_cassette(self):
+        self.record()
+        replayer = CassetteProvider(self.cassette_path, mode="replay", latency="zero")
+        self.use_provider(replayer)
+        with mock.patch.object(replayer, "_complete", wraps=replayer._complete) as complete, \
+                mock.patch("AnalyzerApp.Analysis.cassettes.time.sleep") as sleep:
+            for _ in range(3):
+                self.run_pipeline()
+        # One lookup per LLM call of the pipeline, no waiting and no other provider involved
+        self.assertEqual(complete.call_count, 3 * len(replayer.interactions))
+        sleep.assert_not_called()
+
+    def test_template_mode_matches_llm_shape(self):
+        recorded = self.record()
+        self.use_provider(CassetteProvider(self.cassette_path, mode="replay", latency="zero"))
+        experience = self.post(views.experience_generation, "/analyzer/experience-gen", {
+            "job_role": JOB_ROLE, "job_description": JOB_DESCRIPTION,
+            "points_count": [3, 2, 2], "additional_instruction": "", "mode": "template",
+        })
+        project = self.post(views.project_generation, "/analyzer/project-gen", {
+            "job_role": JOB_ROLE, "job_description": JOB_DESCRIPTION,
+            "points_count": [2, 2], "additional_instruction": "", "mode": "template",
+        })
+
+        for original, template in zip(recorded, (experience, project)):
+            self.assertEqual(template.status_code, 200)
+            self.assertEqual(template.data["mode"], "template")
+            self.assertEqual(
+                [sorted(item) for item in template.data["output"]],
+                [sorted(item) for item in original.data["output"]],
+            )
+        self.assertEqual([len(e["resume_points"]) for e in experience.data["output"]], [3, 2, 2])
+        self.assertEqual([len(p["project_points"]) for p in project.data["output"]], [2, 2])
+        self.assertIn("Python", " ".join(experience.data["output"][0]["resume_points"]))
+
+    def test_auto_mode_falls_back_to_template(self):
+        self.use_provider(CassetteProvider(self.cassette_path, mode="replay", latency="zero"))
+        response = self.post(views.experience_generation, "/analyzer/experience-gen", {
+            "job_role": JOB_ROLE, "job_description": JOB_DESCRIPTION,
+            "points_count": [1, 1, 1], "additional_instruction": "", "mode": "auto",
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["mode"], "template")
+        self.assertIn("fallback_reason", response.data)
+
+    def test_long_profile_is_generated_in_parallel_chunks(self):
+        os.remove(self.db_path)
+        create_profile_db(self.db_path, experiences=10)
+        # Five chunks of two; each call waits until all five are in flight
+        responder = OverlapRecorder(expected=5)
+        self.use_provider(StubProvider(responder))
+
+        response = self.post(views.experience_generation, "/analyzer/experience-gen", {
+            "job_role": JOB_ROLE, "job_description": JOB_DESCRIPTION,
+            "points_count": [3] * 10, "additional_instruction": "",
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((responder.calls, responder.peak), (5, 5))
+        output = response.data["output"]
+        self.assertEqual([e["experience_id"] for e in output], list(range(1, 11)))
+        self.assertEqual([len(e["resume_points"]) for e in output], [3] * 10)
+
+        # Every stub bullet opens with "Delivered"; repeats are spread over its synonyms
+        verbs = Counter(p.split()[0].lower() for e in output for p in e["resume_points"])
+        synonyms = [v for v in chunking.SYNONYMS["delivered"] if v != "delivered"]
+        self.assertTrue(all(0 < verbs[v] <= chunking.MAX_VERB_REPEATS for v in synonyms))
+
+    def test_prompt_benchmark_has_no_regressions(self):
+        report = prompt_benchmark.run(StubProvider(), model="benchmark")
+        with open(prompt_benchmark.BASELINE_PATH, encoding="utf-8") as f:
+            baseline = json.load(f)
+        self.assertEqual(prompt_benchmark.regressions(report, baseline), [])
+        self.assertTrue(all(v["valid_rate"] == 1.0 for variants in report.values() for v in variants.values()))
+
+        # A prompt that grows past the tolerance is reported
+        baseline["experience"]["baseline"]["avg_prompt_tokens"] /= 2
+        self.assertEqual(len(prompt_benchmark.regressions(report, baseline)), 1)
+
+
+class JSONRepairTests(SimpleTestCase):
+    def test_common_defects_are_repaired(self):
+        self.assertEqual(loads_with_repair("Here you go:\n```json\n[{'a': \u201cx\u201d,},]\n```"), [{"a": "x"}])
+        self.assertEqual(loads_with_repair('{"a": 1} and some prose', root="{"), {"a": 1})
+
+    def test_truncated_array_drops_the_incomplete_element(self):
+        self.assertEqual(loads_with_repair('[{"a": "x"}, {"b": "tru'), [{"a": "x"}])
+        self.assertEqual(loads_with_repair('["one", "two", "thr'), ["one", "two"])
+        self.assertEqual(loads_with_repair('[{"points": ["done", "half'), [{"points": ["done"]}])
+
+    def test_truncated_object_drops_the_incomplete_member(self):
+        self.assertEqual(loads_with_repair('{"a": "x", "b": "tru', root="{"), {"a": "x"})
+        self.assertEqual(loads_with_repair('{"a": {"b": 1}, "c": [', root="{"), {"a": {"b": 1}})
+
+    def test_truncated_first_element_is_closed_when_nothing_complete_exists(self):
+        self.assertEqual(loads_with_repair('[{"b": "tru'), [{"b": "tru"}])
+
+    def test_fixer_is_used_only_when_local_repair_fails(self):
+        fixer = mock.Mock(return_value='[1, 2]')
+        self.assertEqual(loads_with_repair('[1, 2,]', fixer=fixer), [1, 2])
+        fixer.assert_not_called()
+        self.assertEqual(loads_with_repair('not json at all', fixer=fixer), [1, 2])
+        with self.assertRaises(JSONRepairError):
+            loads_with_repair('not json at all')
+
+
+def gated(gate, content='"ok"', calls=None):
+    """Stub responder that blocks until `gate` is set, ignoring cancellation like a blocking HTTP call."""
+    def respond(messages):
+        if calls is not None:
+            calls.append(messages)
+        gate.wait(5)
+        return content
+    return respond
+
+
+class HedgedProviderTests(SimpleTestCase):
+    MESSAGES = [{"role": "user", "content": "hello"}]
+
+    def hedged(self, primary, backup, **kwargs):
+        provider = HedgedProvider(primary, backup, **{"default_delay": 0.01, "min_samples": 1, "min_delay": 0.01, **kwargs})
+        self.addCleanup(provider._backup_executor.shutdown)
+        self.addCleanup(provider._primary_executor.shutdown)
+        return provider
+
+    def counters(self):
+        return Counter(metrics.snapshot()["counters"])
+
+    def test_fast_primary_never_fires_the_hedge(self):
+        backup_calls = []
+        provider = self.hedged(StubProvider(lambda m: '"primary"'), StubProvider(gated(threading.Event(), calls=backup_calls)),
+                               default_delay=5, min_samples=20)
+        self.assertEqual(provider.complete(self.MESSAGES, "m", 0).content, '"primary"')
+        self.assertEqual(backup_calls, [])
+
+    def test_slow_primary_loses_and_is_still_sampled(self):
+        gate = threading.Event()
+        before = self.counters()
+        provider = self.hedged(StubProvider(gated(gate, '"primary"')), StubProvider(lambda m: '"backup"'))
+        self.assertEqual(provider.complete(self.MESSAGES, "m", 0).content, '"backup"')
+        self.assertEqual((self.counters() - before)["hedge.backup_wins"], 1)
+
+        # The loser ignored its cancel event; its latency is sampled once it returns
+        gate.set()
+        provider._primary_executor.shutdown(wait=True)
+        self.assertEqual(len(provider._latencies), 1)
+
+    def test_cancelled_primary_is_sampled_as_a_lower_bound(self):
+        provider = self.hedged(StubProvider(latency=5), StubProvider(lambda m: '"backup"'))
+        self.assertEqual(provider.complete(self.MESSAGES, "m", 0).content, '"backup"')
+        # The stub honours its cancel event, so the primary ends without waiting out its latency
+        provider._primary_executor.shutdown(wait=True)
+        self.assertEqual(len(provider._latencies), 1)
+        self.assertGreaterEqual(provider._latencies[0], 0.01)
+        self.assertEqual(provider.hedge_delay(), max(0.01, provider._latencies[0]))
+
+    def test_primary_error_fails_over(self):
+        def fail(messages):
+            raise RuntimeError("primary down")
+        before = self.counters()
+        provider = self.hedged(StubProvider(fail), StubProvider(lambda m: '"backup"'), default_delay=5)
+        self.assertEqual(provider.complete(self.MESSAGES, "m", 0).content, '"backup"')
+        self.assertEqual((self.counters() - before)["hedge.failover"], 1)
+        self.assertEqual(len(provider._latencies), 0)
+
+        provider.backup = StubProvider(fail)
+        with self.assertRaises(RuntimeError):
+            provider.complete(self.MESSAGES, "m", 0)
+
+    def test_hedges_in_flight_are_limited(self):
+        primary_gate, backup_gate, backup_calls = threading.Event(), threading.Event(), []
+        provider = self.hedged(
+            StubProvider(gated(primary_gate, '"primary"')), StubProvider(gated(backup_gate, '"backup"', backup_calls)),
+            max_hedges=1,
+        )
+        before = self.counters()
+        results = []
+        first = threading.Thread(target=lambda: results.append(provider.complete(self.MESSAGES, "m", 0).content))
+        first.start()
+        while not backup_calls:
+            time.sleep(0.001)
+
+        # The only hedge slot is taken, so this request waits for its primary
+        second = threading.Thread(target=lambda: results.append(provider.complete(self.MESSAGES, "m", 0).content))
+        second.start()
+        while (self.counters() - before)["hedge.suppressed"] < 1:
+            time.sleep(0.001)
+        primary_gate.set()
+        first.join(5)
+        second.join(5)
+        backup_gate.set()
+
+        self.assertEqual(results, ['"primary"', '"primary"'])
+        self.assertEqual(len(backup_calls), 1)
+        self.assertEqual((self.counters() - before)["hedge.fired"], 1)
+
+    def test_caller_cancel_reaches_both_requests(self):
+        before = self.counters()
+        provider = self.hedged(StubProvider(latency=5), StubProvider(latency=5))
+        cancel, errors = threading.Event(), []
+
+        def call():
+            try:
+                provider.complete(self.MESSAGES, "m", 0, cancel_event=cancel)
+            except CancelledError as e:
+                errors.append(e)
+        caller = threading.Thread(target=call)
+        caller.start()
+        while (self.counters() - before)["hedge.fired"] < 1:
+            time.sleep(0.001)
+        started = time.perf_counter()
+        cancel.set()
+        caller.join(5)
+        # Both stubs honour their cancel events, so neither waits out its latency
+        provider._primary_executor.shutdown(wait=True)
+        provider._backup_executor.shutdown(wait=True)
+        self.assertLess(time.perf_counter() - started, 2)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual((self.counters() - before)["hedge.cancelled"], 1)
+        self.assertEqual(len(provider._latencies), 0)
+
+    def test_primary_dropped_before_starting_is_not_sampled(self):
+        gate = threading.Event()
+        provider = self.hedged(StubProvider(gated(gate, '"primary"')), StubProvider(lambda m: '"backup"'),
+                               max_workers=1, max_hedges=2)
+        # The first primary holds the only primary worker, so the second is dropped from the queue
+        for _ in range(2):
+            self.assertEqual(provider.complete(self.MESSAGES, "m", 0).content, '"backup"')
+        gate.set()
+        provider._primary_executor.shutdown(wait=True)
+        self.assertEqual(len(provider._latencies), 1)
+
+
+
+class RoutingTests(SimpleTestCase):
+    def setUp(self):
+        for name, value in (("strong_model", "strong-model"), ("fast_model", "fast-model")):
+            patcher = mock.patch.object(routing, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def items(self, *points):
+        return [{"resume_points": n} for n in points]
+
+    def test_small_experience_request_goes_to_the_fast_model(self):
+        before = Counter(metrics.snapshot()["counters"])
+        decision = routing.route("experience", JOB_DESCRIPTION, self.items(3, 2))
+        expected = int((routing.BASE_TOKENS + 2 * routing.ITEM_TOKENS["experience"] + 5 * routing.POINT_TOKENS) * routing.HEADROOM)
+        self.assertEqual(decision, ("fast-model", "fast", expected + routing.REASONING_TOKENS))
+        counters = Counter(metrics.snapshot()["counters"]) - before
+        self.assertEqual((counters["routing.fast"], counters["routing.experience.fast"]), (1, 1))
+
+    def test_experience_request_with_many_bullets_goes_to_the_strong_model(self):
+        decision = routing.route("experience", JOB_DESCRIPTION, self.items(5, 5))
+        self.assertEqual(decision[:2], ("strong-model", "strong"))
+
+    def test_project_request_with_many_items_goes_to_the_strong_model(self):
+        self.assertEqual(routing.route("project", JOB_DESCRIPTION, self.items(2, 2))[:2], ("fast-model", "fast"))
+        decision = routing.route("project", JOB_DESCRIPTION, self.items(1, 1, 1))
+        self.assertEqual(decision[:2], ("strong-model", "strong"))
+        self.assertGreater(decision.max_tokens, routing.max_tokens_for("experience", self.items(1, 1, 1)))
+
+    def test_skill_request_is_sized_by_categories_and_job_description(self):
+        categories = [{"category": "Languages", "skills": ["Python"] * 20}, {"category": "Databases"}]
+        decision = routing.route("skill", JOB_DESCRIPTION, categories)
+        budget = routing.BASE_TOKENS + routing.ITEM_TOKENS["skill"] * (2 + routing.EXTRA_SKILL_CATEGORIES)
+        self.assertEqual(decision, ("fast-model", "fast", int(budget * routing.HEADROOM) + routing.REASONING_TOKENS))
+        long_description = "x" * (routing.FAST_MAX_JD_CHARS + 1)
+        self.assertEqual(routing.route("skill", long_description, categories).tier, "strong")
+
+    def test_max_tokens_is_capped(self):
+        self.assertEqual(routing.max_tokens_for("experience", self.items(*[10] * 50)), routing.MAX_TOKENS_CEILING)
+
+    def test_small_request_falls_back_to_the_strong_model_without_a_fast_model(self):
+        with mock.patch.object(routing, "fast_model", None):
+            decision = routing.route("experience", JOB_DESCRIPTION, self.items(1))
+        self.assertEqual(decision[:2], ("strong-model", "strong"))
+
+def create_application(user, **fields):
+    return Applications.objects.create(**{
+        "user": user, "job_name": JOB_ROLE, "company_name": "Acme", "job_link": "https://example.com/job",
+        "resume_file_path": "ResumeBlobs/r.pdf", **fields,
+    })
+
+
+@override_settings(ANALYZER_PREGENERATE=False, AUDIT_LOG_ENABLED=False)
+class TailoringTests(TestCase):
+    OUTPUT = [{"experience_id": 1, "experience_role": "Engineer", "resume_points": [
+        "Built Django REST APIs.", "Cut deploy time by 40%.",
+    ]}]
+
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="tailor", email="tailor@example.com")
+        self.application = create_application(self.user)
+
+    def save(self, output, req_hash="h1"):
+        return tailoring.save_tailoring(self.user, self.application, "experience", req_hash, JOB_ROLE, output)
+
+    def test_same_bullets_are_stored_once_and_keep_the_version(self):
+        first = self.save(self.OUTPUT)
+        # Differences in case, spacing, bullet marks and the final period normalize away
+        again = self.save([{**self.OUTPUT[0], "resume_points": ["  built django  REST APIs", "• Cut deploy time by 40%."]}])
+        self.assertEqual((first.pk, again.pk, again.version), (first.pk, first.pk, 1))
+        self.assertEqual(GeneratedBullet.objects.count(), 2)
+        self.assertEqual(TailoredSection.objects.count(), 1)
+
+        # Another request producing the same bullets is served by that version too
+        self.assertEqual(self.save(self.OUTPUT, req_hash="h2").pk, first.pk)
+        cached, output = tailoring.find_cached(self.application, "experience", "h2")
+        self.assertEqual((cached.pk, output), (first.pk, self.OUTPUT))
+
+    def test_changed_bullet_adds_a_version(self):
+        self.save(self.OUTPUT)
+        changed = self.save([{**self.OUTPUT[0], "resume_points": ["Built Django REST APIs.", "Led a team of four."]}])
+        self.assertEqual(changed.version, 2)
+        self.assertEqual(GeneratedBullet.objects.count(), 3)
+
+        latest = tailoring.load_tailoring(self.application, "experience")
+        self.assertEqual(latest[0]["output"][0]["resume_points"], ["Built Django REST APIs.", "Led a team of four."])
+        first = tailoring.load_tailoring(self.application, "experience", version=1)
+        self.assertEqual(first[0]["output"], self.OUTPUT)
+
+    def test_request_hash_covers_the_profile_the_generator_reads(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        db_path = os.path.join(tmp.name, "profile.sqlite3")
+        create_profile_db(db_path)
+        inputs = {"job_role": JOB_ROLE, "job_description": JOB_DESCRIPTION}
+        with mock.patch.object(genrators, "db_path", db_path):
+            before = {section: tailoring.request_hash(section, **inputs) for section in tailoring.PROFILE_TABLES}
+            self.assertEqual(tailoring.request_hash("experience", **inputs), before["experience"])
+
+            conn = sqlite3.connect(db_path)
+            conn.execute("UPDATE experiences SET experience_explanation = 'Led the payments team.' WHERE id = 1")
+            conn.commit()
+            conn.close()
+            after = {section: tailoring.request_hash(section, **inputs) for section in tailoring.PROFILE_TABLES}
+        # Only the section reading the edited rows misses the store
+        self.assertNotEqual(after["experience"], before["experience"])
+        self.assertEqual(after["project"], before["project"])
+        self.assertEqual(after["skill"], before["skill"])
+
+
+def create_skills(*names):
+    skills = Skills.objects.bulk_create([Skills(skill_name=name, category="Testing") for name in names])
+    # bulk_create skips the catalog signals
+    skill_catalog._invalidate()
+    return {s.skill_name: s.id for s in skills}
+
+
+@override_settings(ANALYZER_PREGENERATE=False, AUDIT_LOG_ENABLED=False)
+class SkillDemandTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="demand", email="demand@example.com")
+        self.skills = create_skills("Python", "Django", "Docker", "Apache Kafka")
+
+    def test_limit_is_validated(self):
+        create_application(self.user, job_description="Python and Django services")
+        for limit, status in (("1", 200), ("100", 200), ("0", 400), ("-1", 400), ("101", 400), ("many", 400)):
+            with self.subTest(limit=limit):
+                request = APIRequestFactory().get("/analyzer/skill-demand", {"limit": limit})
+                force_authenticate(request, user=self.user)
+                self.assertEqual(views.skill_demand_view(request).status_code, status)
+
+    def counts(self):
+        return (
+            sorted(SkillDemand.objects.filter(count__gt=0).values_list("user_id", "skill__skill_name", "count")),
+            sorted(GlobalSkillDemand.objects.filter(count__gt=0).values_list("skill__skill_name", "count")),
+        )
+
+    def test_counters_follow_job_description_changes_and_match_a_rebuild(self):
+        other = get_user_model().objects.create(username="other", email="other@example.com")
+        first = create_application(self.user, job_description="Python and Django services")
+        create_application(self.user, job_description="Python, Docker and Apache Kafka")
+        create_application(other, job_description="Django admin")
+        self.assertEqual(
+            dict((name, n) for _, name, n in SkillDemand.objects.filter(user=self.user).values_list(
+                "user_id", "skill__skill_name", "count")),
+            {"Python": 2, "Django": 1, "Docker": 1, "Apache Kafka": 1},
+        )
+
+        first.job_description = "Docker only"
+        first.save()
+        first.delete()
+        incremental = self.counts()
+        skill_demand.rebuild()
+        self.assertEqual(self.counts(), incremental)
+        self.assertEqual(incremental[1], [("Apache Kafka", 1), ("Django", 1), ("Docker", 1), ("Python", 1)])
+
+    def test_stale_instance_syncs_to_the_stored_job_description(self):
+        application = create_application(self.user, job_description="Python")
+        stale = Applications.objects.get(pk=application.pk)
+        application.job_description = "Django"
+        application.save()
+        # A second save of the same change diffs against what the first stored
+        stale.job_description = "Django"
+        stale.save()
+        self.assertEqual(self.counts()[1], [("Django", 1)])
+
+    def test_matcher_is_rebuilt_only_when_the_catalog_changes(self):
+        matcher = skill_demand.catalog_matcher()
+        with self.assertNumQueries(1):
+            self.assertIs(skill_demand.catalog_matcher(), matcher)
+        self.assertEqual(matcher.match("Kafka on Docker, apache kafka"), {self.skills["Apache Kafka"], self.skills["Docker"]})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Skills.objects.create(skill_name="Kubernetes")
+        self.assertEqual(len(skill_demand.catalog_matcher().match("Kubernetes")), 1)
+
+
+
+@override_settings(ANALYZER_PREGENERATE=False, AUDIT_LOG_ENABLED=False, BULLET_SUGGEST_MIN_COVERAGE=0.6)
+class BulletIndexTests(TestCase):
+    OUTPUT = [
+        {"experience_id": 1, "experience_company_name": "Acme", "resume_points": [
+            "Built Django REST APIs serving 2M users.",
+            "Streamed events with Apache Kafka to cut lag 40%.",
+            "Mentored interns.",
+        ]},
+        {"experience_id": 2, "experience_company_name": "Beta", "resume_points": ["Built Django REST APIs serving 2M users."]},
+    ]
+    JOB_DESCRIPTION = "We need Django and Apache Kafka experience building REST APIs"
+
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="bullets", email="bullets@example.com")
+        self.skills = create_skills("Django", "Apache Kafka")
+        self.application = create_application(self.user)
+
+    def save(self, req_hash="h1"):
+        return tailoring.save_tailoring(self.user, self.application, "experience", req_hash, JOB_ROLE, self.OUTPUT)
+
+    def test_bullets_are_indexed_once_per_item(self):
+        self.save()
+        self.save(req_hash="h2")
+        self.assertEqual(UserBullet.objects.filter(user=self.user).count(), 4)
+        django_term = f"skill:{self.skills['Django']}"
+        self.assertEqual(
+            sorted(BulletPosting.objects.filter(term=django_term).values_list("user_bullet__item", flat=True)),
+            ["Acme", "Beta"],
+        )
+
+    def test_suggestions_rank_skill_matches_and_name_them(self):
+        self.save()
+        with mock.patch.object(skill_demand, "CatalogMatcher") as build_matcher:
+            result = bullet_index.suggest(self.user, self.JOB_DESCRIPTION, limit=5)
+        build_matcher.assert_not_called()
+
+        matched = {s["text"]: s["matched_terms"] for s in result["suggestions"]}
+        # The bullet filed under both experiences is suggested once; catalog skills are named
+        self.assertEqual(len(result["suggestions"]), 2)
+        self.assertIn("Django", matched["Built Django REST APIs serving 2M users."])
+        self.assertIn("Apache Kafka", matched["Streamed events with Apache Kafka to cut lag 40%."])
+        self.assertFalse(any(t.startswith("skill:") for terms in matched.values() for t in terms))
+        scores = [s["score"] for s in result["suggestions"]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertGreater(result["coverage"], 0.6)
+        self.assertFalse(result["needs_llm"])
+
+    def test_no_history_needs_the_llm(self):
+        self.save()
+        self.assertEqual(
+            bullet_index.suggest(self.user, self.JOB_DESCRIPTION, section="project"),
+            {"suggestions": [], "coverage": 0.0, "needs_llm": True},
+        )
+
+    def test_limit_is_validated(self):
+        self.save()
+        for limit, status in ((1, 200), (50, 200), (0, 400), (-1, 400), (51, 400), ("many", 400)):
+            with self.subTest(limit=limit):
+                request = APIRequestFactory().post(
+                    "/analyzer/suggest", {"job_description": self.JOB_DESCRIPTION, "limit": limit}, format="json",
+                )
+                force_authenticate(request, user=self.user)
+                response = views.bullet_suggestions(request)
+                self.assertEqual(response.status_code, status)
+                if status == 200:
+                    self.assertLessEqual(len(response.data["output"]["suggestions"]), limit)
+
+    def test_rebuild_restores_the_index(self):
+        self.save()
+        postings = sorted(BulletPosting.objects.values_list("term", "user_bullet__bullet__text"))
+        UserBullet.objects.all().delete()
+        self.assertEqual(bullet_index.rebuild(self.user), 4)
+        self.assertEqual(sorted(BulletPosting.objects.values_list("term", "user_bullet__bullet__text")), postings)
+
+
+
+class ProfileIndexTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="profile", email="profile@example.com")
+        self.skills = create_skills("Django", "Kubernetes")
+
+    def index(self):
+        return sorted(ProfileTerm.objects.filter(user=self.user).values_list("section", "row", "term", "tf"))
+
+    def test_profile_writes_keep_the_index_in_step_with_a_rebuild(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            user_skill = UserSkills.objects.create(user=self.user, skill_id=self.skills["Django"])
+            experience = Experiences.objects.create(
+                user=self.user, experience_name="Acme", start_date="2020", end_date="2022", role="Backend Engineer",
+                experience_explanation="Built Django APIs and Django admin.",
+            )
+            Achievements.objects.create(user=self.user, achievement_point="Won a hackathon")
+            project = Projects.objects.create(user=self.user, project_name="Infra", project_info="Cluster tooling")
+            ProjectSkills.objects.create(project=project, skill_id=self.skills["Kubernetes"])
+        counts, skill_ids = profile_index.profile_terms(self.user)
+        self.assertEqual(counts["django"], 3)
+        self.assertEqual(skill_ids, {self.skills["Django"], self.skills["Kubernetes"]})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            experience.experience_explanation = "Built Flask APIs"
+            experience.save()
+            project.delete()
+            user_skill.delete()
+        incremental = self.index()
+        profile_index.rebuild()
+        self.assertEqual(self.index(), incremental)
+        counts, skill_ids = profile_index.profile_terms(self.user)
+        self.assertEqual((counts["flask"], counts["django"], skill_ids), (1, 0, set()))
+
+    def test_saves_that_keep_the_text_skip_the_index(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            experience = Experiences.objects.create(
+                user=self.user, experience_name="Acme", start_date="2020", end_date="2022",
+                experience_explanation="Built Django APIs.",
+            )
+        reordered = Experiences.objects.get(pk=experience.pk)
+        reordered.display_order = 5
+        with self.assertNumQueries(1), self.captureOnCommitCallbacks() as callbacks:
+            reordered.save()
+        self.assertEqual(callbacks, [])
+
+    def test_refresh_reuses_the_matcher_for_the_catalog_version(self):
+        profile_index.rebuild()
+        with self.captureOnCommitCallbacks(execute=True), \
+                mock.patch.object(skill_demand, "CatalogMatcher") as build_matcher:
+            Achievements.objects.create(user=self.user, achievement_point="Ran Kubernetes clusters")
+        build_matcher.assert_not_called()
+        self.assertEqual(profile_index.profile_terms(self.user)[1], {self.skills["Kubernetes"]})
+
+@override_settings(ANALYZER_PREGENERATE=False, AUDIT_LOG_ENABLED=False)
+class MatchMatrixTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="matches", email="matches@example.com")
+        skills = create_skills("Django", "Kubernetes", "Swift")
+        with self.captureOnCommitCallbacks(execute=True):
+            UserSkills.objects.create(user=self.user, skill_id=skills["Django"])
+            Experiences.objects.create(
+                user=self.user, experience_name="Acme", start_date="2020", end_date="2022", role="Backend Engineer",
+                experience_explanation="Built Django REST APIs and PostgreSQL schemas.",
+            )
+            create_application(self.user, job_name="iOS Developer", job_description="Swift and SwiftUI mobile apps for iOS")
+            create_application(self.user, job_name="Backend Developer",
+                               job_description="Django REST APIs with PostgreSQL on Kubernetes")
+            create_application(self.user, job_name="No description")
+
+    def test_profile_match_ranks_applications(self):
+        results = match_matrix.match_applications(self.user)
+        self.assertEqual([r["jobName"] for r in results], ["Backend Developer", "iOS Developer"])
+        best, worst = results
+        self.assertEqual((best["matchedSkills"], best["missingSkills"], best["skillCoverage"]),
+                         (["Django"], ["Kubernetes"], 0.5))
+        self.assertEqual((worst["matchedSkills"], worst["missingSkills"]), ([], ["Swift"]))
+        self.assertGreater(best["score"], worst["score"])
+
+    def test_skill_names_come_from_the_returned_applications_only(self):
+        with mock.patch.object(skill_demand, "CatalogMatcher") as build_matcher, \
+                mock.patch.object(skill_catalog, "Index") as build_index:
+            results = match_matrix.match_applications(self.user, limit=1, status="Applied")
+        build_matcher.assert_not_called()
+        build_index.assert_not_called()
+        self.assertEqual([r["missingSkills"] for r in results], [["Kubernetes"]])
+        self.assertEqual(match_matrix.match_applications(self.user, status="Rejected"), [])
+
+
+class SkillCooccurrenceTests(TestCase):
+    def setUp(self):
+        self.skills = create_skills("Python", "Django", "PostgreSQL", "React", "Swift", "Docker")
+        self.users = [
+            get_user_model().objects.create(username=f"cooc{i}", email=f"cooc{i}@example.com") for i in range(4)
+        ]
+
+    def give(self, user, *names):
+        with self.captureOnCommitCallbacks(execute=True):
+            UserSkills.objects.bulk_create([UserSkills(user=user, skill_id=self.skills[n]) for n in names])
+            # bulk_create skips the signals that schedule the refresh
+            skill_cooccurrence.schedule_refresh('user', user.pk)
+
+    def counts(self):
+        return (
+            sorted((str(a), str(b), n) for a, b, n in SkillCooccurrence.objects.values_list("skill_id", "other_id", "count")),
+            sorted((str(a), n) for a, n in SkillOccurrence.objects.values_list("skill_id", "count")),
+            SkillBasket.objects.count(),
+        )
+
+    def test_incremental_counts_match_a_rebuild(self):
+        for user in self.users[:3]:
+            self.give(user, "Python", "Django", "PostgreSQL")
+        self.give(self.users[3], "Swift", "React")
+        with self.captureOnCommitCallbacks(execute=True):
+            project = Projects.objects.create(user=self.users[0], project_name="API", project_info="Services.")
+            for name in ("Python", "Docker"):
+                ProjectSkills.objects.create(project=project, skill_id=self.skills[name])
+        with self.captureOnCommitCallbacks(execute=True):
+            UserSkills.objects.filter(user=self.users[2], skill_id=self.skills["PostgreSQL"]).delete()
+
+        python, django = str(self.skills["Python"]), str(self.skills["Django"])
+        incremental = self.counts()
+        self.assertIn((python, django, 3), incremental[0])
+        self.assertEqual(incremental[2], 5)
+        skill_cooccurrence.rebuild()
+        self.assertEqual(self.counts(), incremental)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            project.delete()
+        self.assertNotIn(str(self.skills["Docker"]), dict(self.counts()[1]))
+
+    def test_limit_is_validated(self):
+        for limit, status in (("1", 200), ("100", 200), ("0", 400), ("-1", 400), ("101", 400), ("many", 400)):
+            with self.subTest(limit=limit):
+                request = APIRequestFactory().get("/analyzer/related-skills", {"limit": limit})
+                force_authenticate(request, user=self.users[0])
+                self.assertEqual(views.related_skills(request).status_code, status)
+
+    def test_recommendations_follow_shared_baskets(self):
+        for user in self.users[:3]:
+            self.give(user, "Python", "Django", "PostgreSQL")
+        self.give(self.users[3], "Swift", "React")
+        me = get_user_model().objects.create(username="me", email="me@example.com")
+        self.give(me, "Python")
+
+        recommended = skill_cooccurrence.recommend_for_user(me)
+        self.assertEqual({r["skillName"] for r in recommended}, {"Django", "PostgreSQL"})
+        self.assertEqual(recommended[0]["relatedTo"], ["Python"])
+        self.assertTrue(all(r["support"] >= skill_cooccurrence.MIN_SUPPORT for r in recommended))
+
+        from_text = skill_cooccurrence.recommend_for_text("We write Python and Swift daily")
+        self.assertEqual({r["skillName"] for r in from_text}, {"Django", "PostgreSQL"})
+        # Later requests reuse the matcher built for this catalog version
+        with mock.patch.object(skill_demand, "CatalogMatcher") as build_matcher:
+            self.assertEqual(skill_cooccurrence.recommend_for_text("We write Python and Swift daily"), from_text)
+        build_matcher.assert_not_called()
+        self.assertEqual(skill_cooccurrence.recommend_for_text("No catalog skills here"), [])
+
+@override_settings(LLM_TOKEN_ACCOUNTING=True, LLM_DAILY_TOKEN_QUOTA=1000, LLM_MONTHLY_TOKEN_QUOTA=5000)
+class QuotaTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="quota", email="quota@example.com")
+
+    def used(self, period="day"):
+        return quotas.usage_summary(self.user)[period]["used_tokens"]
+
+    def test_reservation_is_settled_to_actual_usage(self):
+        reservation = quotas.reserve(self.user, 300)
+        self.assertEqual((reservation.tokens, self.used()), (300, 300))
+        quotas.settle(reservation, 120)
+        self.assertEqual((self.used(), self.used("month")), (120, 120))
+
+    @override_settings(LLM_DAILY_TOKEN_QUOTA=500)
+    def test_quota_smaller_than_the_estimate_is_usable(self):
+        reservation = quotas.reserve(self.user, 4000)
+        self.assertEqual(reservation.tokens, 500)
+        quotas.settle(reservation, 200)
+        self.assertEqual(self.used(), 200)
+
+    def test_nearly_used_quota_still_serves_small_calls(self):
+        quotas.settle(quotas.reserve(self.user, 900), 900)
+        reservation = quotas.reserve(self.user, 80)
+        self.assertEqual(reservation.tokens, 80)
+        quotas.settle(reservation, 100)
+        with self.assertRaises(quotas.QuotaExceeded) as raised:
+            quotas.reserve(self.user, 80)
+        self.assertEqual((raised.exception.period, raised.exception.used), ("day", 1000))
+        # The failed attempt did not touch the month
+        self.assertEqual(quotas.usage_summary(self.user)["month"]["requests"], 2)
+
+    def test_in_flight_reservations_never_exceed_the_limit(self):
+        first = quotas.reserve(self.user, 600)
+        second = quotas.reserve(self.user, 600)
+        self.assertEqual((first.tokens, second.tokens, self.used()), (600, 400, 1000))
+        with self.assertRaises(quotas.QuotaExceeded):
+            quotas.reserve(self.user, 1)
+        # Settling below the reservation gives the difference back
+        quotas.settle(first, 100)
+        self.assertEqual(quotas.reserve(self.user, 600).tokens, 500)
+
+    def test_estimate_grows_with_the_request(self):
+        small = quotas.estimate("experience", {"job_description": "Python", "points_count": [3]})
+        large = quotas.estimate("experience", {"job_description": "Python " * 500, "points_count": [5] * 10})
+        self.assertLess(small, large)
+        self.assertGreaterEqual(small, routing.max_tokens_for("experience", [{"resume_points": 3}]))
+
+
+@override_settings(ANALYZER_PREGENERATE=False, AUDIT_LOG_ENABLED=False, LLM_TOKEN_ACCOUNTING=False,
+                   ANALYZER_EXPERIENCE_POINTS=4, ANALYZER_PROJECT_POINTS=2)
+class PregenerationTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        db_path = os.path.join(tmp.name, "profile.sqlite3")
+        create_profile_db(db_path)
+        for patcher in (mock.patch.object(genrators, "db_path", db_path),
+                        mock.patch.object(llm_code, "provider", StubProvider())):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.user = get_user_model().objects.create(username="pregen", email="pregen@example.com")
+        for i in range(3):
+            Experiences.objects.create(user=self.user, experience_name=f"Company {i}", start_date="2020",
+                                       end_date="2021", experience_explanation="Built services.")
+        for i in range(2):
+            Projects.objects.create(user=self.user, project_name=f"Project {i}", project_info="Analytics tool.")
+        self.application = create_application(self.user, job_description=JOB_DESCRIPTION)
+
+    def run_job(self):
+        with mock.patch.object(llm_code.provider, "_complete", wraps=llm_code.provider._complete) as complete:
+            pregeneration.run_job(pregeneration.Job(self.application.pk, self.user.pk), lambda job: True)
+        return complete.call_count
+
+    def test_sections_are_generated_once(self):
+        self.assertGreater(self.run_job(), 0)
+        self.assertEqual(
+            sorted(TailoredSection.objects.values_list("section", "version")),
+            [("experience", 1), ("project", 1), ("skill", 1)],
+        )
+        self.assertEqual(self.run_job(), 0)
+        self.assertEqual(TailoredSection.objects.count(), 3)
+
+    def test_generator_page_request_is_served_from_the_pregenerated_result(self):
+        self.run_job()
+        factory = APIRequestFactory()
+        defaults = factory.get("/analyzer/defaults")
+        force_authenticate(defaults, user=self.user)
+        points = views.generation_defaults(defaults).data["output"]["experience_points"]
+
+        # What the page sends when opened from the application, with the default counts
+        request = factory.post("/analyzer/experience-gen", {
+            "job_role": self.application.job_name, "job_description": self.application.job_description,
+            "points_count": [points] * 3, "additional_instruction": "",
+            "application_id": str(self.application.pk),
+        }, format="json")
+        force_authenticate(request, user=self.user)
+        with mock.patch.object(llm_code.provider, "_complete") as complete:
+            response = views.experience_generation(request)
+        self.assertEqual((response.data["cached"], response.data["version"]), (True, 1))
+        complete.assert_not_called()
+
+    @override_settings(LLM_TOKEN_ACCOUNTING=True, LLM_DAILY_TOKEN_QUOTA=100000, LLM_MONTHLY_TOKEN_QUOTA=100000)
+    def test_deleting_the_application_cancels_the_call_in_flight(self):
+        job = pregeneration.Job(self.application.pk, self.user.pk)
+        provider = StubProvider(latency=5)
+        complete = provider._complete
+
+        def delete_while_in_flight(messages, model, temperature, max_tokens, cancel_event):
+            pregeneration.scheduler._jobs[job.application_id] = job
+            self.application.delete()
+            return complete(messages, model, temperature, max_tokens, cancel_event)
+
+        started = time.perf_counter()
+        with mock.patch.object(llm_code, "provider", provider), \
+                mock.patch.object(provider, "_complete", side_effect=delete_while_in_flight) as calls:
+            pregeneration.run_job(job, lambda job: True)
+        # The stub honours the job's cancel event instead of waiting out its latency
+        self.assertLess(time.perf_counter() - started, 2)
+        self.assertIs(calls.call_args.args[4], job.cancelled)
+        self.assertEqual(TailoredSection.objects.count(), 0)
+        self.assertEqual(quotas.usage_summary(self.user)["day"]["used_tokens"], 0)
+
+    def test_worker_logs_failed_jobs(self):
+        job = pregeneration.Job(self.application.pk, self.user.pk)
+        scheduler = pregeneration.Scheduler()
+        # The second job stops the worker loop once the first has been handled
+        scheduler._queue = [(0, 0, job), (1, 1, pregeneration.Job(self.application.pk, self.user.pk))]
+        with mock.patch.object(pregeneration, "run_job", side_effect=[RuntimeError("boom"), SystemExit]), \
+                mock.patch.object(pregeneration, "close_old_connections"), \
+                self.assertLogs("AnalyzerApp.pregeneration", "ERROR") as logs, \
+                self.assertRaises(SystemExit):
+            scheduler._run()
+        self.assertIn(f"Pre-generation failed for application {self.application.pk}", logs.output[0])
+        self.assertTrue(all(event.is_set() for event in job.done.values()))
+
+
+
+class CommitBatchTests(TransactionTestCase):
+    def setUp(self):
+        self.flushed = []
+
+    def flush(self, items):
+        self.flushed.append(set(items))
+
+    def test_items_of_one_transaction_are_flushed_once_after_commit(self):
+        other = []
+        with transaction.atomic():
+            commit_batches.add(self.flush, 1)
+            commit_batches.add(self.flush, 2)
+            commit_batches.add(other.append, "x")
+            commit_batches.add(self.flush, 2)
+            self.assertEqual(self.flushed, [])
+        self.assertEqual((self.flushed, other), ([{1, 2}], [{"x"}]))
+
+    def test_outside_a_transaction_items_are_flushed_at_once(self):
+        commit_batches.add(self.flush, 1)
+        commit_batches.add(self.flush, 2)
+        self.assertEqual(self.flushed, [{1}, {2}])
+
+    def test_rolled_back_batches_are_discarded(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            commit_batches.add(self.flush, 1)
+            raise RuntimeError
+        with transaction.atomic():
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                commit_batches.add(self.flush, 2)
+                raise RuntimeError
+            commit_batches.add(self.flush, 3)
+        self.assertEqual(self.flushed, [{3}])
+
+    def test_queued_callback_layout(self):
+        # commit_batches finds its queued batch in run_on_commit; a Django upgrade changing
+        # the entries would silently stop merging batches
+        with transaction.atomic():
+            commit_batches.add(self.flush, 1)
+            entries = transaction.get_connection().run_on_commit
+            self.assertEqual([len(entry) for entry in entries], [3])
+            self.assertIsInstance(entries[0][1], commit_batches._Batch)
+            self.assertIs(commit_batches._queued_batch(transaction.get_connection(), self.flush), entries[0][1])
+
+# Writes one buffered event, then exits without flushing it explicitly
+AUDIT_EXIT_SCRIPT = """
+import django
+django.setup()
+from unittest import mock
+from AnalyzerApp import audit
+from AnalyzerApp.models import GenerationEvent
+mock.patch.object(GenerationEvent.objects, "bulk_create", lambda batch, batch_size: print("flushed", len(batch))).start()
+audit.writer.record(user_id=1, endpoint="/analyzer/experience-gen", section="experience", mode="llm", cache_status="miss")
+"""
+
+
+@override_settings(AUDIT_LOG_ENABLED=True, AUDIT_BUFFER_SIZE=100, AUDIT_FLUSH_SIZE=3, AUDIT_FLUSH_INTERVAL=60)
+class AuditTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="audit", email="audit@example.com")
+        self.writer = audit.EventWriter()
+        patcher = mock.patch.object(audit, "close_old_connections")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def record(self):
+        return self.writer.record(user_id=self.user.pk, endpoint="/analyzer/experience-gen", section="experience",
+                                  mode="llm", cache_status="miss")
+
+    def test_full_batch_is_written_without_waiting_for_the_interval(self):
+        batches, written = [], threading.Event()
+
+        def bulk_create(batch, batch_size):
+            batches.append(len(batch))
+            written.set()
+
+        with mock.patch.object(GenerationEvent.objects, "bulk_create", side_effect=bulk_create):
+            self.record()
+            self.record()
+            self.assertEqual(self.writer.pending(), 2)
+            self.record()
+            self.assertTrue(written.wait(5))
+        self.assertEqual((batches, self.writer.pending()), ([3], 0))
+
+    @override_settings(AUDIT_BUFFER_SIZE=2, AUDIT_FLUSH_SIZE=100)
+    def test_events_past_the_buffer_are_dropped(self):
+        before = Counter(metrics.snapshot()["counters"])
+        self.assertEqual([self.record() for _ in range(3)], [True, True, False])
+        self.assertEqual((Counter(metrics.snapshot()["counters"]) - before)["audit.dropped"], 1)
+
+    @override_settings(AUDIT_FLUSH_SIZE=100)
+    def test_shutdown_writes_what_is_buffered(self):
+        with mock.patch.object(audit, "writer", self.writer):
+            self.record()
+            self.record()
+            audit.shutdown()
+        self.assertEqual(GenerationEvent.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(self.writer.pending(), 0)
+
+    def test_worker_exit_hook_flushes(self):
+        hooks = runpy.run_path(os.path.join(settings.BASE_DIR, "gunicorn.conf.py"))
+        with mock.patch.object(audit, "shutdown") as shutdown:
+            hooks["worker_exit"](None, None)
+        shutdown.assert_called_once_with()
+
+    def test_buffered_events_are_flushed_at_interpreter_exit(self):
+        result = subprocess.run(
+            [sys.executable, "-c", AUDIT_EXIT_SCRIPT], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=60,
+        )
+        self.assertIn("flushed 1", result.stdout, result.stderr)
+
+    @override_settings(LLM_TOKEN_ACCOUNTING=True, LLM_DAILY_TOKEN_QUOTA=100000)
+    def test_generation_failing_before_the_call_is_audited_and_settled(self):
+        request = APIRequestFactory().post("/analyzer/experience-gen", {
+            "job_role": JOB_ROLE, "job_description": JOB_DESCRIPTION, "points_count": [3],
+            "additional_instruction": "", "mode": "llm",
+        }, format="json")
+        force_authenticate(request, user=self.user)
+        with mock.patch.object(pregeneration, "interactive", side_effect=RuntimeError("scheduler down")), \
+                mock.patch.object(audit, "record") as record:
+            response = views.experience_generation(request)
+        self.assertEqual((response.status_code, response.data["error"]), (500, "scheduler down"))
+        self.assertEqual((record.call_args.kwargs["status"], record.call_args.kwargs["prompt_tokens"]), ("error", 0))
+        self.assertEqual(quotas.usage_summary(self.user)["day"]["used_tokens"], 0)
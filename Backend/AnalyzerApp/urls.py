@@ -15,4 +15,28 @@ urlpatterns = [
 
     # Skill Generation
     path('skill-gen', views.skill_generation, name='skill_generation'),
+
+    # Defaults the generator pages start from (shared with pre-generation)
+    path('defaults', views.generation_defaults, name='generation_defaults'),
+
+    # Stored tailoring for an application
+    path('tailored', views.tailored_resume, name='tailored_resume'),
+
+    # Suggestions from the user's previously generated bullets
+    path('suggest', views.bullet_suggestions, name='bullet_suggestions'),
+
+    # Skill demand across stored job descriptions
+    path('skill-demand', views.skill_demand_view, name='skill_demand'),
+
+    # Skills that co-occur with the user's skills or a JD's skills
+    path('related-skills', views.related_skills, name='related_skills'),
+
+    # Profile match scores across all stored job descriptions
+    path('matches', views.application_matches, name='application_matches'),
+
+    # Token usage and quota for the current user
+    path('usage', views.llm_usage, name='llm_usage'),
+
+    # LLM Metrics (latency, hedging) for the serving worker
+    path('metrics', views.llm_metrics, name='llm_metrics'),
 ]
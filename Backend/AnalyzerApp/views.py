@@ -1,26 +1,171 @@
+import time
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 
+from BackendApp.models import Applications
+from AnalyzerApp import (
+    tailoring, skill_demand, quotas, pregeneration, bullet_index, match_matrix, skill_cooccurrence, audit,
+)
+from AnalyzerApp.Analysis import llm_code, metrics, usage, template_generator
 from AnalyzerApp.Analysis.genrators import (
     generate_experience_output,
     generate_project_output,
     generate_skill_output,
 )
 
+GENERATION_MODES = ('llm', 'template', 'auto')
+
+# (LLM generator, local template generator) per section
+GENERATORS = {
+    'experience': (generate_experience_output, template_generator.generate_experience_output),
+    'project': (generate_project_output, template_generator.generate_project_output),
+    'skill': (generate_skill_output, template_generator.generate_skill_output),
+}
+
+
+def _get_application(request, application_id):
+    try:
+        return Applications.objects.filter(id=application_id, user=request.user).first()
+    except ValidationError:
+        return None
+
+
+def _limit(params, default, maximum):
+    """`limit` from the request parameters, or None unless it is a number in 1..maximum."""
+    try:
+        limit = int(params.get("limit", default))
+    except (TypeError, ValueError):
+        return None
+    return limit if 1 <= limit <= maximum else None
+
+
+def _template_response(message, output, reason=None):
+    body = {'message': message, 'status': 'success', 'output': output, 'mode': 'template'}
+    if reason:
+        body['fallback_reason'] = reason
+    return Response(body)
+
+
+def _audit(request, section, mode, cache_status, started, status='success', tracker=None):
+    audit.record(
+        user_id=request.user.pk,
+        endpoint=request.path[:100],
+        section=section,
+        mode=mode,
+        model=', '.join(m for m in tracker.models if m)[:100] if tracker else '',
+        prompt_tokens=tracker.prompt_tokens if tracker else 0,
+        completion_tokens=tracker.completion_tokens if tracker else 0,
+        latency_ms=int((time.perf_counter() - started) * 1000),
+        cache_status=cache_status,
+        status=status,
+    )
+
+
+def _run_generation(request, message, section, inputs, call):
+    """
+    Run a generator, optionally linked to an application via `application_id`.
+    Linked generations are persisted as a new version of the section, and an
+    identical earlier request is served from the store unless `regenerate` is set.
+    Anything that reaches the LLM is charged to the user's token quota.
+
+    `mode` selects the generator: `llm`, `template` (local, no LLM call) or
+    `auto` (LLM, falling back to the template when it fails or the user is over
+    quota). Template output is never persisted.
+
+    Every outcome is recorded in the buffered generation audit log.
+    """
+    started = time.perf_counter()
+    data = request.data
+    llm_generator, template = GENERATORS[section]
+    mode = data.get("mode") or settings.ANALYZER_GENERATION_MODE
+    if mode not in GENERATION_MODES:
+        return Response({'message': message, 'status': 'error',
+                         'error': f'Invalid mode: {mode}. Use llm, template or auto'}, status=400)
+    if mode == 'template':
+        output = call(template)
+        _audit(request, section, 'template', 'bypass', started)
+        return _template_response(message, output)
+
+    application = None
+    req_hash = None
+    cache_status = 'bypass'
+    application_id = data.get("application_id")
+    if application_id:
+        application = _get_application(request, application_id)
+        if application is None:
+            return Response({'message': message, 'status': 'error', 'error': 'Application not found'}, status=404)
+        job_description = inputs.get("job_description")
+        if job_description and application.job_description != job_description:
+            # The tailored JD becomes the application's JD, which updates skill demand
+            application.job_description = job_description
+            application.save(update_fields=['job_description', 'updated_at'])
+        req_hash = tailoring.request_hash(section, **inputs)
+        if not data.get("regenerate"):
+            pregeneration.wait_for(application.id, section)
+            cached, output = tailoring.find_cached(application, section, req_hash)
+            if cached is not None:
+                _audit(request, section, mode, 'hit', started)
+                return Response({'message': message, 'status': 'success', 'output': output,
+                                 'cached': True, 'version': cached.version})
+            cache_status = 'miss'
+
+    try:
+        reservation = quotas.reserve(request.user, quotas.estimate(section, inputs))
+    except quotas.QuotaExceeded as e:
+        if mode == 'auto':
+            output = call(template)
+            _audit(request, section, 'template', cache_status, started, 'over_quota')
+            return _template_response(message, output, str(e))
+        _audit(request, section, mode, cache_status, started, 'over_quota')
+        return Response({'message': message, 'status': 'error', 'error': str(e),
+                         'usage': quotas.usage_summary(request.user)}, status=429)
+    # Unset when entering the contexts fails before the generator runs
+    tracker = None
+    try:
+        with pregeneration.interactive(), usage.track() as tracker:
+            try:
+                output = call(llm_generator)
+            finally:
+                quotas.settle(reservation, tracker.total_tokens)
+    except Exception as e:
+        if tracker is None:
+            quotas.settle(reservation, 0)
+        if mode != 'auto':
+            _audit(request, section, mode, cache_status, started, 'error', tracker)
+            raise
+        metrics.incr('generation.template_fallback')
+        output = call(template)
+        _audit(request, section, 'template', cache_status, started, 'fallback', tracker)
+        return _template_response(message, output, str(e))
+    _audit(request, section, 'llm', cache_status, started, tracker=tracker)
+    body = {'message': message, 'status': 'success', 'output': output, 'tokens': tracker.total_tokens}
+    if application is not None:
+        saved = tailoring.save_tailoring(request.user, application, section, req_hash, inputs.get("job_role"), output)
+        body['version'] = saved.version
+    return Response(body)
+
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def experience_generation(request):
     try:
         data = request.data
-        experience_output = generate_experience_output(
-            data.get("job_role"),
-            data.get("job_description"),
-            data.get("points_count"),
-            data.get("additional_instruction"),
-        )
-        return Response({'message': 'Experience generation', 'status': 'success', 'output': experience_output})
+        inputs = {
+            "job_role": data.get("job_role"),
+            "job_description": data.get("job_description"),
+            "points_count": data.get("points_count"),
+            "additional_instruction": data.get("additional_instruction"),
+        }
+        return _run_generation(request, 'Experience generation', 'experience', inputs, lambda generator: generator(
+            inputs["job_role"],
+            inputs["job_description"],
+            inputs["points_count"],
+            inputs["additional_instruction"],
+        ))
     except Exception as e:
         return Response({'message': 'Experience generation', 'status': 'error', 'error': str(e)}, status=500)
 
@@ -30,13 +175,18 @@ def experience_generation(request):
 def project_generation(request):
     try:
         data = request.data
-        project_output = generate_project_output(
-            data.get("job_role"),
-            data.get("job_description"),
-            data.get("points_count"),
-            data.get("additional_instruction"),
-        )
-        return Response({'message': 'Project generation', 'status': 'success', 'output': project_output})
+        inputs = {
+            "job_role": data.get("job_role"),
+            "job_description": data.get("job_description"),
+            "points_count": data.get("points_count"),
+            "additional_instruction": data.get("additional_instruction"),
+        }
+        return _run_generation(request, 'Project generation', 'project', inputs, lambda generator: generator(
+            inputs["job_role"],
+            inputs["job_description"],
+            inputs["points_count"],
+            inputs["additional_instruction"],
+        ))
     except Exception as e:
         return Response({'message': 'Project generation', 'status': 'error', 'error': str(e)}, status=500)
 
@@ -46,14 +196,169 @@ def project_generation(request):
 def skill_generation(request):
     try:
         data = request.data
-        skill_output = generate_skill_output(
-            data.get("job_role"),
-            data.get("job_description"),
-            data.get("additional_instruction"),
-            data.get("include_web_research"),
-            data.get("experience_data"),
-            data.get("project_data"),
-        )
-        return Response({'message': 'Skill generation', 'status': 'success', 'output': skill_output})
+        inputs = {
+            "job_role": data.get("job_role"),
+            "job_description": data.get("job_description"),
+            "additional_instruction": data.get("additional_instruction"),
+            "include_web_research": data.get("include_web_research"),
+            "experience_data": data.get("experience_data"),
+            "project_data": data.get("project_data"),
+        }
+        return _run_generation(request, 'Skill generation', 'skill', inputs, lambda generator: generator(
+            inputs["job_role"],
+            inputs["job_description"],
+            inputs["additional_instruction"],
+            inputs["include_web_research"],
+            inputs["experience_data"],
+            inputs["project_data"],
+        ))
     except Exception as e:
         return Response({'message': 'Skill generation', 'status': 'error', 'error': str(e)}, status=500)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def generation_defaults(request):
+    """
+    GET
+    Inputs the generator pages start from. Pre-generation uses the same values,
+    so a page opened for an application is served its pre-generated sections.
+    """
+    return Response({'message': 'Generation defaults', 'status': 'success', 'output': {
+        "experience_points": settings.ANALYZER_EXPERIENCE_POINTS,
+        "project_points": settings.ANALYZER_PROJECT_POINTS,
+    }})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def tailored_resume(request):
+    """
+    GET ?application_id=...[&section=experience|project|skill][&version=N]
+    Stored tailoring for an application, without calling the LLM.
+    """
+    try:
+        application = _get_application(request, request.query_params.get("application_id"))
+        if application is None:
+            return Response({'message': 'Tailored resume', 'status': 'error', 'error': 'Application not found'}, status=404)
+        section = request.query_params.get("section")
+        version = request.query_params.get("version")
+        sections = tailoring.load_tailoring(application, section, int(version) if version else None)
+        return Response({'message': 'Tailored resume', 'status': 'success', 'output': {
+            "application_id": str(application.id),
+            "sections": sections,
+            "versions": tailoring.list_versions(application),
+        }})
+    except Exception as e:
+        return Response({'message': 'Tailored resume', 'status': 'error', 'error': str(e)}, status=500)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bullet_suggestions(request):
+    """
+    POST {job_description, section?: experience|project, limit?: 10}
+    Best-matching bullets from the user's own generation history, without
+    calling the LLM. `needs_llm` is set when they cover too little of the JD.
+    """
+    try:
+        data = request.data
+        job_description = data.get("job_description")
+        section = data.get("section")
+        if not job_description:
+            return Response({'message': 'Bullet suggestions', 'status': 'error', 'error': 'job_description is required'}, status=400)
+        if section and section not in bullet_index.ITEM_KEYS:
+            return Response({'message': 'Bullet suggestions', 'status': 'error', 'error': f'Invalid section: {section}. Use experience or project'}, status=400)
+        limit = _limit(data, 10, 50)
+        if limit is None:
+            return Response({'message': 'Bullet suggestions', 'status': 'error', 'error': 'limit must be a number between 1 and 50'}, status=400)
+        output = bullet_index.suggest(request.user, job_description, section, limit)
+        return Response({'message': 'Bullet suggestions', 'status': 'success', 'output': output})
+    except Exception as e:
+        return Response({'message': 'Bullet suggestions', 'status': 'error', 'error': str(e)}, status=500)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def skill_demand_view(request):
+    """
+    GET ?scope=user|global&limit=20[&category=...]
+    Skills most often asked for by stored job descriptions.
+    """
+    try:
+        scope = request.query_params.get("scope", "user")
+        limit = _limit(request.query_params, 20, 100)
+        category = request.query_params.get("category")
+        if limit is None:
+            return Response({'message': 'Skill demand', 'status': 'error', 'error': 'limit must be a number between 1 and 100'}, status=400)
+        if scope not in ("user", "global"):
+            return Response({'message': 'Skill demand', 'status': 'error', 'error': f'Invalid scope: {scope}. Use user or global'}, status=400)
+        output = skill_demand.top_skills(request.user if scope == "user" else None, limit, category)
+        return Response({'message': 'Skill demand', 'status': 'success', 'output': output})
+    except Exception as e:
+        return Response({'message': 'Skill demand', 'status': 'error', 'error': str(e)}, status=500)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def llm_usage(request):
+    """
+    GET
+    Tokens used by the current user today and this month, with the configured limits.
+    """
+    try:
+        return Response({'message': 'LLM usage', 'status': 'success', 'output': quotas.usage_summary(request.user)})
+    except Exception as e:
+        return Response({'message': 'LLM usage', 'status': 'error', 'error': str(e)}, status=500)
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def related_skills(request):
+    """
+    GET  [?limit=20]                          — skills that go with the user's skills
+    POST {job_description, limit?: 20}        — skills that go with the ones a JD names
+    Read from the precomputed co-occurrence counts, without calling the LLM.
+    """
+    try:
+        params = request.data if request.method == 'POST' else request.query_params
+        limit = _limit(params, 20, 100)
+        if limit is None:
+            return Response({'message': 'Related skills', 'status': 'error', 'error': 'limit must be a number between 1 and 100'}, status=400)
+        if request.method == 'POST':
+            job_description = params.get("job_description")
+            if not job_description:
+                return Response({'message': 'Related skills', 'status': 'error', 'error': 'job_description is required'}, status=400)
+            output = skill_cooccurrence.recommend_for_text(job_description, limit)
+        else:
+            output = skill_cooccurrence.recommend_for_user(request.user, limit)
+        return Response({'message': 'Related skills', 'status': 'success', 'output': output})
+    except Exception as e:
+        return Response({'message': 'Related skills', 'status': 'error', 'error': str(e)}, status=500)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def application_matches(request):
+    """
+    GET [?limit=N][&status=...]
+    The user's stored job descriptions ranked by how well their profile matches,
+    with the skills each posting asks for that the profile lacks.
+    """
+    try:
+        limit = request.query_params.get("limit")
+        output = match_matrix.match_applications(
+            request.user, int(limit) if limit else None, request.query_params.get("status"),
+        )
+        return Response({'message': 'Application matches', 'status': 'success', 'output': output})
+    except Exception as e:
+        return Response({'message': 'Application matches', 'status': 'error', 'error': str(e)}, status=500)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def llm_metrics(request):
+    output = metrics.snapshot()
+    if hasattr(llm_code.provider, 'stats'):
+        output['hedging'] = llm_code.provider.stats()
+    return Response({'message': 'LLM metrics', 'status': 'success', 'output': output})
@@ -0,0 +1,132 @@
+"""
+The complete applicant document built by the database in one statement.
+
+Each section is a correlated subquery aggregating its rows into a JSON
+array (json_agg/json_build_object on PostgreSQL, json_group_array/json_object
+with JSON1 on SQLite), so the response body comes back as a single text
+value with the same shape `complete_applicant_info` returns.
+"""
+from django.db import connection
+
+from .models import ApplicantBasicInfo, Academics, Achievements, Skills, UserSkills, Projects, ProjectSkills, Experiences
+
+SUPPORTED_VENDORS = ('postgresql', 'sqlite')
+
+# (response key, column) per section, in response order
+BASIC_FIELDS = [
+    ('id', 'id'), ('fullName', 'full_name'), ('phoneNumber', 'phone_number'), ('email', 'email'),
+    ('linkedinUrl', 'linkedin_url'), ('githubUrl', 'github_url'), ('address', 'address'),
+]
+ACADEMIC_FIELDS = [
+    ('id', 'id'), ('collegeName', 'college_name'), ('graduationDate', 'graduation_date'),
+    ('course', 'course'), ('displayOrder', 'display_order'),
+]
+ACHIEVEMENT_FIELDS = [('id', 'id'), ('achievementPoint', 'achievement_point'), ('displayOrder', 'display_order')]
+SKILL_FIELDS = [('id', 'id'), ('skillName', 'skill_name'), ('category', 'category')]
+PROJECT_FIELDS = [('id', 'id'), ('projectName', 'project_name'), ('projectInfo', 'project_info'), ('displayOrder', 'display_order')]
+EXPERIENCE_FIELDS = [
+    ('id', 'id'), ('experienceName', 'experience_name'), ('startDate', 'start_date'), ('endDate', 'end_date'),
+    ('role', 'role'), ('location', 'location'), ('experienceExplanation', 'experience_explanation'),
+    ('displayOrder', 'display_order'),
+]
+
+
+def _table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+class _Postgres:
+    def column(self, alias, column):
+        return f'{alias}.{column}'
+
+    def obj(self, pairs):
+        return 'json_build_object(' + ', '.join(f"'{key}', {value}" for key, value in pairs) + ')'
+
+    def nested(self, subquery):
+        return f'({subquery})'
+
+    def array(self, obj, source, order):
+        return f"COALESCE((SELECT json_agg({obj} ORDER BY {order}) FROM {source}), '[]'::json)"
+
+    def document(self, obj):
+        return f'SELECT ({obj})::text'
+
+
+class _SQLite:
+    def column(self, alias, column):
+        # Django stores UUIDs as 32 hex digits on SQLite; the API returns the dashed form
+        if column == 'id':
+            c = f'{alias}.id'
+            return (
+                f"substr({c}, 1, 8) || '-' || substr({c}, 9, 4) || '-' || substr({c}, 13, 4)"
+                f" || '-' || substr({c}, 17, 4) || '-' || substr({c}, 21)"
+            )
+        return f'{alias}.{column}'
+
+    def obj(self, pairs):
+        return 'json_object(' + ', '.join(f"'{key}', {value}" for key, value in pairs) + ')'
+
+    def nested(self, subquery):
+        # Without json() the nested document would be embedded as a string
+        return f'json(({subquery}))'
+
+    def array(self, obj, source, order):
+        return f'json((SELECT json_group_array(json(doc)) FROM (SELECT {obj} AS doc FROM {source} ORDER BY {order})))'
+
+    def document(self, obj):
+        return f'SELECT {obj}'
+
+
+def _fields(dialect, alias, fields):
+    return [(key, dialect.column(alias, column)) for key, column in fields]
+
+
+def document_sql(dialect):
+    """The statement and the number of user id parameters it takes."""
+    skill = _fields(dialect, 's', SKILL_FIELDS)
+    project_skills = dialect.array(
+        dialect.obj(skill),
+        f'{_table(ProjectSkills)} ps JOIN {_table(Skills)} s ON s.id = ps.skill_id WHERE ps.project_id = p.id',
+        'ps.created_at',
+    )
+    sections = [
+        ('basicInformation', dialect.nested(
+            f'SELECT {dialect.obj(_fields(dialect, "b", BASIC_FIELDS))} FROM {_table(ApplicantBasicInfo)} b '
+            f'WHERE b.user_id = %s LIMIT 1'
+        )),
+        ('academics', dialect.array(
+            dialect.obj(_fields(dialect, 'a', ACADEMIC_FIELDS)),
+            f'{_table(Academics)} a WHERE a.user_id = %s', 'a.display_order',
+        )),
+        ('achievements', dialect.array(
+            dialect.obj(_fields(dialect, 'a', ACHIEVEMENT_FIELDS)),
+            f'{_table(Achievements)} a WHERE a.user_id = %s', 'a.display_order',
+        )),
+        ('skills', dialect.array(
+            dialect.obj(skill),
+            f'{_table(UserSkills)} us JOIN {_table(Skills)} s ON s.id = us.skill_id WHERE us.user_id = %s',
+            'us.created_at',
+        )),
+        ('projects', dialect.array(
+            dialect.obj(_fields(dialect, 'p', PROJECT_FIELDS) + [('skills', project_skills)]),
+            f'{_table(Projects)} p WHERE p.user_id = %s', 'p.display_order',
+        )),
+        ('experiences', dialect.array(
+            dialect.obj(_fields(dialect, 'e', EXPERIENCE_FIELDS)),
+            f'{_table(Experiences)} e WHERE e.user_id = %s', 'e.display_order',
+        )),
+    ]
+    return dialect.document(dialect.obj(sections)), len(sections)
+
+
+def supported():
+    return connection.vendor in SUPPORTED_VENDORS
+
+
+def complete_document(user_id):
+    """The complete applicant document as JSON text, fetched in one round trip."""
+    dialect = _Postgres() if connection.vendor == 'postgresql' else _SQLite()
+    sql, placeholders = document_sql(dialect)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [user_id] * placeholders)
+        return cursor.fetchone()[0]
@@ -0,0 +1,86 @@
+"""
+Substring search over a user's applications (company, job title, notes).
+
+PostgreSQL matches with ILIKE and pg_trgm word similarity, both answered by
+the GIN trigram indexes declared on Applications, and ranks by word
+similarity. SQLite, for local runs, keeps an FTS5 table with the trigram
+tokenizer in sync through triggers and ranks by bm25. Both are created by
+migration 0005, which holds the SQLite statements. Queries shorter than a
+trigram fall back to a plain case-insensitive scan, as do databases
+without either index.
+"""
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Applications
+from . import sqlite_fts
+
+COLUMNS = ('company_name', 'job_name', 'notes')
+
+# Trigram indexes cannot narrow anything shorter
+MIN_INDEXED_LENGTH = 3
+
+
+def _table():
+    return connection.ops.quote_name(Applications._meta.db_table)
+
+
+class _Postgres:
+    def available(self):
+        return True
+
+    def search(self, qs, query):
+        table = _table()
+        pattern = f'%{connection.ops.prep_for_like_query(query)}%'
+        matches = ' OR '.join(f'{table}.{c} ILIKE %s OR %s <%% {table}.{c}' for c in COLUMNS)
+        rank = 'GREATEST(' + ', '.join(f"word_similarity(%s, COALESCE({table}.{c}, ''))" for c in COLUMNS) + ')'
+        return qs.filter(
+            RawSQL(f'({matches})', [p for _ in COLUMNS for p in (pattern, query)], output_field=BooleanField())
+        ).annotate(search_rank=RawSQL(rank, [query] * len(COLUMNS), output_field=FloatField()))
+
+
+class _SQLite:
+    _installed = None
+
+    def _names(self):
+        base = sqlite_fts.table_name(Applications)
+        return base, f'{base}_search'
+
+    def available(self):
+        # Checked once per process; a database without the table or its
+        # triggers (dropped by a table rebuild) scans instead
+        if self._installed is None:
+            _SQLite._installed = sqlite_fts.installed(self._names()[1])
+        return self._installed
+
+    def search(self, qs, query):
+        table = _table()
+        _, fts = self._names()
+        phrase = '"' + query.replace('"', '""') + '"'
+        return qs.filter(
+            RawSQL(f'{table}.rowid IN (SELECT rowid FROM {fts} WHERE {fts} MATCH %s)', [phrase], output_field=BooleanField())
+        ).annotate(search_rank=RawSQL(
+            # bm25 is lower for better matches
+            f'(SELECT -bm25({fts}) FROM {fts} WHERE {fts} MATCH %s AND {fts}.rowid = {table}.rowid)',
+            [phrase], output_field=FloatField(),
+        ))
+
+
+def _dialect(vendor):
+    return {'postgresql': _Postgres, 'sqlite': _SQLite}.get(vendor, lambda: None)()
+
+
+def search(qs, query):
+    """
+    Applications of `qs` matching `query`, annotated with `search_rank`
+    (higher is more relevant).
+    """
+    query = query.strip()
+    dialect = _dialect(connection.vendor)
+    if len(query) >= MIN_INDEXED_LENGTH and dialect is not None and dialect.available():
+        return dialect.search(qs, query)
+    matches = Q()
+    for column in COLUMNS:
+        matches |= Q(**{f'{column}__icontains': query})
+    return qs.filter(matches).annotate(search_rank=Value(0.0, output_field=FloatField()))
@@ -0,0 +1,82 @@
+"""
+Application statistics for the dashboard.
+
+`compute` counts every status with one conditional-aggregation query plus
+one query for the recent applications. With APPLICATION_STATS_CACHE the
+result is kept in the user's ApplicationStats row, so a dashboard load
+normally reads that one row. Application writes only bump the row's
+version. The next read then recomputes it under a short lease: a single
+request recomputes, and concurrent readers keep serving the previous
+document until the new one is stored.
+"""
+from datetime import timedelta
+
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from AnalyzerApp import commit_batches
+from .models import Applications, ApplicationStats
+
+STATUSES = [status for status, _ in Applications.STATUS_CHOICES]
+SUCCESSFUL = ('Accepted', 'Interview')
+RECENT = 5
+
+# How long a recomputing request holds the lease before another may take over
+LEASE = timedelta(seconds=30)
+
+
+def compute(user):
+    qs = Applications.objects.filter(user=user)
+    counts = qs.aggregate(
+        total=Count('id'),
+        **{f'status_{i}': Count('id', filter=Q(status=status)) for i, status in enumerate(STATUSES)},
+    )
+    total = counts['total']
+    by_status = {status: counts[f'status_{i}'] for i, status in enumerate(STATUSES)}
+    successful = sum(by_status[status] for status in SUCCESSFUL)
+    return {
+        "total": total,
+        "byStatus": by_status,
+        "successRate": round(successful / total * 100, 2) if total > 0 else 0,
+        "recentApplications": [
+            {"id": str(pk), "jobName": job_name, "companyName": company_name, "status": status}
+            for pk, job_name, company_name, status in qs.order_by('-created_at').values_list(
+                'id', 'job_name', 'company_name', 'status',
+            )[:RECENT]
+        ],
+    }
+
+
+def read(user):
+    """The user's statistics, from the cached row when it is current."""
+    stats = ApplicationStats.objects.filter(user=user).first()
+    if stats is None:
+        ApplicationStats.objects.bulk_create([ApplicationStats(user=user)], ignore_conflicts=True)
+        stats = ApplicationStats.objects.get(user=user)
+    if stats.computed_version == stats.version:
+        return stats.document
+
+    now = timezone.now()
+    leased = ApplicationStats.objects.filter(pk=stats.pk).filter(
+        Q(refreshing_until__isnull=True) | Q(refreshing_until__lt=now),
+    ).update(refreshing_until=now + LEASE)
+    if not leased and stats.computed_version:
+        # Another request is recomputing; the previous document is close enough
+        return stats.document
+
+    document = compute(user)
+    if leased:
+        # Stored as of the version read above; a write since then leaves it stale
+        ApplicationStats.objects.filter(pk=stats.pk).update(
+            document=document, computed_version=stats.version, refreshing_until=None,
+        )
+    return document
+
+
+def _invalidate(user_ids):
+    ApplicationStats.objects.filter(user_id__in=user_ids).update(version=F('version') + 1)
+
+
+def invalidate(user_id):
+    """Mark the user's statistics stale once the current transaction commits."""
+    commit_batches.add(_invalidate, user_id)
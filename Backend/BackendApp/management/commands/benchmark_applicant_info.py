@@ -0,0 +1,106 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+import json
+import statistics
+import time
+import uuid
+
+from BackendApp import applicant_document
+from BackendApp.models import (
+    ApplicantBasicInfo, Academics, Achievements, Skills,
+    UserSkills, Projects, ProjectSkills, Experiences,
+)
+from BackendApp.views import build_complete_applicant_info
+
+# Skills linked to every generated project
+SKILLS_PER_PROJECT = 3
+
+
+def _seed(rows):
+    """A throwaway user with `rows` entries in every section."""
+    tag = uuid.uuid4().hex[:8]
+    user = get_user_model().objects.create(username=f'bench-{tag}', email=f'bench-{tag}@example.com')
+    ApplicantBasicInfo.objects.create(user=user, full_name='Bench User', phone_number='5550100', email=user.email)
+    skills = Skills.objects.bulk_create([
+        Skills(skill_name=f'bench-{tag}-skill-{i}', category='Benchmark') for i in range(rows)
+    ])
+    Academics.objects.bulk_create([
+        Academics(user=user, college_name=f'College {i}', graduation_date='2020', course='CS', display_order=i)
+        for i in range(rows)
+    ])
+    Achievements.objects.bulk_create([
+        Achievements(user=user, achievement_point=f'Achievement {i}', display_order=i) for i in range(rows)
+    ])
+    UserSkills.objects.bulk_create([UserSkills(user=user, skill=s) for s in skills])
+    projects = Projects.objects.bulk_create([
+        Projects(user=user, project_name=f'Project {i}', project_info='Built a thing ' * 20, display_order=i)
+        for i in range(rows)
+    ])
+    ProjectSkills.objects.bulk_create([
+        ProjectSkills(project=p, skill=skills[(i + k) % rows])
+        for i, p in enumerate(projects) for k in range(min(SKILLS_PER_PROJECT, rows))
+    ])
+    Experiences.objects.bulk_create([
+        Experiences(
+            user=user, experience_name=f'Company {i}', start_date='2020', end_date='2021', role='Engineer',
+            location='Remote', experience_explanation='Did things ' * 30, display_order=i,
+        )
+        for i in range(rows)
+    ])
+    return user
+
+
+def _normalized(document):
+    """Skill order is not defined by the ORM path; compare skill lists as sets."""
+    document = json.loads(json.dumps(document))
+    document['skills'].sort(key=lambda s: s['id'])
+    for project in document['projects']:
+        project['skills'].sort(key=lambda s: s['id'])
+    return document
+
+
+def _time(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+class Command(BaseCommand):
+    help = 'Compare the ORM and single-statement SQL JSON builds of applicant-info/complete (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000], help='Rows per section')
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        if not applicant_document.supported():
+            raise CommandError(f'SQL JSON build is not available on {connection.vendor}')
+
+        self.stdout.write(f"{'rows':>6}{'orm ms':>10}{'orm queries':>13}{'sql ms':>10}{'sql queries':>13}{'speedup':>9}")
+        for rows in options['sizes']:
+            with transaction.atomic():
+                user = _seed(rows)
+                # Both paths end in a JSON body; include serialization in the ORM timing
+                orm = lambda: json.dumps(build_complete_applicant_info(user))
+                sql = lambda: applicant_document.complete_document(user.pk)
+
+                if _normalized(json.loads(orm())) != _normalized(json.loads(sql())):
+                    raise CommandError(f'SQL JSON document differs from the ORM document at {rows} rows')
+                with CaptureQueriesContext(connection) as orm_queries:
+                    orm()
+                with CaptureQueriesContext(connection) as sql_queries:
+                    sql()
+                orm_ms = _time(orm, options['repeat'])
+                sql_ms = _time(sql, options['repeat'])
+                transaction.set_rollback(True)
+
+            self.stdout.write(
+                f"{rows:>6}{orm_ms:>10.2f}{len(orm_queries):>13}{sql_ms:>10.2f}{len(sql_queries):>13}"
+                f"{orm_ms / sql_ms if sql_ms else 0:>8.1f}x"
+            )
+        self.stdout.write(self.style.SUCCESS('✅ Documents match at every size'))
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BackendApp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applications',
+            name='job_description',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
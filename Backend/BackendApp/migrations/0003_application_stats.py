@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:54
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('BackendApp', '0002_applications_job_description'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationStats',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('document', models.JSONField(default=dict)),
+                ('version', models.IntegerField(default=1)),
+                ('computed_version', models.IntegerField(default=0)),
+                ('refreshing_until', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='application_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Application Statistics',
+                'verbose_name_plural': 'Application Statistics',
+                'db_table': '"resumeanalyzer"."application_stats"',
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BackendApp', '0003_application_stats'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='applications',
+            name='idx_applications_user_status',
+        ),
+        migrations.RemoveIndex(
+            model_name='applications',
+            name='idx_applications_user_company',
+        ),
+        migrations.AddIndex(
+            model_name='applications',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='idx_applications_user_created'),
+        ),
+        migrations.AddIndex(
+            model_name='applications',
+            index=models.Index(fields=['user', 'job_name', 'id'], name='idx_applications_user_job'),
+        ),
+        migrations.AddIndex(
+            model_name='applications',
+            index=models.Index(fields=['user', 'status', 'id'], name='idx_applications_user_status'),
+        ),
+        migrations.AddIndex(
+            model_name='applications',
+            index=models.Index(fields=['user', 'company_name', 'id'], name='idx_applications_user_company'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Trigram search indexes for applications.
+#
+# PostgreSQL: pg_trgm GIN indexes on (user_id, column), declared in
+# Applications.Meta so Django tracks them through later migrations.
+#
+# SQLite: an external-content FTS5 trigram table over company_name, job_name
+# and notes, kept in sync by triggers. The statements are frozen here. A
+# later migration that rebuilds the applications table (any AlterField on
+# SQLite does) drops the triggers and renumbers rowids, so it must drop and
+# recreate applications_search and its triggers, with a 'rebuild', around
+# the change.
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import BtreeGinExtension, TrigramExtension
+from django.db import migrations, models
+
+import BackendApp.models
+from BackendApp.operations import RunSQLFor
+
+SQLITE_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS applications_search USING fts5("
+    "company_name, job_name, notes, content='applications', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS applications_search_insert AFTER INSERT ON applications BEGIN "
+    "INSERT INTO applications_search(rowid, company_name, job_name, notes) "
+    "VALUES (new.rowid, new.company_name, new.job_name, new.notes); END",
+    "CREATE TRIGGER IF NOT EXISTS applications_search_delete AFTER DELETE ON applications BEGIN "
+    "INSERT INTO applications_search(applications_search, rowid, company_name, job_name, notes) "
+    "VALUES ('delete', old.rowid, old.company_name, old.job_name, old.notes); END",
+    "CREATE TRIGGER IF NOT EXISTS applications_search_update AFTER UPDATE ON applications BEGIN "
+    "INSERT INTO applications_search(applications_search, rowid, company_name, job_name, notes) "
+    "VALUES ('delete', old.rowid, old.company_name, old.job_name, old.notes); "
+    "INSERT INTO applications_search(rowid, company_name, job_name, notes) "
+    "VALUES (new.rowid, new.company_name, new.job_name, new.notes); END",
+    "INSERT INTO applications_search(applications_search) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS applications_search_insert",
+    "DROP TRIGGER IF EXISTS applications_search_delete",
+    "DROP TRIGGER IF EXISTS applications_search_update",
+    "DROP TABLE IF EXISTS applications_search",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BackendApp', '0004_application_keyset_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        # Lets user_id lead the GIN indexes
+        BtreeGinExtension(),
+        migrations.AddIndex(
+            model_name='applications',
+            index=BackendApp.models.PostgresGinIndex(models.F('user'), django.contrib.postgres.indexes.OpClass('company_name', name='gin_trgm_ops'), name='idx_applications_company_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='applications',
+            index=BackendApp.models.PostgresGinIndex(models.F('user'), django.contrib.postgres.indexes.OpClass('job_name', name='gin_trgm_ops'), name='idx_applications_job_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='applications',
+            index=BackendApp.models.PostgresGinIndex(models.F('user'), django.contrib.postgres.indexes.OpClass('notes', name='gin_trgm_ops'), name='idx_applications_notes_trgm'),
+        ),
+        RunSQLFor('sqlite', SQLITE_SQL, SQLITE_REVERSE_SQL),
+    ]
@@ -0,0 +1,147 @@
+# Full-text search over experiences, projects, achievements and applications.
+#
+# PostgreSQL: a generated `search_vector` tsvector column per table, title
+# columns weighted A and body columns B, with a GIN index on
+# (user_id, search_vector). PostgreSQL refuses to ALTER TYPE a column a
+# generated column reads, so a later AlterField on any of
+#   experiences.role, experience_name, location, experience_explanation
+#   projects.project_name, project_info
+#   achievements.achievement_point
+#   applications.job_name, company_name, notes
+# must drop search_vector (and its index) first and recreate both after.
+#
+# SQLite: an external-content FTS5 table per table, kept in sync by
+# triggers. Any AlterField on SQLite rebuilds the table, which drops the
+# triggers and renumbers rowids, so it must drop and recreate the FTS table
+# and its triggers around the change.
+#
+# The statements are frozen here; profile_search only reads what they create.
+
+from django.db import migrations
+
+from BackendApp.operations import RunSQLFor
+
+POSTGRES_SQL = [
+    'ALTER TABLE "resumeanalyzer"."experiences" ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ('
+    "setweight(to_tsvector('english', COALESCE(role, '') || ' ' || COALESCE(experience_name, '')), 'A') || "
+    "setweight(to_tsvector('english', COALESCE(location, '') || ' ' || COALESCE(experience_explanation, '')), 'B')"
+    ') STORED',
+    'CREATE INDEX IF NOT EXISTS idx_experiences_search ON "resumeanalyzer"."experiences" USING gin (user_id, search_vector)',
+    'ALTER TABLE "resumeanalyzer"."projects" ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ('
+    "setweight(to_tsvector('english', COALESCE(project_name, '')), 'A') || "
+    "setweight(to_tsvector('english', COALESCE(project_info, '')), 'B')"
+    ') STORED',
+    'CREATE INDEX IF NOT EXISTS idx_projects_search ON "resumeanalyzer"."projects" USING gin (user_id, search_vector)',
+    'ALTER TABLE "resumeanalyzer"."achievements" ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ('
+    "setweight(to_tsvector('english', COALESCE(achievement_point, '')), 'B')"
+    ') STORED',
+    'CREATE INDEX IF NOT EXISTS idx_achievements_search ON "resumeanalyzer"."achievements" USING gin (user_id, search_vector)',
+    'ALTER TABLE "resumeanalyzer"."applications" ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ('
+    "setweight(to_tsvector('english', COALESCE(job_name, '') || ' ' || COALESCE(company_name, '')), 'A') || "
+    "setweight(to_tsvector('english', COALESCE(notes, '')), 'B')"
+    ') STORED',
+    'CREATE INDEX IF NOT EXISTS idx_applications_search ON "resumeanalyzer"."applications" USING gin (user_id, search_vector)',
+]
+
+POSTGRES_REVERSE_SQL = [
+    'DROP INDEX IF EXISTS "resumeanalyzer".idx_experiences_search',
+    'ALTER TABLE "resumeanalyzer"."experiences" DROP COLUMN IF EXISTS search_vector',
+    'DROP INDEX IF EXISTS "resumeanalyzer".idx_projects_search',
+    'ALTER TABLE "resumeanalyzer"."projects" DROP COLUMN IF EXISTS search_vector',
+    'DROP INDEX IF EXISTS "resumeanalyzer".idx_achievements_search',
+    'ALTER TABLE "resumeanalyzer"."achievements" DROP COLUMN IF EXISTS search_vector',
+    'DROP INDEX IF EXISTS "resumeanalyzer".idx_applications_search',
+    'ALTER TABLE "resumeanalyzer"."applications" DROP COLUMN IF EXISTS search_vector',
+]
+
+SQLITE_SQL = [
+    # experiences
+    "CREATE VIRTUAL TABLE IF NOT EXISTS experiences_text USING fts5("
+    "role, experience_name, location, experience_explanation, content='experiences', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS experiences_text_insert AFTER INSERT ON experiences BEGIN "
+    "INSERT INTO experiences_text(rowid, role, experience_name, location, experience_explanation) "
+    "VALUES (new.rowid, new.role, new.experience_name, new.location, new.experience_explanation); END",
+    "CREATE TRIGGER IF NOT EXISTS experiences_text_delete AFTER DELETE ON experiences BEGIN "
+    "INSERT INTO experiences_text(experiences_text, rowid, role, experience_name, location, experience_explanation) "
+    "VALUES ('delete', old.rowid, old.role, old.experience_name, old.location, old.experience_explanation); END",
+    "CREATE TRIGGER IF NOT EXISTS experiences_text_update AFTER UPDATE ON experiences BEGIN "
+    "INSERT INTO experiences_text(experiences_text, rowid, role, experience_name, location, experience_explanation) "
+    "VALUES ('delete', old.rowid, old.role, old.experience_name, old.location, old.experience_explanation); "
+    "INSERT INTO experiences_text(rowid, role, experience_name, location, experience_explanation) "
+    "VALUES (new.rowid, new.role, new.experience_name, new.location, new.experience_explanation); END",
+    "INSERT INTO experiences_text(experiences_text) VALUES ('rebuild')",
+    # projects
+    "CREATE VIRTUAL TABLE IF NOT EXISTS projects_text USING fts5("
+    "project_name, project_info, content='projects', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS projects_text_insert AFTER INSERT ON projects BEGIN "
+    "INSERT INTO projects_text(rowid, project_name, project_info) "
+    "VALUES (new.rowid, new.project_name, new.project_info); END",
+    "CREATE TRIGGER IF NOT EXISTS projects_text_delete AFTER DELETE ON projects BEGIN "
+    "INSERT INTO projects_text(projects_text, rowid, project_name, project_info) "
+    "VALUES ('delete', old.rowid, old.project_name, old.project_info); END",
+    "CREATE TRIGGER IF NOT EXISTS projects_text_update AFTER UPDATE ON projects BEGIN "
+    "INSERT INTO projects_text(projects_text, rowid, project_name, project_info) "
+    "VALUES ('delete', old.rowid, old.project_name, old.project_info); "
+    "INSERT INTO projects_text(rowid, project_name, project_info) "
+    "VALUES (new.rowid, new.project_name, new.project_info); END",
+    "INSERT INTO projects_text(projects_text) VALUES ('rebuild')",
+    # achievements
+    "CREATE VIRTUAL TABLE IF NOT EXISTS achievements_text USING fts5("
+    "achievement_point, content='achievements', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS achievements_text_insert AFTER INSERT ON achievements BEGIN "
+    "INSERT INTO achievements_text(rowid, achievement_point) VALUES (new.rowid, new.achievement_point); END",
+    "CREATE TRIGGER IF NOT EXISTS achievements_text_delete AFTER DELETE ON achievements BEGIN "
+    "INSERT INTO achievements_text(achievements_text, rowid, achievement_point) "
+    "VALUES ('delete', old.rowid, old.achievement_point); END",
+    "CREATE TRIGGER IF NOT EXISTS achievements_text_update AFTER UPDATE ON achievements BEGIN "
+    "INSERT INTO achievements_text(achievements_text, rowid, achievement_point) "
+    "VALUES ('delete', old.rowid, old.achievement_point); "
+    "INSERT INTO achievements_text(rowid, achievement_point) VALUES (new.rowid, new.achievement_point); END",
+    "INSERT INTO achievements_text(achievements_text) VALUES ('rebuild')",
+    # applications
+    "CREATE VIRTUAL TABLE IF NOT EXISTS applications_text USING fts5("
+    "job_name, company_name, notes, content='applications', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS applications_text_insert AFTER INSERT ON applications BEGIN "
+    "INSERT INTO applications_text(rowid, job_name, company_name, notes) "
+    "VALUES (new.rowid, new.job_name, new.company_name, new.notes); END",
+    "CREATE TRIGGER IF NOT EXISTS applications_text_delete AFTER DELETE ON applications BEGIN "
+    "INSERT INTO applications_text(applications_text, rowid, job_name, company_name, notes) "
+    "VALUES ('delete', old.rowid, old.job_name, old.company_name, old.notes); END",
+    "CREATE TRIGGER IF NOT EXISTS applications_text_update AFTER UPDATE ON applications BEGIN "
+    "INSERT INTO applications_text(applications_text, rowid, job_name, company_name, notes) "
+    "VALUES ('delete', old.rowid, old.job_name, old.company_name, old.notes); "
+    "INSERT INTO applications_text(rowid, job_name, company_name, notes) "
+    "VALUES (new.rowid, new.job_name, new.company_name, new.notes); END",
+    "INSERT INTO applications_text(applications_text) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS experiences_text_insert",
+    "DROP TRIGGER IF EXISTS experiences_text_delete",
+    "DROP TRIGGER IF EXISTS experiences_text_update",
+    "DROP TABLE IF EXISTS experiences_text",
+    "DROP TRIGGER IF EXISTS projects_text_insert",
+    "DROP TRIGGER IF EXISTS projects_text_delete",
+    "DROP TRIGGER IF EXISTS projects_text_update",
+    "DROP TABLE IF EXISTS projects_text",
+    "DROP TRIGGER IF EXISTS achievements_text_insert",
+    "DROP TRIGGER IF EXISTS achievements_text_delete",
+    "DROP TRIGGER IF EXISTS achievements_text_update",
+    "DROP TABLE IF EXISTS achievements_text",
+    "DROP TRIGGER IF EXISTS applications_text_insert",
+    "DROP TRIGGER IF EXISTS applications_text_delete",
+    "DROP TRIGGER IF EXISTS applications_text_update",
+    "DROP TABLE IF EXISTS applications_text",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BackendApp', '0005_application_search'),
+    ]
+
+    operations = [
+        RunSQLFor('postgresql', POSTGRES_SQL, POSTGRES_REVERSE_SQL),
+        RunSQLFor('sqlite', SQLITE_SQL, SQLITE_REVERSE_SQL),
+    ]
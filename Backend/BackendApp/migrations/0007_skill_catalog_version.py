@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:04
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BackendApp', '0006_profile_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillCatalogVersion',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('stamp', models.UUIDField(default=uuid.uuid4)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Skill Catalog Version',
+                'verbose_name_plural': 'Skill Catalog Version',
+                'db_table': '"resumeanalyzer"."skill_catalog_version"',
+            },
+        ),
+    ]
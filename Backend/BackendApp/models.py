@@ -1,5 +1,7 @@
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.backends.ddl_references import Statement
 from django.core.validators import RegexValidator, URLValidator
 from django.core.exceptions import ValidationError
 import uuid
@@ -31,6 +33,26 @@ def validate_status(value):
         raise ValidationError(f'Status must be one of: {", ".join(valid_statuses)}')
 
 
+# ─── Indexes ──────────────────────────────────────────────────────────────────
+
+class PostgresGinIndex(GinIndex):
+    """
+    GIN index created on PostgreSQL only. SQLite, used for local runs and
+    tests, has no GIN and gets an empty statement; it searches through the
+    FTS5 tables its migrations create instead.
+    """
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        if schema_editor.connection.vendor != 'postgresql':
+            return Statement('')
+        return super().create_sql(model, schema_editor, using, **kwargs)
+
+    def remove_sql(self, model, schema_editor, **kwargs):
+        if schema_editor.connection.vendor != 'postgresql':
+            return Statement('')
+        return super().remove_sql(model, schema_editor, **kwargs)
+
+
 # ─── Models ───────────────────────────────────────────────────────────────────
 
 class ApplicantBasicInfo(models.Model):
@@ -254,6 +276,7 @@ class Applications(models.Model):
     resume_file_path = models.CharField(max_length=500)
     status = models.CharField(max_length=50, choices=STATUS_CHOICES, default='Applied', validators=[validate_status])
     notes = models.TextField(blank=True, null=True)
+    job_description = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -261,10 +284,63 @@ class Applications(models.Model):
         db_table = '"resumeanalyzer"."applications"'
         verbose_name = 'Application'
         verbose_name_plural = 'Applications'
+        # One (user, sort key, id) index per applications sortBy, for keyset pagination
         indexes = [
-            models.Index(fields=['user', 'status'], name='idx_applications_user_status'),
-            models.Index(fields=['user', 'company_name'], name='idx_applications_user_company'),
+            models.Index(fields=['user', 'created_at', 'id'], name='idx_applications_user_created'),
+            models.Index(fields=['user', 'job_name', 'id'], name='idx_applications_user_job'),
+            models.Index(fields=['user', 'status', 'id'], name='idx_applications_user_status'),
+            models.Index(fields=['user', 'company_name', 'id'], name='idx_applications_user_company'),
+            # Substring search (application_search); btree_gin lets user_id lead
+            PostgresGinIndex('user', OpClass('company_name', name='gin_trgm_ops'), name='idx_applications_company_trgm'),
+            PostgresGinIndex('user', OpClass('job_name', name='gin_trgm_ops'), name='idx_applications_job_trgm'),
+            PostgresGinIndex('user', OpClass('notes', name='gin_trgm_ops'), name='idx_applications_notes_trgm'),
         ]
 
     def __str__(self):
         return f"{self.job_name} at {self.company_name} — {self.status}"
+
+
+class ApplicationStats(models.Model):
+    """
+    A user's application statistics document, recomputed lazily. Application
+    writes bump `version`; a read that finds `computed_version` behind it
+    recomputes the document.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='application_stats',
+    )
+    document = models.JSONField(default=dict)
+    version = models.IntegerField(default=1)
+    computed_version = models.IntegerField(default=0)
+    refreshing_until = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = '"resumeanalyzer"."application_stats"'
+        verbose_name = 'Application Statistics'
+        verbose_name_plural = 'Application Statistics'
+
+    def __str__(self):
+        return f"{self.user_id} — v{self.computed_version}/{self.version}"
+
+
+class SkillCatalogVersion(models.Model):
+    """
+    Stamp of the global skills catalog, replaced after every catalog write.
+    Workers keep the catalog indexed in memory and rebuild it when the stamp
+    differs from the one they built it at.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    stamp = models.UUIDField(default=uuid.uuid4)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = '"resumeanalyzer"."skill_catalog_version"'
+        verbose_name = 'Skill Catalog Version'
+        verbose_name_plural = 'Skill Catalog Version'
+
+    def __str__(self):
+        return str(self.stamp)
@@ -0,0 +1,30 @@
+"""Migration operations shared by BackendApp's migrations."""
+from django.db import migrations
+
+
+class RunSQLFor(migrations.RunSQL):
+    """
+    RunSQL that runs only on databases of one vendor ('postgresql' or
+    'sqlite'), for DDL Django has no operation for. The statements are
+    literals in the migration, so what a migration creates never depends on
+    the code of the day it runs.
+    """
+
+    def __init__(self, vendor, sql, reverse_sql=None, **kwargs):
+        self.vendor = vendor
+        super().__init__(sql, reverse_sql, **kwargs)
+
+    def deconstruct(self):
+        name, args, kwargs = super().deconstruct()
+        return name, args, {'vendor': self.vendor, **kwargs}
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == self.vendor:
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == self.vendor:
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+    def describe(self):
+        return f'Raw SQL operation on {self.vendor}'
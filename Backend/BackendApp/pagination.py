@@ -0,0 +1,97 @@
+"""
+Keyset (cursor) pagination.
+
+A page is read as "the next `limit` rows after this (sort value, id)",
+written as the row-value comparison `(sort, id) > (%s, %s)`, which the
+(user, sort field, id) indexes answer as one range scan without reading the
+rows before it, unlike OFFSET. PostgreSQL does not turn the equivalent
+`sort > v OR (sort = v AND id > i)` into a range scan. Cursors are opaque base64 tokens. Each one is
+bound to the sort it was issued for.
+"""
+import base64
+import binascii
+import json
+import uuid
+
+from django.db import connections
+from django.db.models import BooleanField, DateTimeField
+from django.db.models.expressions import RawSQL
+from django.utils.dateparse import parse_datetime
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode(sort_field, descending, direction, row):
+    value = getattr(row, sort_field)
+    payload = {
+        "s": sort_field,
+        "o": "desc" if descending else "asc",
+        "d": direction,
+        "v": value.isoformat() if hasattr(value, 'isoformat') else value,
+        "id": str(row.pk),
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode(cursor, model, sort_field, descending):
+    """(direction, sort value, id) of a cursor issued for this sort."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if payload["s"] != sort_field or payload["o"] != ("desc" if descending else "asc"):
+            raise InvalidCursor("Cursor was issued for a different sort")
+        if payload["d"] not in ('next', 'prev'):
+            raise InvalidCursor("Invalid cursor")
+        value = payload["v"]
+        if isinstance(model._meta.get_field(sort_field), DateTimeField):
+            value = parse_datetime(value)
+            if value is None:
+                raise InvalidCursor("Invalid cursor")
+        return payload["d"], value, uuid.UUID(payload["id"])
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        if isinstance(e, InvalidCursor):
+            raise
+        raise InvalidCursor("Invalid cursor") from e
+
+
+def _after(qs, sort_field, value, pk, ascending):
+    """Rows of `qs` after (value, pk) in (sort_field, pk) order, ascending or not."""
+    connection = connections[qs.db]
+    opts = qs.model._meta
+    table = connection.ops.quote_name(opts.db_table)
+    field = opts.get_field(sort_field)
+    columns = ', '.join(f'{table}.{connection.ops.quote_name(f.column)}' for f in (field, opts.pk))
+    params = [field.get_db_prep_value(value, connection), opts.pk.get_db_prep_value(pk, connection)]
+    return qs.filter(
+        RawSQL(f'({columns}) {">" if ascending else "<"} (%s, %s)', params, output_field=BooleanField())
+    )
+
+
+def paginate(qs, sort_field, descending, cursor, limit):
+    """
+    One page of `qs` ordered by (sort_field, pk) as (rows, next cursor, prev
+    cursor). An empty cursor is the first page. Cursors are None at either end.
+    """
+    direction, value, pk = decode(cursor, qs.model, sort_field, descending) if cursor else ('next', None, None)
+    # Walking backwards reads the reversed order and flips the page afterwards
+    backwards = direction == 'prev'
+    ascending = descending == backwards
+    if value is not None:
+        qs = _after(qs, sort_field, value, pk, ascending)
+    sign = '' if ascending else '-'
+    rows = list(qs.order_by(f'{sign}{sort_field}', f'{sign}pk')[:limit + 1])
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if backwards:
+        rows.reverse()
+    if not rows:
+        return rows, None, None
+
+    has_next = more if not backwards else True
+    has_prev = more if backwards else value is not None
+    return (
+        rows,
+        encode(sort_field, descending, 'next', rows[-1]) if has_next else None,
+        encode(sort_field, descending, 'prev', rows[0]) if has_prev else None,
+    )
@@ -0,0 +1,393 @@
+"""
+Mixed create/update/delete operations on the profile sections, applied in
+one transaction with set-based SQL.
+
+Every operation is validated before anything is written. Rows are then
+changed with one bulk statement per section and kind of change, so saving
+an edited section costs a constant number of queries however many rows it has.
+`sync` builds such a batch by diffing a whole desired profile against the
+stored one, so unchanged rows cost no writes.
+"""
+import uuid
+from collections import defaultdict
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from AnalyzerApp import skill_cooccurrence, profile_index
+from .models import ApplicantBasicInfo, Academics, Achievements, Skills, UserSkills, Projects, ProjectSkills, Experiences
+
+BASIC_FIELDS = {
+    'fullName': 'full_name',
+    'phoneNumber': 'phone_number',
+    'email': 'email',
+    'linkedinUrl': 'linkedin_url',
+    'githubUrl': 'github_url',
+    'address': 'address',
+}
+
+# section -> (model, {request key: model field})
+SECTIONS = {
+    'academics': (Academics, {
+        'collegeName': 'college_name',
+        'graduationDate': 'graduation_date',
+        'course': 'course',
+        'displayOrder': 'display_order',
+    }),
+    'achievements': (Achievements, {
+        'achievementPoint': 'achievement_point',
+        'displayOrder': 'display_order',
+    }),
+    'projects': (Projects, {
+        'projectName': 'project_name',
+        'projectInfo': 'project_info',
+        'displayOrder': 'display_order',
+    }),
+    'experiences': (Experiences, {
+        'experienceName': 'experience_name',
+        'startDate': 'start_date',
+        'endDate': 'end_date',
+        'role': 'role',
+        'location': 'location',
+        'experienceExplanation': 'experience_explanation',
+        'displayOrder': 'display_order',
+    }),
+}
+
+ROW_ACTIONS = ('create', 'update', 'delete')
+SKILL_ACTIONS = ('add', 'remove')
+
+MAX_OPERATIONS = 500
+
+
+class BatchError(Exception):
+    """Rejected batch; `details` maps operation indexes to their errors."""
+
+    def __init__(self, code, message, details=None, status=400):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.details = details
+        self.status = status
+
+
+def _uuid(value):
+    try:
+        return uuid.UUID(str(value))
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def _parse(operations):
+    """Shape checks that need no database access."""
+    if not isinstance(operations, list) or not operations:
+        raise BatchError("VALIDATION_ERROR", "operations must be a non-empty list")
+    if len(operations) > MAX_OPERATIONS:
+        raise BatchError("VALIDATION_ERROR", f"At most {MAX_OPERATIONS} operations per batch")
+
+    errors = {}
+    for i, op in enumerate(operations):
+        if not isinstance(op, dict):
+            errors[i] = "Operation must be an object"
+            continue
+        section, action = op.get('section'), op.get('action')
+        if section == 'skills':
+            if action not in SKILL_ACTIONS:
+                errors[i] = f"Invalid action: {action}. Use add or remove"
+            elif not isinstance(op.get('skillIds'), list) or any(_uuid(s) is None for s in op['skillIds']):
+                errors[i] = "skillIds must be a list of skill IDs"
+        elif section in SECTIONS:
+            if action not in ROW_ACTIONS:
+                errors[i] = f"Invalid action: {action}. Use create, update or delete"
+            elif action != 'create' and _uuid(op.get('id')) is None:
+                errors[i] = f"A valid id is required for {action}"
+            elif 'skillIds' in op and (
+                section != 'projects' or not isinstance(op['skillIds'], list)
+                or any(_uuid(s) is None for s in op['skillIds'])
+            ):
+                errors[i] = "skillIds must be a list of skill IDs and is only accepted for projects"
+        else:
+            errors[i] = f"Invalid section: {section}. Use {', '.join(SECTIONS)} or skills"
+    if errors:
+        raise BatchError("VALIDATION_ERROR", "Input validation failed", errors)
+
+
+def apply(user, operations, loaded=None):
+    """
+    Validate and apply a batch. Returns one result per operation:
+    {"index", "section", "action", "id"} (`id` is None for skill operations).
+    Raises BatchError without writing anything when any operation is invalid.
+    `loaded` ({section: {id: row}}) supplies rows the caller already fetched.
+    """
+    _parse(operations)
+    loaded = loaded or {}
+
+    # ── Load everything the batch refers to: one query per section ──
+    targets = defaultdict(set)
+    for op in operations:
+        if op['section'] in SECTIONS and op['action'] != 'create':
+            targets[op['section']].add(_uuid(op['id']))
+    existing = {
+        section: loaded[section] if section in loaded
+        else {row.id: row for row in model.objects.filter(user=user, id__in=targets[section])}
+        if targets[section] else {}
+        for section, (model, _) in SECTIONS.items()
+    }
+
+    skill_ids = {_uuid(s) for op in operations for s in op.get('skillIds', [])}
+    known_skills = set(Skills.objects.filter(id__in=skill_ids).values_list('id', flat=True)) if skill_ids else set()
+    next_order = {}
+
+    # ── Build and validate every row before writing ──
+    errors = {}
+    creates = defaultdict(list)
+    updates = defaultdict(dict)
+    deletes = defaultdict(set)
+    changed_fields = defaultdict(set)
+    project_links = {}
+    skills_added, skills_removed = set(), set()
+    results = []
+    for i, op in enumerate(operations):
+        section, action = op['section'], op['action']
+        result = {"index": i, "section": section, "action": action, "id": None}
+        results.append(result)
+
+        if section == 'skills':
+            wanted = {_uuid(s) for s in op['skillIds']} & known_skills
+            if action == 'add':
+                skills_added |= wanted
+                skills_removed -= wanted
+            else:
+                skills_removed |= wanted
+                skills_added -= wanted
+            continue
+
+        model, fields = SECTIONS[section]
+        if action == 'create':
+            row = model(user=user)
+            if 'displayOrder' not in op:
+                if section not in next_order:
+                    next_order[section] = model.objects.filter(user=user).count()
+                row.display_order = next_order[section]
+                next_order[section] += 1
+            creates[section].append(row)
+        else:
+            pk = _uuid(op['id'])
+            row = updates[section].get(pk) or existing[section].get(pk)
+            if row is None or pk in deletes[section]:
+                errors[i] = f"{model._meta.verbose_name} not found"
+                continue
+            if action == 'delete':
+                deletes[section].add(pk)
+                updates[section].pop(pk, None)
+                result["id"] = str(pk)
+                continue
+            updates[section][pk] = row
+
+        for key, attr in fields.items():
+            if key in op:
+                setattr(row, attr, op[key])
+                changed_fields[section].add(attr)
+        try:
+            row.full_clean(exclude=['user'], validate_unique=False)
+        except ValidationError as e:
+            errors[i] = e.message_dict
+        result["id"] = str(row.id)
+        if 'skillIds' in op:
+            project_links[row.id] = {_uuid(s) for s in op['skillIds']} & known_skills
+
+    if errors:
+        raise BatchError("VALIDATION_ERROR", "Input validation failed", errors)
+    for pk in deletes['projects']:
+        project_links.pop(pk, None)
+
+    # ── Apply: one statement per section and kind of change ──
+    now = timezone.now()
+    with transaction.atomic():
+        for section, pks in deletes.items():
+            if pks:
+                SECTIONS[section][0].objects.filter(user=user, id__in=pks).delete()
+        for section, rows in creates.items():
+            SECTIONS[section][0].objects.bulk_create(rows)
+        for section, rows in updates.items():
+            if rows and changed_fields[section]:
+                for row in rows.values():
+                    row.updated_at = now
+                SECTIONS[section][0].objects.bulk_update(
+                    list(rows.values()), sorted(changed_fields[section] | {'updated_at'}),
+                )
+
+        if project_links:
+            ProjectSkills.objects.filter(project_id__in=list(project_links)).delete()
+            ProjectSkills.objects.bulk_create(
+                [ProjectSkills(project_id=p, skill_id=s) for p, skills in project_links.items() for s in skills]
+            )
+        if skills_removed:
+            UserSkills.objects.filter(user=user, skill_id__in=skills_removed).delete()
+        if skills_added:
+            have = set(UserSkills.objects.filter(user=user, skill_id__in=skills_added).values_list('skill_id', flat=True))
+            added = UserSkills.objects.bulk_create(
+                [UserSkills(user=user, skill_id=s) for s in skills_added - have], ignore_conflicts=True,
+            )
+            for us in added:
+                profile_index.schedule_refresh('skill', us.id)
+            if added:
+                skill_cooccurrence.schedule_refresh('user', user.id)
+
+        # Bulk writes skip the signals that keep the analyzer indexes in sync
+        for section, model in (('experiences', Experiences), ('projects', Projects), ('achievements', Achievements)):
+            indexed = set(profile_index.INDEXED_FIELDS[model])
+            rows = list(creates[section])
+            if indexed & changed_fields[section]:
+                rows.extend(updates[section].values())
+            for row in rows:
+                profile_index.schedule_refresh(profile_index.SECTIONS[model], row.id)
+        for project_id in project_links:
+            skill_cooccurrence.schedule_refresh('project', project_id)
+            profile_index.schedule_refresh('project', project_id)
+
+    return results
+
+
+def _changed(row, fields, item):
+    """Request keys of `item` whose value differs from what `row` stores."""
+    changed = []
+    for key, attr in fields.items():
+        if key not in item:
+            continue
+        try:
+            value = row._meta.get_field(attr).to_python(item[key])
+        except ValidationError:
+            changed.append(key)
+            continue
+        if value != getattr(row, attr):
+            changed.append(key)
+    return changed
+
+
+def _skill_ids(value):
+    """Skill IDs from a list of IDs or of skill objects, as the document returns them."""
+    return [s.get('id') if isinstance(s, dict) else s for s in value]
+
+
+def _diff_section(user, section, items, operations, where):
+    """Append the operations that turn the stored rows of `section` into `items`; returns rows it loaded."""
+    model, fields = SECTIONS[section]
+    current = {row.id: row for row in model.objects.filter(user=user)}
+    links = defaultdict(set)
+    if section == 'projects':
+        for project_id, skill_id in ProjectSkills.objects.filter(project__user=user).values_list('project_id', 'skill_id'):
+            links[project_id].add(skill_id)
+
+    errors = {}
+    kept = set()
+    for i, item in enumerate(items):
+        label = f"{section}[{i}]"
+        if not isinstance(item, dict):
+            errors[label] = "Item must be an object"
+            continue
+        # List order is the display order unless the item says otherwise
+        item = {'displayOrder': i, **item}
+        skill_ids = None
+        if section == 'projects' and ('skills' in item or 'skillIds' in item):
+            skill_ids = _skill_ids(item.get('skillIds', item.get('skills')) or [])
+
+        row = current.get(_uuid(item['id'])) if item.get('id') else None
+        if item.get('id') and row is None:
+            errors[label] = f"{model._meta.verbose_name} not found"
+            continue
+        if row is None:
+            op = {key: item[key] for key in fields if key in item}
+            if skill_ids is not None:
+                op['skillIds'] = skill_ids
+            op.update(section=section, action='create')
+        else:
+            kept.add(row.id)
+            op = {key: item[key] for key in _changed(row, fields, item)}
+            if skill_ids is not None and {_uuid(s) for s in skill_ids} != links[row.id]:
+                op['skillIds'] = skill_ids
+            if not op:
+                continue
+            op.update(section=section, action='update', id=str(row.id))
+        operations.append(op)
+        where.append(label)
+
+    for pk in current.keys() - kept:
+        operations.append({'section': section, 'action': 'delete', 'id': str(pk)})
+        where.append(section)
+    return current, errors
+
+
+def sync(user, document):
+    """
+    Make the stored profile match `document`, which has the shape
+    complete_applicant_info returns. Each present section is read once and
+    diffed: listed rows without an id are created, changed rows are updated,
+    and rows that are not listed are deleted. Unchanged rows are not written.
+    Sections missing from the document are left as they are.
+    Returns the number of rows written.
+    """
+    if not isinstance(document, dict):
+        raise BatchError("VALIDATION_ERROR", "The profile must be an object")
+
+    errors = {}
+    basic = document.get('basicInformation')
+    info, basic_changed = None, []
+    if isinstance(basic, dict):
+        info = ApplicantBasicInfo.objects.filter(user=user).first()
+        if info is None:
+            info = ApplicantBasicInfo(user=user)
+            basic_changed = [key for key in BASIC_FIELDS if key in basic]
+        else:
+            basic_changed = _changed(info, BASIC_FIELDS, basic)
+        for key in basic_changed:
+            setattr(info, BASIC_FIELDS[key], basic[key])
+        if basic_changed:
+            try:
+                info.full_clean(exclude=['user'], validate_unique=False)
+            except ValidationError as e:
+                errors['basicInformation'] = e.message_dict
+    elif basic is not None:
+        errors['basicInformation'] = "Must be an object"
+
+    operations, where, loaded = [], [], {}
+    for section in SECTIONS:
+        if section not in document:
+            continue
+        if not isinstance(document[section], list):
+            errors[section] = "Must be a list"
+            continue
+        loaded[section], section_errors = _diff_section(user, section, document[section], operations, where)
+        errors.update(section_errors)
+
+    if isinstance(document.get('skills'), list):
+        wanted = {_uuid(s): s for s in _skill_ids(document['skills'])}
+        if None in wanted:
+            errors['skills'] = "Skills must be skill IDs or objects with an id"
+        else:
+            have = set(UserSkills.objects.filter(user=user).values_list('skill_id', flat=True))
+            for action, ids in (('add', wanted.keys() - have), ('remove', have - wanted.keys())):
+                if ids:
+                    operations.append({'section': 'skills', 'action': action, 'skillIds': [str(s) for s in ids]})
+                    where.append('skills')
+    elif 'skills' in document:
+        errors['skills'] = "Must be a list"
+
+    if errors:
+        raise BatchError("VALIDATION_ERROR", "Input validation failed", errors)
+
+    with transaction.atomic():
+        if operations:
+            try:
+                apply(user, operations, loaded)
+            except BatchError as e:
+                if isinstance(e.details, dict):
+                    e.details = {where[i]: detail for i, detail in e.details.items()}
+                raise
+        if basic_changed:
+            if info._state.adding:
+                info.save()
+            else:
+                info.save(update_fields=[BASIC_FIELDS[key] for key in basic_changed] + ['updated_at'])
+    return len(operations) + bool(basic_changed)
@@ -0,0 +1,163 @@
+"""
+Full-text search across a user's experiences, projects, achievements and
+applications.
+
+On PostgreSQL each section's table carries a generated `search_vector`
+tsvector column. Title columns are weighted above the body. A GIN index on
+(user_id, search_vector) serves it, and PostgreSQL keeps the column current
+on every write. On SQLite each table has an FTS5 table kept in sync by
+triggers (see sqlite_fts). A search is one statement: the sections are
+matched and ranked together, and snippets are built only for the rows
+returned.
+
+Migration 0006 creates the columns, indexes, FTS tables and triggers from
+frozen statements; SECTIONS must stay in step with them. A later AlterField
+on an indexed column must drop and recreate `search_vector` (PostgreSQL
+cannot alter a column a generated column reads) or the FTS table and its
+triggers (SQLite rebuilds the table), as that migration's header explains.
+"""
+import re
+import uuid
+
+from django.db import connection
+
+from .models import Experiences, Projects, Achievements, Applications
+from . import sqlite_fts
+
+# section -> (model, title columns, body columns); title columns rank higher
+SECTIONS = {
+    'experiences': (Experiences, ('role', 'experience_name'), ('location', 'experience_explanation')),
+    'projects': (Projects, ('project_name',), ('project_info',)),
+    'achievements': (Achievements, (), ('achievement_point',)),
+    'applications': (Applications, ('job_name', 'company_name'), ('notes',)),
+}
+
+# Highlight markers the database wraps matches in; turned into offsets here
+START, STOP = '\x02', '\x03'
+TITLE_SEPARATOR = '\x1f'
+
+MAX_LIMIT = 100
+
+
+class SearchUnavailable(Exception):
+    pass
+
+
+def _text(columns, alias=''):
+    prefix = f'{alias}.' if alias else ''
+    return " || ' ' || ".join(f"COALESCE({prefix}{c}, '')" for c in columns) or "''"
+
+
+def _title(columns, alias):
+    return " || %s || ".join(f"COALESCE({alias}.{c}, '')" for c in columns) or "''"
+
+
+class _Postgres:
+    HEADLINE_OPTIONS = f'StartSel={START}, StopSel={STOP}, MaxWords=24, MinWords=8, MaxFragments=2, FragmentDelimiter=" … "'
+
+    def _names(self, model):
+        table = connection.ops.quote_name(model._meta.db_table)
+        schema = model._meta.db_table.rsplit('.', 1)[0] + '.' if '.' in model._meta.db_table else ''
+        return table, schema, f'idx_{sqlite_fts.table_name(model)}_search'
+
+    def available(self):
+        return True
+
+    def statement(self, query, user_id, sections, limit):
+        parts, params = [], []
+        for section in sections:
+            model, title, body = SECTIONS[section]
+            table, _, _ = self._names(model)
+            parts.append(
+                f"SELECT %s::text AS section, t.id::text AS id, {_title(title, 't')} AS title, "
+                f"{_text(title + body, 't')} AS body, "
+                f"ts_rank_cd(t.search_vector, websearch_to_tsquery('english', %s), 32) AS rank "
+                f"FROM {table} t WHERE t.user_id = %s AND t.search_vector @@ websearch_to_tsquery('english', %s)"
+            )
+            params += [section] + [TITLE_SEPARATOR] * max(len(title) - 1, 0) + [query, user_id, query]
+        sql = (
+            f"SELECT section, id, title, ts_headline('english', body, websearch_to_tsquery('english', %s), %s), rank "
+            f"FROM ({' UNION ALL '.join(parts)} ORDER BY rank DESC LIMIT %s) hits ORDER BY rank DESC"
+        )
+        return sql, [query, self.HEADLINE_OPTIONS] + params + [limit]
+
+
+class _SQLite:
+    _installed = None
+
+    def _names(self, model):
+        table = sqlite_fts.table_name(model)
+        return table, f'{table}_text'
+
+    def available(self):
+        # Checked once per process; a table rebuild drops the sync triggers
+        if self._installed is None:
+            _SQLite._installed = all(sqlite_fts.installed(self._names(model)[1]) for model, _, _ in SECTIONS.values())
+        return self._installed
+
+    def statement(self, query, user_id, sections, limit):
+        match = ' '.join(f'"{token}"' for token in re.findall(r'\w+', query))
+        parts, params = [], []
+        for section in sections:
+            model, title, body = SECTIONS[section]
+            table, fts = self._names(model)
+            weights = ', '.join(['5.0'] * len(title) + ['1.0'] * len(body))
+            parts.append(
+                f"SELECT '{section}' AS section, t.id AS id, {_title(title, 't')} AS title, "
+                f"snippet({fts}, -1, char(2), char(3), ' … ', 16) AS snippet, -bm25({fts}, {weights}) AS rank "
+                f"FROM {fts} JOIN {table} t ON t.rowid = {fts}.rowid WHERE {fts} MATCH %s AND t.user_id = %s"
+            )
+            params += [TITLE_SEPARATOR] * max(len(title) - 1, 0) + [match, user_id]
+        sql = f"SELECT * FROM ({' UNION ALL '.join(parts)}) ORDER BY rank DESC LIMIT %s"
+        return sql, params + [limit]
+
+
+def _dialect(vendor):
+    return {'postgresql': _Postgres, 'sqlite': _SQLite}.get(vendor, lambda: None)()
+
+
+def highlights(snippet):
+    """Split a marked snippet into its plain text and [start, end) offsets of the matches."""
+    text, spans, start = [], [], None
+    length = 0
+    for piece in re.split(f'([{START}{STOP}])', snippet or ''):
+        if piece == START:
+            start = length
+        elif piece == STOP:
+            if start is not None:
+                spans.append([start, length])
+            start = None
+        else:
+            text.append(piece)
+            length += len(piece)
+    return ''.join(text), spans
+
+
+def search(user, query, sections=None, limit=20):
+    """
+    The user's best matching rows across `sections` (default: all), most
+    relevant first, as {"section", "id", "title", "snippet", "highlights",
+    "rank"}. Raises SearchUnavailable when the index is not installed.
+    """
+    dialect = _dialect(connection.vendor)
+    if dialect is None or not dialect.available():
+        raise SearchUnavailable("Search index is not installed; run migrations")
+    if not re.search(r'\w', query):
+        return []
+    sql, params = dialect.statement(query, user.pk, list(sections or SECTIONS), min(limit, MAX_LIMIT))
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    results = []
+    for section, pk, title, snippet, rank in rows:
+        text, spans = highlights(snippet)
+        results.append({
+            "section": section,
+            "id": str(uuid.UUID(str(pk))),
+            "title": ' — '.join(t for t in (title or '').split(TITLE_SEPARATOR) if t) or None,
+            "snippet": text,
+            "highlights": spans,
+            "rank": round(float(rank), 4),
+        })
+    return results
@@ -0,0 +1,23 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Applications, Skills
+from . import application_stats, skill_catalog
+
+
+# ─── Application statistics ───────────────────────────────────────────────────
+# queryset.update() and bulk writes skip these; such paths must call
+# application_stats.invalidate() for the users they touch.
+
+@receiver([post_save, post_delete], sender=Applications)
+def invalidate_application_stats(sender, instance, **kwargs):
+    application_stats.invalidate(instance.user_id)
+
+
+# ─── Skills catalog ───────────────────────────────────────────────────────────
+# Workers rebuild their in-memory catalog index when the stamp changes; paths
+# that bypass these (queryset.update(), bulk_create) call skill_catalog.invalidate().
+
+@receiver([post_save, post_delete], sender=Skills)
+def invalidate_skill_catalog(sender, instance, **kwargs):
+    skill_catalog.invalidate()
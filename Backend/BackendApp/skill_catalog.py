@@ -0,0 +1,120 @@
+"""
+Per-worker index of the global skills catalog.
+
+Each worker keeps the catalog in memory, sorted by name, with sorted arrays
+of lower-cased names and word suffixes ("native" for "React Native") per
+category, so a prefix lookup is a bisect. The full listing is rendered once
+as JSON and gzip, with its ETag. A request reads only the catalog's stamp
+(one row) and the index is rebuilt when the stamp differs from the one it
+was built at. Catalog writes replace the stamp once their transaction
+commits.
+"""
+import bisect
+import gzip
+import re
+import threading
+import uuid
+
+from rest_framework.renderers import JSONRenderer
+
+from AnalyzerApp import commit_batches
+from .models import Skills, SkillCatalogVersion
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+# Where a word starts inside a skill name, after the first
+_WORD = re.compile(r'[^\w#+]+(?=[\w#+])')
+
+
+class _Keys:
+    """Prefix lookup over a subset of the catalog, by whole name and by later words."""
+
+    def __init__(self, skills, positions):
+        self.positions = positions
+        self.names = [skills[p]['skillName'].casefold() for p in positions]
+        words = sorted(
+            (name[match.end():], p)
+            for name, p in zip(self.names, positions)
+            for match in _WORD.finditer(name)
+        )
+        self.words = [word for word, _ in words]
+        self.word_positions = [p for _, p in words]
+
+    def match(self, prefix, limit):
+        """Positions of up to `limit` skills whose name, then a later word, starts with `prefix`."""
+        found = []
+        i = bisect.bisect_left(self.names, prefix)
+        while i < len(self.names) and len(found) < limit and self.names[i].startswith(prefix):
+            found.append(self.positions[i])
+            i += 1
+        seen = set(found)
+        i = bisect.bisect_left(self.words, prefix)
+        while i < len(self.words) and len(found) < limit and self.words[i].startswith(prefix):
+            position = self.word_positions[i]
+            if position not in seen:
+                seen.add(position)
+                found.append(position)
+            i += 1
+        return found
+
+
+class Index:
+    def __init__(self, stamp, skills):
+        self.stamp = stamp
+        self.skills = sorted(skills, key=lambda s: (s['skillName'].casefold(), s['id']))
+        by_category = {}
+        for position, skill in enumerate(self.skills):
+            by_category.setdefault(skill['category'], []).append(position)
+        self.keys = _Keys(self.skills, list(range(len(self.skills))))
+        self.category_keys = {category: _Keys(self.skills, positions) for category, positions in by_category.items()}
+
+        self.listing = JSONRenderer().render({"success": True, "data": self.skills})
+        self.listing_gzip = gzip.compress(self.listing)
+        self.etag = f'W/"{stamp or "initial"}"'
+
+    def complete(self, prefix, category=None, limit=DEFAULT_LIMIT):
+        """Autocomplete: whole-name prefix matches in name order, then later-word matches."""
+        keys = self.keys if category is None else self.category_keys.get(category)
+        if keys is None:
+            return []
+        return [self.skills[p] for p in keys.match(prefix.casefold(), limit)]
+
+    def filter(self, category=None, search=None):
+        """Skills in `category` whose name contains `search` (case-insensitive)."""
+        needle = search.casefold() if search else None
+        return [
+            s for s in self.skills
+            if (not category or s['category'] == category) and (not needle or needle in s['skillName'].casefold())
+        ]
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def current():
+    """This worker's index, rebuilt first when the catalog changed since it was built."""
+    global _index
+    # Read before the rows: a write landing in between only costs another rebuild
+    stamp = SkillCatalogVersion.objects.order_by('pk').values_list('stamp', flat=True).first()
+    index = _index
+    if index is not None and index.stamp == stamp:
+        return index
+    with _lock:
+        if _index is None or _index.stamp != stamp:
+            _index = Index(stamp, [
+                {"id": str(pk), "skillName": name, "category": category}
+                for pk, name, category in Skills.objects.values_list('id', 'skill_name', 'category')
+            ])
+        return _index
+
+
+def _invalidate(_items=None):
+    if not SkillCatalogVersion.objects.update(stamp=uuid.uuid4()):
+        SkillCatalogVersion.objects.create()
+
+
+def invalidate():
+    """Replace the catalog stamp once the current transaction commits."""
+    commit_batches.add(_invalidate, 'skills')
@@ -0,0 +1,29 @@
+"""
+FTS5 tables kept in sync with a regular SQLite table.
+
+The FTS table uses the source table as external content and is keyed by
+its rowid. Insert, update and delete triggers named `<fts>_<event>` mirror
+every write, so the index is maintained incrementally. Migrations create
+both from frozen statements and finish with a 'rebuild', which indexes the
+existing rows. Django rebuilds a SQLite table on AlterField, dropping its
+triggers and renumbering its rowids, so such a migration must recreate the
+FTS table and triggers as well.
+"""
+from django.db import connection
+
+TRIGGERS = ('insert', 'delete', 'update')
+
+
+def table_name(model):
+    """The model's table without a schema prefix; SQLite tables have none."""
+    return model._meta.db_table.split('.')[-1].strip('"')
+
+
+def installed(fts):
+    """Whether `fts` and all its sync triggers exist; a table rebuild leaves the FTS table without them."""
+    names = [fts] + [f'{fts}_{trigger}' for trigger in TRIGGERS]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT count(*) FROM sqlite_master WHERE name IN ({', '.join(['%s'] * len(names))})", names,
+        )
+        return cursor.fetchone()[0] == len(names)
@@ -1,3 +1,660 @@
-from django.test import TestCase
+import gzip
+import itertools
+import json
+import math
+from contextlib import contextmanager
+from importlib import import_module
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresWrapper
+from django.db.models.query import QuerySet
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import (
+    ApplicantBasicInfo, Academics, Achievements, Skills,
+    UserSkills, Projects, ProjectSkills, Experiences, Applications, ApplicationStats, PostgresGinIndex,
+)
+from . import application_search, application_stats, pagination, profile_search, skill_catalog, sqlite_fts
+from AnalyzerApp.models import ProfileTerm, SkillCooccurrence
+
+SMALL = 2
+LARGE = 25
+
+_seq = itertools.count()
+
+
+def seed(rows):
+    """A user with `rows` entries in every section, plus `rows` catalog skills they do not have yet."""
+    tag = f'user{next(_seq)}'
+    user = get_user_model().objects.create(username=tag, email=f'{tag}@example.com')
+    ApplicantBasicInfo.objects.create(user=user, full_name='Test User', phone_number='5550100', email=user.email)
+    skills = Skills.objects.bulk_create([
+        Skills(skill_name=f'{tag} skill {i}', category='Testing') for i in range(2 * rows)
+    ])
+    # bulk_create skips the catalog signals
+    skill_catalog._invalidate()
+    owned, spare = skills[:rows], skills[rows:]
+    Academics.objects.bulk_create([
+        Academics(user=user, college_name=f'College {i}', graduation_date='2020', course='CS', display_order=i)
+        for i in range(rows)
+    ])
+    Achievements.objects.bulk_create([
+        Achievements(user=user, achievement_point=f'Won contest {i}', display_order=i) for i in range(rows)
+    ])
+    UserSkills.objects.bulk_create([UserSkills(user=user, skill=s) for s in owned])
+    projects = Projects.objects.bulk_create([
+        Projects(user=user, project_name=f'Project {i}', project_info='Built a service', display_order=i)
+        for i in range(rows)
+    ])
+    ProjectSkills.objects.bulk_create([ProjectSkills(project=p, skill=s) for p in projects for s in owned[:3]])
+    Experiences.objects.bulk_create([
+        Experiences(
+            user=user, experience_name=f'Company {i}', start_date='2020', end_date='2021', role='Engineer',
+            location='Remote', experience_explanation='Built APIs', display_order=i,
+        )
+        for i in range(rows)
+    ])
+    Applications.objects.bulk_create([
+        Applications(
+            user=user, job_name=f'Job {i}', company_name=f'Company {i}', job_link='https://example.com/job',
+            resume_file_path=f'ResumeBlobs/placeholder_{i}.pdf', status='Applied',
+        )
+        for i in range(rows)
+    ])
+    return {
+        'user': user,
+        'owned': [str(s.id) for s in owned],
+        'spare': [str(s.id) for s in spare],
+        'projects': [str(p.id) for p in projects],
+        'application': str(Applications.objects.filter(user=user).first().id),
+    }
+
+
+def install_search_indexes():
+    # Databases built without migrations (--nomigrations) lack the search tables; run the
+    # migrations' SQLite statements before the class transaction opens so they are not rolled back
+    with connection.cursor() as cursor:
+        for name in ('0005_application_search', '0006_profile_search'):
+            for statement in import_module(f'BackendApp.migrations.{name}').SQLITE_SQL:
+                cursor.execute(statement)
+    # Checked once per process, as a server would right after migrating
+    for dialect in (application_search._SQLite, profile_search._SQLite):
+        dialect._installed = None
+        dialect().available()
+
+
+def orders(model, user):
+    return [
+        {'id': str(pk), 'displayOrder': i}
+        for i, pk in enumerate(reversed(model.objects.filter(user=user).values_list('id', flat=True)))
+    ]
+
+
+def batch(data):
+    """One of every batch operation, each touching every row it can."""
+    user = data['user']
+    ids = {model: [str(pk) for pk in model.objects.filter(user=user).values_list('id', flat=True)]
+           for model in (Academics, Achievements, Experiences)}
+    return [
+        *({'section': 'academics', 'action': 'update', 'id': pk, 'course': 'EE'} for pk in ids[Academics]),
+        *({'section': 'achievements', 'action': 'delete', 'id': pk} for pk in ids[Achievements]),
+        *({'section': 'experiences', 'action': 'update', 'id': pk, 'role': 'Lead'} for pk in ids[Experiences]),
+        *({'section': 'projects', 'action': 'update', 'id': pk, 'projectInfo': 'Rewritten', 'skillIds': data['spare']}
+          for pk in data['projects']),
+        *({'section': 'achievements', 'action': 'create', 'achievementPoint': f'Led hackathon team {i}'} for i in range(len(data['spare']))),
+        {'section': 'skills', 'action': 'add', 'skillIds': data['spare']},
+        {'section': 'skills', 'action': 'remove', 'skillIds': data['owned']},
+    ]
+
+
+def edited_profile(data):
+    """The current profile document with every row edited and reordered, one row per section dropped and one added."""
+    from .views import build_complete_applicant_info
+    doc = build_complete_applicant_info(data['user'])
+    doc['basicInformation']['address'] = 'Elsewhere'
+    for section, key in (('academics', 'course'), ('achievements', 'achievementPoint'),
+                         ('projects', 'projectInfo'), ('experiences', 'role')):
+        for row in doc[section]:
+            row[key] = f'Edited {row[key]}'
+            del row['displayOrder']  # list order applies
+        doc[section] = doc[section][1:] + [{**doc[section][0], key: 'Added', 'id': None}]
+    for project in doc['projects']:
+        project['skills'] = data['spare']
+    doc['skills'] = doc['skills'][1:] + data['spare'][:1]
+    return doc
+
+
+# (name, method, path, body builder) — every route in BackendApp/urls.py, and the
+# write actions that take lists, which must not issue a query per element
+CASES = [
+    ('basic_info', 'get', '/api/applicant-info/basic', None),
+    ('basic_info update', 'post', '/api/applicant-info/basic', lambda d: {'fullName': 'Renamed'}),
+    ('academics', 'get', '/api/applicant-info/academics', None),
+    ('academics reorder', 'post', '/api/applicant-info/academics',
+     lambda d: {'action': 'reorder', 'academicOrders': orders(Academics, d['user'])}),
+    ('achievements', 'get', '/api/applicant-info/achievements', None),
+    ('achievements reorder', 'post', '/api/applicant-info/achievements',
+     lambda d: {'action': 'reorder', 'achievementOrders': orders(Achievements, d['user'])}),
+    ('skills', 'get', '/api/skills?category=Testing&search=skill%201', None),
+    ('skills autocomplete', 'get', '/api/skills?prefix=user&category=Testing', None),
+    ('skills listing', 'get', '/api/skills', None),
+    ('user_skills', 'get', '/api/applicant-info/skills', None),
+    ('user_skills add', 'post', '/api/applicant-info/skills', lambda d: {'action': 'add', 'skillIds': d['spare']}),
+    ('user_skills remove', 'post', '/api/applicant-info/skills', lambda d: {'action': 'remove', 'skillIds': d['owned']}),
+    ('projects', 'get', '/api/applicant-info/projects', None),
+    ('projects create', 'post', '/api/applicant-info/projects',
+     lambda d: {'action': 'create', 'projectName': 'New', 'projectInfo': 'Info', 'skillIds': d['spare']}),
+    ('projects update', 'post', '/api/applicant-info/projects',
+     lambda d: {'action': 'update', 'id': d['projects'][0], 'skillIds': d['spare']}),
+    ('projects reorder', 'post', '/api/applicant-info/projects',
+     lambda d: {'action': 'reorder', 'projectOrders': orders(Projects, d['user'])}),
+    ('experiences', 'get', '/api/applicant-info/experiences', None),
+    ('experiences reorder', 'post', '/api/applicant-info/experiences',
+     lambda d: {'action': 'reorder', 'experienceOrders': orders(Experiences, d['user'])}),
+    ('profile_batch', 'post', '/api/applicant-info/batch', lambda d: {'operations': batch(d)}),
+    ('complete_applicant_info', 'get', '/api/applicant-info/complete', None),
+    ('complete_applicant_info put', 'put', '/api/applicant-info/complete', edited_profile),
+    ('applications', 'get', f'/api/applications?limit={LARGE}', None),
+    ('applications search', 'get', '/api/applications?q=company', None),
+    ('applications cursor', 'get', f'/api/applications?cursor=&limit={LARGE}&includeTotal=true', None),
+    ('application_stats', 'get', '/api/applications/stats', None),
+    ('search', 'get', '/api/search?q=built+contest', None),
+    ('resume_file', 'get', lambda d: f"/api/resume?id={d['application']}", None),
+]
+
+
+# bulk_create/bulk_update call sites whose rows the backend may split over several
+# statements (SQLite caps the parameters per statement). One such call counts as one
+# query; a call per row, or a write outside these sites, is counted per statement.
+BATCHED_BULK_WRITES = {ProjectSkills, ProfileTerm, SkillCooccurrence}
+
+
+@contextmanager
+def batched_bulk_writes(queries):
+    """Record (table, rows, statements, rows per statement) for bulk writes to BATCHED_BULK_WRITES."""
+    calls = []
+    sizes = []
+    operations = type(connection.ops)
+
+    def sized(original):
+        def bulk_batch_size(ops, fields, objs):
+            size = original(ops, fields, objs)
+            sizes.append(size)
+            return size
+        return bulk_batch_size
+
+    def recording(original):
+        def bulk_write(qs, objs, *args, **kwargs):
+            objs = list(objs)
+            sizes.clear()
+            start = len(queries.captured_queries)
+            result = original(qs, objs, *args, **kwargs)
+            if qs.model in BATCHED_BULK_WRITES and objs:
+                per_statement = max(sizes[-1], 1) if sizes else len(objs)
+                if kwargs.get('batch_size'):
+                    per_statement = min(per_statement, kwargs['batch_size'])
+                calls.append(
+                    (qs.model._meta.db_table, len(objs), len(queries.captured_queries) - start, per_statement),
+                )
+            return result
+        return bulk_write
+
+    with mock.patch.object(operations, 'bulk_batch_size', sized(operations.bulk_batch_size)), \
+            mock.patch.object(QuerySet, 'bulk_create', recording(QuerySet.bulk_create)), \
+            mock.patch.object(QuerySet, 'bulk_update', recording(QuerySet.bulk_update)):
+        yield calls
+
+
+@override_settings(QUERY_BUDGET_MODE='raise', ANALYZER_PREGENERATE=False, AUDIT_LOG_ENABLED=False)
+class QueryCountTests(TestCase):
+    """
+    Every endpoint runs the same number of queries for a user with a few rows
+    per section and one with many. A growing count is an N+1. Requests also
+    run under QueryBudgetMiddleware in raise mode, so QUERY_BUDGETS is checked.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        install_search_indexes()
+        super().setUpClass()
+
+    def count_queries(self, data, method, path, body):
+        client = APIClient()
+        client.force_authenticate(data['user'])
+        if callable(path):
+            path = path(data)
+        payload = body(data) if body else None
+        # Index refreshes run on commit; include them in the count
+        with CaptureQueriesContext(connection) as queries, batched_bulk_writes(queries) as bulk_writes, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = getattr(client, method)(path, payload, format='json') if payload else getattr(client, method)(path)
+        self.assertLess(response.status_code, 500, response.content)
+        for table, rows, statements, per_statement in bulk_writes:
+            # Split only where the backend's batch size requires it
+            self.assertEqual(statements, math.ceil(rows / per_statement), f'bulk write to {table}, {rows} rows')
+        return len(queries.captured_queries) - sum(w[2] for w in bulk_writes) + len(bulk_writes)
+
+    def assert_constant(self, cases):
+        for name, method, path, body in cases:
+            with self.subTest(name):
+                small = self.count_queries(seed(SMALL), method, path, body)
+                large = self.count_queries(seed(LARGE), method, path, body)
+                self.assertEqual(small, large, f'{name}: {small} queries at {SMALL} rows, {large} at {LARGE}')
+
+    def test_query_counts_do_not_grow_with_rows(self):
+        self.assert_constant(CASES)
+
+    @override_settings(APPLICANT_INFO_SQL_JSON=False)
+    def test_orm_complete_applicant_info_does_not_grow_with_rows(self):
+        self.assert_constant([c for c in CASES if c[0] == 'complete_applicant_info'])
+
+    def test_single_statement_complete_applicant_info(self):
+        data = seed(LARGE)
+        if connection.vendor in ('postgresql', 'sqlite'):
+            self.assertEqual(self.count_queries(data, 'get', '/api/applicant-info/complete', None), 1)
+
+    @override_settings(QUERY_BUDGETS={'projects': 1})
+    def test_budget_is_enforced(self):
+        from ResumeAnalyzer.middleware import QueryBudgetExceeded
+        data = seed(SMALL)
+        with self.assertRaises(QueryBudgetExceeded):
+            self.count_queries(data, 'get', '/api/applicant-info/projects', None)
+
+
+@override_settings(ANALYZER_PREGENERATE=False, AUDIT_LOG_ENABLED=False)
+class ProfileBatchTests(TestCase):
+    def post(self, data, operations):
+        client = APIClient()
+        client.force_authenticate(data['user'])
+        return client.post('/api/applicant-info/batch', {'operations': operations}, format='json')
+
+    def test_invalid_operation_rejects_the_whole_batch(self):
+        data = seed(SMALL)
+        other = seed(SMALL)
+        response = self.post(data, [
+            {'section': 'achievements', 'action': 'create', 'achievementPoint': 'Kept?'},
+            {'section': 'projects', 'action': 'delete', 'id': other['projects'][0]},
+            {'section': 'academics', 'action': 'create'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()['error']['details']), {'1', '2'})
+        self.assertEqual(Achievements.objects.filter(user=data['user']).count(), SMALL)
+        self.assertTrue(Projects.objects.filter(id=other['projects'][0]).exists())
+
+    def test_mixed_operations_are_applied(self):
+        data = seed(SMALL)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post(data, [
+                {'section': 'projects', 'action': 'create', 'projectName': 'Batch', 'projectInfo': 'Info',
+                 'skillIds': data['spare']},
+                {'section': 'projects', 'action': 'update', 'id': data['projects'][0], 'projectName': 'Renamed'},
+                {'section': 'projects', 'action': 'delete', 'id': data['projects'][1]},
+                {'section': 'skills', 'action': 'add', 'skillIds': data['spare']},
+            ])
+        self.assertEqual(response.status_code, 200, response.content)
+        created = Projects.objects.get(id=response.json()['data']['results'][0]['id'])
+        self.assertEqual(created.display_order, SMALL)
+        self.assertEqual(
+            {str(s) for s in created.project_skills.values_list('skill_id', flat=True)}, set(data['spare']),
+        )
+        self.assertEqual(Projects.objects.get(id=data['projects'][0]).project_name, 'Renamed')
+        self.assertFalse(Projects.objects.filter(id=data['projects'][1]).exists())
+        self.assertEqual(UserSkills.objects.filter(user=data['user']).count(), 2 * SMALL)
+
+
+def normalized(document):
+    """Skills added in one bulk insert share created_at, so compare them as sets."""
+    document['skills'] = sorted(document['skills'], key=lambda s: s['id'])
+    for project in document['projects']:
+        project['skills'] = sorted(project['skills'], key=lambda s: s['id'])
+    return document
+
+
+@override_settings(ANALYZER_PREGENERATE=False, AUDIT_LOG_ENABLED=False)
+class ProfileSyncTests(TestCase):
+    def put(self, data, document):
+        client = APIClient()
+        client.force_authenticate(data['user'])
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            response = client.put('/api/applicant-info/complete', document, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        writes = [q['sql'] for q in queries.captured_queries if q['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))]
+        return normalized(response.json()['data']), writes
+
+    def test_unchanged_profile_is_not_written(self):
+        from .views import build_complete_applicant_info
+        data = seed(LARGE)
+        document = build_complete_applicant_info(data['user'])
+        saved, writes = self.put(data, document)
+        self.assertEqual(writes, [])
+        self.assertEqual(saved, normalized(document))
+
+    def test_profile_is_brought_to_the_document(self):
+        from .views import build_complete_applicant_info
+        data = seed(SMALL)
+        saved, writes = self.put(data, edited_profile(data))
+        self.assertTrue(writes)
+        self.assertEqual(saved, normalized(build_complete_applicant_info(data['user'])))
+        self.assertEqual(saved['basicInformation']['address'], 'Elsewhere')
+        self.assertEqual([a['course'] for a in saved['academics']], ['Edited CS', 'Added'])
+        self.assertEqual([a['displayOrder'] for a in saved['academics']], [0, 1])
+        for project in saved['projects']:
+            self.assertEqual({s['id'] for s in project['skills']}, set(data['spare']))
+        self.assertEqual(len(saved['skills']), SMALL)
+
+
+@override_settings(ANALYZER_PREGENERATE=False, AUDIT_LOG_ENABLED=False)
+class ApplicationStatsTests(TestCase):
+    def get(self, data):
+        client = APIClient()
+        client.force_authenticate(data['user'])
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/applications/stats')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()['data'], len(queries)
+
+    def test_cached_row_is_read_until_applications_change(self):
+        data = seed(LARGE)
+        first, _ = self.get(data)
+        self.assertEqual(first, application_stats.compute(data['user']))
+        cached, queries = self.get(data)
+        self.assertEqual((cached, queries), (first, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Applications.objects.filter(user=data['user']).first().delete()
+            Applications.objects.create(
+                user=data['user'], job_name='New', company_name='Acme', job_link='https://example.com/job',
+                resume_file_path='ResumeBlobs/new.pdf', status='Interview',
+            )
+        updated, _ = self.get(data)
+        self.assertEqual(updated, application_stats.compute(data['user']))
+        self.assertEqual(updated['byStatus']['Interview'], 1)
+
+    def test_readers_serve_the_previous_document_while_another_recomputes(self):
+        data = seed(SMALL)
+        first, _ = self.get(data)
+        Applications.objects.filter(user=data['user']).update(status='Accepted')
+        application_stats._invalidate([data['user'].id])
+        ApplicationStats.objects.filter(user=data['user']).update(
+            refreshing_until=timezone.now() + application_stats.LEASE,
+        )
+        self.assertEqual(self.get(data)[0], first)
+
+        ApplicationStats.objects.filter(user=data['user']).update(refreshing_until=None)
+        self.assertEqual(self.get(data)[0]['byStatus']['Accepted'], SMALL)
+
+
+@override_settings(ANALYZER_PREGENERATE=False, AUDIT_LOG_ENABLED=False)
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.data = seed(LARGE)
+        self.client = APIClient()
+        self.client.force_authenticate(self.data['user'])
+        Applications.objects.filter(user=self.data['user'], job_name__endswith='3').update(status='Interview')
+
+    def get(self, **params):
+        response = self.client.get('/api/applications', params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()['data']
+
+    def test_cursor_pages_match_offset_order(self):
+        for sort_by in ('created_at', 'jobName', 'companyName', 'status'):
+            for order in ('asc', 'desc'):
+                with self.subTest(sortBy=sort_by, sortOrder=order):
+                    params = {'sortBy': sort_by, 'sortOrder': order, 'limit': 4}
+                    expected = [a['id'] for a in self.get(**{**params, 'limit': LARGE})['applications']]
+
+                    pages, cursor = [], ''
+                    while cursor is not None:
+                        page = self.get(**params, cursor=cursor)
+                        pages.append(page)
+                        cursor = page['nextCursor']
+                    self.assertEqual([a['id'] for p in pages for a in p['applications']], expected)
+                    self.assertIsNone(pages[0]['prevCursor'])
+
+                    # Walking back from the last page revisits the same pages
+                    back, cursor = [], pages[-1]['prevCursor']
+                    while cursor is not None:
+                        page = self.get(**params, cursor=cursor)
+                        back.append([a['id'] for a in page['applications']])
+                        cursor = page['prevCursor']
+                    self.assertEqual(back, [[a['id'] for a in p['applications']] for p in reversed(pages[:-1])])
+
+    def test_total_is_optional(self):
+        self.assertNotIn('total', self.get(cursor=''))
+        self.assertEqual(self.get(cursor='', includeTotal='true', status='Interview')['total'], 3)
+
+    def test_cursor_is_bound_to_its_sort(self):
+        cursor = self.get(cursor='', limit=2)['nextCursor']
+        for bad in (cursor, 'not-a-cursor'):
+            response = self.client.get('/api/applications', {'cursor': bad, 'sortBy': 'jobName'})
+            self.assertEqual(response.status_code, 400)
+
+    def test_cursor_is_a_row_value_comparison(self):
+        # Compiled for PostgreSQL without connecting: the one predicate its index range scan needs
+        postgres = PostgresWrapper({**connection.settings_dict, 'ENGINE': 'django.db.backends.postgresql'})
+        row = Applications.objects.filter(user=self.data['user']).first()
+        for ascending, op in ((True, '>'), (False, '<')):
+            qs = pagination._after(
+                Applications.objects.filter(user=self.data['user']), 'job_name', row.job_name, row.pk, ascending
+            )
+            sql, params = qs.query.get_compiler(connection=postgres).as_sql()
+            self.assertRegex(sql, rf'\(\S+\."job_name", \S+\."id"\) {op} \(%s, %s\)')
+            self.assertNotIn(' OR ', sql)
+            self.assertEqual(params[-2], row.job_name)
+
+
+@override_settings(ANALYZER_PREGENERATE=False, AUDIT_LOG_ENABLED=False)
+class ApplicationSearchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        install_search_indexes()
+        super().setUpClass()
+
+    def setUp(self):
+        self.data = seed(SMALL)
+        self.client = APIClient()
+        self.client.force_authenticate(self.data['user'])
+        for job_name, company_name, notes in [
+            ('Backend Engineer', 'Stripe', None),
+            ('Developer', 'Acme', 'Referred by a friend who used to work on payments at Stripes and loved it'),
+            ('Platform Engineer', 'Google', 'Onsite in Zurich'),
+        ]:
+            Applications.objects.create(
+                user=self.data['user'], job_name=job_name, company_name=company_name, notes=notes,
+                job_link='https://example.com/job', resume_file_path='ResumeBlobs/r.pdf',
+            )
+
+    def search(self, **params):
+        response = self.client.get('/api/applications', params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [a['companyName'] for a in response.json()['data']['applications']]
+
+    def test_matches_substrings_of_every_column(self):
+        self.assertEqual(self.search(q='oogl'), ['Google'])
+        self.assertEqual(self.search(q='platform'), ['Google'])
+        self.assertEqual(self.search(q='zurich'), ['Google'])
+        self.assertEqual(self.search(q='nothing like this'), [])
+
+    def test_results_are_ranked_by_relevance(self):
+        self.assertEqual(self.search(q='stripe'), ['Stripe', 'Acme'])
+        self.assertEqual(self.search(q='stripe', sortBy='companyName', sortOrder='asc'), ['Acme', 'Stripe'])
+
+    def test_index_follows_updates_and_deletes(self):
+        app = Applications.objects.get(user=self.data['user'], company_name='Google')
+        app.company_name = 'Alphabet'
+        app.save()
+        self.assertEqual(self.search(q='google'), [])
+        self.assertEqual(self.search(q='alphabet'), ['Alphabet'])
+        app.delete()
+        self.assertEqual(self.search(q='alphabet'), [])
+
+    def test_short_queries_scan(self):
+        self.assertEqual(self.search(q='oo'), ['Google'])
+
+    def test_rebuilt_table_without_triggers_scans(self):
+        # Django's SQLite table rebuild drops the sync triggers and renumbers rowids
+        self.addCleanup(setattr, application_search._SQLite, '_installed', None)
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER applications_search_update')
+        application_search._SQLite._installed = None
+        self.assertFalse(application_search._dialect('sqlite').available())
+        self.assertEqual(self.search(q='oogl'), ['Google'])
+
+    def test_trigram_indexes_are_created_on_postgres_only(self):
+        postgres = PostgresWrapper({**connection.settings_dict, 'ENGINE': 'django.db.backends.postgresql'})
+        trigram = [i for i in Applications._meta.indexes if isinstance(i, PostgresGinIndex)]
+        self.assertEqual(len(trigram), 3)
+        for index in trigram:
+            sql = str(index.create_sql(Applications, postgres.schema_editor(collect_sql=True, atomic=False)))
+            self.assertRegex(sql, r'USING gin \("user_id", "\w+" gin_trgm_ops\)')
+            self.assertEqual(str(index.create_sql(Applications, connection.schema_editor(collect_sql=True))), '')
+
+
+@override_settings(ANALYZER_PREGENERATE=False, AUDIT_LOG_ENABLED=False)
+class ProfileSearchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        install_search_indexes()
+        super().setUpClass()
+
+    def setUp(self):
+        self.data = seed(SMALL)
+        self.client = APIClient()
+        self.client.force_authenticate(self.data['user'])
+        user = self.data['user']
+        self.experience = Experiences.objects.create(
+            user=user, experience_name='Globex', start_date='2021', end_date='2023', role='Kubernetes Engineer',
+            experience_explanation='Ran the clusters and wrote operators in Go',
+        )
+        self.project = Projects.objects.create(
+            user=user, project_name='Cluster autoscaler', project_info='Scaled Kubernetes node pools from queue depth',
+        )
+        self.application = Applications.objects.create(
+            user=user, job_name='SRE', company_name='Initech', job_link='https://example.com/job',
+            resume_file_path='ResumeBlobs/r.pdf', notes='Recruiter asked about kubernetes upgrades',
+        )
+        other = seed(SMALL)['user']
+        Achievements.objects.create(user=other, achievement_point='Kubernetes contributor')
+
+    def search(self, **params):
+        response = self.client.get('/api/search', params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()['data']['results']
+
+    def test_ranks_hits_across_sections(self):
+        results = self.search(q='kubernetes')
+        # Only this user's rows; the title match outranks body matches
+        self.assertEqual(
+            {(r['section'], r['id']) for r in results},
+            {('experiences', str(self.experience.id)), ('projects', str(self.project.id)),
+             ('applications', str(self.application.id))},
+        )
+        self.assertEqual(results[0]['section'], 'experiences')
+        self.assertEqual([r['rank'] for r in results], sorted((r['rank'] for r in results), reverse=True))
+        self.assertEqual(results[0]['title'], 'Kubernetes Engineer — Globex')
+        for r in results:
+            for start, end in r['highlights']:
+                self.assertEqual(r['snippet'][start:end].lower(), 'kubernetes')
+            self.assertTrue(r['highlights'])
+
+    def test_sections_filter_and_validation(self):
+        self.assertEqual({r['section'] for r in self.search(q='kubernetes', sections='applications')}, {'applications'})
+        response = self.client.get('/api/search', {'q': 'x', 'sections': 'skills'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_index_follows_writes(self):
+        self.project.project_info = 'Scaled node pools with Terraform'
+        self.project.save()
+        self.assertEqual([r['section'] for r in self.search(q='terraform')], ['projects'])
+        self.project.delete()
+        self.assertEqual(self.search(q='terraform'), [])
+        self.assertEqual(self.search(q='nothing matches this'), [])
+
+    def test_rebuilt_table_without_triggers_is_unavailable(self):
+        # Django's SQLite table rebuild drops the sync triggers and renumbers rowids
+        self.addCleanup(setattr, profile_search._SQLite, '_installed', None)
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER projects_text_update')
+        profile_search._SQLite._installed = None
+        response = self.client.get('/api/search', {'q': 'kubernetes'})
+        self.assertEqual(response.status_code, 503)
+
+    def test_migration_reverses_what_it_created(self):
+        migration = import_module('BackendApp.migrations.0006_profile_search')
+        fts = [f'{sqlite_fts.table_name(model)}_text' for model, _, _ in profile_search.SECTIONS.values()]
+        self.assertTrue(all(sqlite_fts.installed(name) for name in fts))
+        with connection.cursor() as cursor:
+            for statement in migration.SQLITE_REVERSE_SQL:
+                cursor.execute(statement)
+            names = fts + [f'{name}_{trigger}' for name in fts for trigger in sqlite_fts.TRIGGERS]
+            cursor.execute(f"SELECT count(*) FROM sqlite_master WHERE name IN ({', '.join(['%s'] * len(names))})", names)
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+
+@override_settings(ANALYZER_PREGENERATE=False, AUDIT_LOG_ENABLED=False)
+class SkillCatalogTests(TestCase):
+    def setUp(self):
+        self.data = seed(SMALL)
+        self.client = APIClient()
+        self.client.force_authenticate(self.data['user'])
+        Skills.objects.bulk_create([
+            Skills(skill_name=name, category=category) for name, category in [
+                ('React', 'Frontend'), ('React Native', 'Mobile'), ('Redux', 'Frontend'),
+                ('Amazon Redshift', 'Data'), ('C#', 'Languages'),
+            ]
+        ])
+        skill_catalog._invalidate()
+
+    def names(self, **params):
+        response = self.client.get('/api/skills', params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [s['skillName'] for s in response.json()['data']]
+
+    def test_prefix_autocomplete(self):
+        # Whole-name matches in name order come before matches on a later word
+        self.assertEqual(self.names(prefix='re'), ['React', 'React Native', 'Redux', 'Amazon Redshift'])
+        self.assertEqual(self.names(prefix='RE', limit=2), ['React', 'React Native'])
+        self.assertEqual(self.names(prefix='nat'), ['React Native'])
+        self.assertEqual(self.names(prefix='re', category='Frontend'), ['React', 'Redux'])
+        self.assertEqual(self.names(prefix='c#'), ['C#'])
+        self.assertEqual(self.names(prefix='re', category='Nope'), [])
+        self.assertEqual(self.client.get('/api/skills', {'prefix': 're', 'limit': 0}).status_code, 400)
+
+    def test_listing_is_precompressed_and_revalidated(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/skills', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        listing = json.loads(gzip.decompress(response.content))['data']
+        self.assertEqual(listing, [
+            {'id': str(s.id), 'skillName': s.skill_name, 'category': s.category}
+            for s in sorted(Skills.objects.all(), key=lambda s: (s.skill_name.casefold(), str(s.id)))
+        ])
+
+        etag = response['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/skills', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((response.status_code, len(queries)), (304, 1))
+        self.assertEqual(json.loads(self.client.get('/api/skills').content)['data'], listing)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/skills', {'skillName': 'Rust', 'category': 'Languages'}, format='json')
+        response = self.client.get('/api/skills', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertIn('Rust', [s['skillName'] for s in json.loads(response.content)['data']])
+
+    def test_category_rename_is_picked_up(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                '/api/skills', {'action': 'rename_category', 'oldCategory': 'Frontend', 'newCategory': 'Web'},
+                format='json',
+            )
+        self.assertEqual(self.names(category='Web'), ['React', 'Redux'])
+        self.assertEqual(self.names(category='Frontend'), [])
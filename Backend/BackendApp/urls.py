@@ -27,6 +27,9 @@ urlpatterns = [
     # Experiences
     path('applicant-info/experiences', views.experiences, name='experiences'),
     
+    # Batch Profile Operations
+    path('applicant-info/batch', views.profile_batch, name='profile_batch'),
+    
     # Complete Applicant Info
     path('applicant-info/complete', views.complete_applicant_info, name='complete_applicant_info'),
     
@@ -40,6 +43,13 @@ urlpatterns = [
     # Application Statistics
     path('applications/stats', views.application_stats, name='application_stats'),
     
+    # ============================================
+    # SEARCH API
+    # ============================================
+    
+    # Search across profile sections and applications
+    path('search', views.search, name='search'),
+    
     # ============================================
     # RESUME FILE MANAGEMENT API
     # ============================================
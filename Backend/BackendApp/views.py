@@ -1,10 +1,16 @@
-from django.http import FileResponse
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
 from django.core.exceptions import ValidationError
 from django.db import transaction, IntegrityError
+from django.db.models import Prefetch
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
 from rest_framework.decorators import api_view, permission_classes, parser_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.response import Response
+import re
 import uuid
 from pathlib import Path
 
@@ -12,6 +18,14 @@ from .models import (
     ApplicantBasicInfo, Academics, Achievements, Skills,
     UserSkills, Projects, ProjectSkills, Experiences, Applications,
 )
+from . import applicant_document
+from .application_search import search as search_applications
+from .application_stats import compute as compute_application_stats, read as read_application_stats
+from .pagination import InvalidCursor, paginate
+from .profile_batch import BatchError, apply as apply_profile_batch, sync as sync_profile
+from .profile_search import SearchUnavailable, SECTIONS as SEARCH_SECTIONS, search as search_profile
+from . import skill_catalog
+from AnalyzerApp import skill_cooccurrence, profile_index
 
 
 # ─── Utilities ────────────────────────────────────────────────────────────────
@@ -50,11 +64,27 @@ def serialize_skill(skill):
     }
 
 
+def serialize_application(a):
+    return {
+        "id": str(a.id),
+        "jobName": a.job_name,
+        "companyName": a.company_name,
+        "jobLink": a.job_link,
+        "resumeFilePath": a.resume_file_path,
+        "status": a.status,
+        "notes": a.notes,
+    }
+
+
+def with_project_skills(qs):
+    """Prefetch project skills so serialize_project_with_skills runs no queries per project."""
+    return qs.prefetch_related(
+        Prefetch('project_skills', queryset=ProjectSkills.objects.select_related('skill').order_by('created_at'))
+    )
+
+
 def serialize_project_with_skills(project):
-    skills = [
-        serialize_skill(ps.skill)
-        for ps in ProjectSkills.objects.filter(project=project).select_related('skill')
-    ]
+    skills = [serialize_skill(ps.skill) for ps in project.project_skills.all()]
     return {
         "id": str(project.id),
         "projectName": project.project_name,
@@ -64,6 +94,26 @@ def serialize_project_with_skills(project):
     }
 
 
+def reorder(model, user, orders):
+    """Apply [{id, displayOrder}] to the user's rows with one read and one bulk update."""
+    wanted = {str(o.get('id')): o.get('displayOrder') for o in orders}
+    rows = list(model.objects.filter(user=user, id__in=list(wanted)))
+    now = timezone.now()
+    for row in rows:
+        row.display_order = wanted[str(row.id)]
+        row.updated_at = now
+    model.objects.bulk_update(rows, ['display_order', 'updated_at'])
+
+
+def set_project_skills(project, skill_ids):
+    """Link the existing skills among `skill_ids` to a new or cleared project."""
+    skills = Skills.objects.filter(id__in=skill_ids).values_list('id', flat=True)
+    ProjectSkills.objects.bulk_create([ProjectSkills(project=project, skill_id=s) for s in skills])
+    # bulk_create skips the signals that keep these in sync
+    skill_cooccurrence.schedule_refresh('project', project.id)
+    profile_index.schedule_refresh('project', project.id)
+
+
 # ─── 1. Basic Information ─────────────────────────────────────────────────────
 
 @api_view(['GET', 'POST'])
@@ -236,14 +286,7 @@ def academics(request):
             return ok(message="Academic record deleted successfully")
 
         elif action == 'reorder':
-            with transaction.atomic():
-                for order in body.get('academicOrders', []):
-                    try:
-                        academic = Academics.objects.get(id=order.get('id'), user=request.user)
-                        academic.display_order = order.get('displayOrder')
-                        academic.save()
-                    except Academics.DoesNotExist:
-                        continue
+            reorder(Academics, request.user, body.get('academicOrders', []))
             return ok(message="Academics reordered successfully")
 
         else:
@@ -333,14 +376,7 @@ def achievements(request):
             return ok(message="Achievement deleted successfully")
 
         elif action == 'reorder':
-            with transaction.atomic():
-                for order in body.get('achievementOrders', []):
-                    try:
-                        item = Achievements.objects.get(id=order.get('id'), user=request.user)
-                        item.display_order = order.get('displayOrder')
-                        item.save()
-                    except Achievements.DoesNotExist:
-                        continue
+            reorder(Achievements, request.user, body.get('achievementOrders', []))
             return ok(message="Achievements reordered successfully")
 
         else:
@@ -354,6 +390,21 @@ def achievements(request):
 
 # ─── 4. Skills (global catalog) ───────────────────────────────────────────────
 
+def catalog_listing(request, catalog):
+    """The full catalog as pre-rendered bytes: 304 when the ETag matches, gzip when accepted."""
+    if catalog.etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+        response = HttpResponseNotModified()
+    else:
+        gzipped = bool(re.search(r'\bgzip\b', request.META.get('HTTP_ACCEPT_ENCODING', '')))
+        response = HttpResponse(catalog.listing_gzip if gzipped else catalog.listing, content_type='application/json')
+        if gzipped:
+            response['Content-Encoding'] = 'gzip'
+    response['ETag'] = catalog.etag
+    response['Cache-Control'] = 'private, no-cache'
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
 def skills(request):
@@ -361,12 +412,19 @@ def skills(request):
         try:
             category = request.query_params.get('category')
             search = request.query_params.get('search')
-            qs = Skills.objects.all()
-            if category:
-                qs = qs.filter(category=category)
-            if search:
-                qs = qs.filter(skill_name__icontains=search)
-            return ok([serialize_skill(s) for s in qs])
+            prefix = request.query_params.get('prefix')
+            catalog = skill_catalog.current()
+            if prefix is not None:
+                try:
+                    limit = int(request.query_params.get('limit', skill_catalog.DEFAULT_LIMIT))
+                except ValueError:
+                    return err("VALIDATION_ERROR", "limit must be a number")
+                if not 1 <= limit <= skill_catalog.MAX_LIMIT:
+                    return err("VALIDATION_ERROR", f"limit must be between 1 and {skill_catalog.MAX_LIMIT}")
+                return ok(catalog.complete(prefix, category or None, limit))
+            if category or search:
+                return ok(catalog.filter(category, search))
+            return catalog_listing(request, catalog)
         except Exception as e:
             return err("DATABASE_ERROR", "Failed to retrieve skills", str(e), 500)
 
@@ -414,6 +472,7 @@ def skills(request):
             if not old_category or not new_category:
                 return err("VALIDATION_ERROR", "oldCategory and newCategory are required")
             updated = Skills.objects.filter(category=old_category).update(category=new_category)
+            skill_catalog.invalidate()
             return ok({"updated": updated}, f"Category renamed from '{old_category}' to '{new_category}'")
 
         elif action == 'delete_category':
@@ -453,30 +512,24 @@ def user_skills(request):
         skill_ids = body.get('skillIds', [])
 
         if action == 'add':
-            added_count = 0
-            added_skills = []
             with transaction.atomic():
-                for skill_id in skill_ids:
-                    try:
-                        skill = Skills.objects.get(id=skill_id)
-                        us, created = UserSkills.objects.get_or_create(user=request.user, skill=skill)
-                        if created:
-                            added_count += 1
-                            added_skills.append(serialize_skill(skill))
-                    except Skills.DoesNotExist:
-                        continue
+                have = set(UserSkills.objects.filter(user=request.user).values_list('skill_id', flat=True))
+                new_skills = [s for s in Skills.objects.filter(id__in=skill_ids) if s.id not in have]
+                created = UserSkills.objects.bulk_create(
+                    [UserSkills(user=request.user, skill=s) for s in new_skills], ignore_conflicts=True,
+                )
+                # bulk_create skips the signals that keep these in sync
+                if created:
+                    skill_cooccurrence.schedule_refresh('user', request.user.id)
+                for us in created:
+                    profile_index.schedule_refresh('skill', us.id)
+            added_skills = [serialize_skill(s) for s in new_skills]
+            added_count = len(added_skills)
             return ok({"added": added_count, "skills": added_skills}, f"{added_count} skills added successfully")
 
         elif action == 'remove':
-            removed_count = 0
             with transaction.atomic():
-                for skill_id in skill_ids:
-                    try:
-                        skill = Skills.objects.get(id=skill_id)
-                        deleted, _ = UserSkills.objects.filter(user=request.user, skill=skill).delete()
-                        removed_count += deleted
-                    except Skills.DoesNotExist:
-                        continue
+                removed_count, _ = UserSkills.objects.filter(user=request.user, skill_id__in=skill_ids).delete()
             return ok({"removed": removed_count}, f"{removed_count} skills removed successfully")
 
         else:
@@ -496,12 +549,12 @@ def projects(request):
             project_id = request.query_params.get('id')
             if project_id:
                 try:
-                    project = Projects.objects.get(id=project_id, user=request.user)
+                    project = with_project_skills(Projects.objects).get(id=project_id, user=request.user)
                     return ok(serialize_project_with_skills(project))
                 except Projects.DoesNotExist:
                     return err("NOT_FOUND", "Project not found", status=404)
             else:
-                items = Projects.objects.filter(user=request.user).order_by('display_order')
+                items = with_project_skills(Projects.objects.filter(user=request.user).order_by('display_order'))
                 return ok([serialize_project_with_skills(p) for p in items])
         except Exception as e:
             return err("DATABASE_ERROR", "Failed to retrieve projects", str(e), 500)
@@ -522,12 +575,8 @@ def projects(request):
                 )
                 project.full_clean()
                 project.save()
-                for skill_id in body.get('skillIds', []):
-                    try:
-                        skill = Skills.objects.get(id=skill_id)
-                        ProjectSkills.objects.create(project=project, skill=skill)
-                    except Skills.DoesNotExist:
-                        continue
+                set_project_skills(project, body.get('skillIds', []))
+            project = with_project_skills(Projects.objects).get(id=project.id)
             return ok(serialize_project_with_skills(project), "Project created successfully")
 
         elif action == 'update':
@@ -549,12 +598,8 @@ def projects(request):
                 project.save()
                 if 'skillIds' in body:
                     ProjectSkills.objects.filter(project=project).delete()
-                    for skill_id in body['skillIds']:
-                        try:
-                            skill = Skills.objects.get(id=skill_id)
-                            ProjectSkills.objects.create(project=project, skill=skill)
-                        except Skills.DoesNotExist:
-                            continue
+                    set_project_skills(project, body['skillIds'])
+            project = with_project_skills(Projects.objects).get(id=project.id)
             return ok(serialize_project_with_skills(project), "Project updated successfully")
 
         elif action == 'delete':
@@ -569,14 +614,7 @@ def projects(request):
             return ok(message="Project deleted successfully")
 
         elif action == 'reorder':
-            with transaction.atomic():
-                for order in body.get('projectOrders', []):
-                    try:
-                        project = Projects.objects.get(id=order.get('id'), user=request.user)
-                        project.display_order = order.get('displayOrder')
-                        project.save()
-                    except Projects.DoesNotExist:
-                        continue
+            reorder(Projects, request.user, body.get('projectOrders', []))
             return ok(message="Projects reordered successfully")
 
         else:
@@ -710,14 +748,7 @@ def experiences(request):
             return ok(message="Experience deleted successfully")
 
         elif action == 'reorder':
-            with transaction.atomic():
-                for order in body.get('experienceOrders', []):
-                    try:
-                        exp = Experiences.objects.get(id=order.get('id'), user=request.user)
-                        exp.display_order = order.get('displayOrder')
-                        exp.save()
-                    except Experiences.DoesNotExist:
-                        continue
+            reorder(Experiences, request.user, body.get('experienceOrders', []))
             return ok(message="Experiences reordered successfully")
 
         else:
@@ -731,73 +762,89 @@ def experiences(request):
 
 # ─── 8. Complete Applicant Info ───────────────────────────────────────────────
 
-@api_view(['GET'])
+def build_complete_applicant_info(u):
+    """The complete applicant document assembled with the ORM."""
+    info = ApplicantBasicInfo.objects.filter(user=u).first()
+    basic_data = None
+    if info:
+        basic_data = {
+            "id": str(info.id),
+            "fullName": info.full_name,
+            "phoneNumber": info.phone_number,
+            "email": info.email,
+            "linkedinUrl": info.linkedin_url,
+            "githubUrl": info.github_url,
+            "address": info.address,
+        }
+
+    academics_data = [
+        {
+            "id": str(a.id),
+            "collegeName": a.college_name,
+            "graduationDate": a.graduation_date,
+            "course": a.course,
+            "displayOrder": a.display_order,
+        }
+        for a in Academics.objects.filter(user=u).order_by('display_order')
+    ]
+
+    achievements_data = [
+        {"id": str(a.id), "achievementPoint": a.achievement_point, "displayOrder": a.display_order}
+        for a in Achievements.objects.filter(user=u).order_by('display_order')
+    ]
+
+    skills_data = [
+        serialize_skill(us.skill)
+        for us in UserSkills.objects.filter(user=u).select_related('skill')
+    ]
+
+    projects_data = [
+        serialize_project_with_skills(p)
+        for p in with_project_skills(Projects.objects.filter(user=u).order_by('display_order'))
+    ]
+
+    experiences_data = [
+        {
+            "id": str(e.id),
+            "experienceName": e.experience_name,
+            "startDate": e.start_date,
+            "endDate": e.end_date,
+            "role": e.role,
+            "location": e.location,
+            "experienceExplanation": e.experience_explanation,
+            "displayOrder": e.display_order,
+        }
+        for e in Experiences.objects.filter(user=u).order_by('display_order')
+    ]
+
+    return {
+        "basicInformation": basic_data,
+        "academics": academics_data,
+        "achievements": achievements_data,
+        "skills": skills_data,
+        "projects": projects_data,
+        "experiences": experiences_data,
+    }
+
+
+@api_view(['GET', 'PUT'])
 @permission_classes([IsAuthenticated])
 def complete_applicant_info(request):
-    try:
-        u = request.user
-
-        info = ApplicantBasicInfo.objects.filter(user=u).first()
-        basic_data = None
-        if info:
-            basic_data = {
-                "id": str(info.id),
-                "fullName": info.full_name,
-                "phoneNumber": info.phone_number,
-                "email": info.email,
-                "linkedinUrl": info.linkedin_url,
-                "githubUrl": info.github_url,
-                "address": info.address,
-            }
+    if request.method == 'PUT':
+        # The body is the whole desired profile; only the differences are written
+        try:
+            sync_profile(request.user, request.data)
+        except BatchError as e:
+            return err(e.code, e.message, e.details, e.status)
+        except Exception as e:
+            return err("DATABASE_ERROR", "Failed to save complete applicant information", str(e), 500)
 
-        academics_data = [
-            {
-                "id": str(a.id),
-                "collegeName": a.college_name,
-                "graduationDate": a.graduation_date,
-                "course": a.course,
-                "displayOrder": a.display_order,
-            }
-            for a in Academics.objects.filter(user=u).order_by('display_order')
-        ]
-
-        achievements_data = [
-            {"id": str(a.id), "achievementPoint": a.achievement_point, "displayOrder": a.display_order}
-            for a in Achievements.objects.filter(user=u).order_by('display_order')
-        ]
-
-        skills_data = [
-            serialize_skill(us.skill)
-            for us in UserSkills.objects.filter(user=u).select_related('skill')
-        ]
-
-        projects_data = [
-            serialize_project_with_skills(p)
-            for p in Projects.objects.filter(user=u).order_by('display_order')
-        ]
-
-        experiences_data = [
-            {
-                "id": str(e.id),
-                "experienceName": e.experience_name,
-                "startDate": e.start_date,
-                "endDate": e.end_date,
-                "role": e.role,
-                "location": e.location,
-                "experienceExplanation": e.experience_explanation,
-                "displayOrder": e.display_order,
-            }
-            for e in Experiences.objects.filter(user=u).order_by('display_order')
-        ]
-
-        return ok({
-            "basicInformation": basic_data,
-            "academics": academics_data,
-            "achievements": achievements_data,
-            "skills": skills_data,
-            "projects": projects_data,
-            "experiences": experiences_data,
-        })
+    try:
+        if settings.APPLICANT_INFO_SQL_JSON and applicant_document.supported():
+            # The database returns the finished document; wrap it without parsing
+            document = applicant_document.complete_document(request.user.pk)
+            return HttpResponse('{"success": true, "data": ' + document + '}', content_type='application/json')
+        return ok(build_complete_applicant_info(request.user))
     except Exception as e:
         return err("DATABASE_ERROR", "Failed to retrieve complete applicant information", str(e), 500)
 
@@ -821,12 +868,14 @@ def applications(request):
                         "resumeFilePath": app.resume_file_path,
                         "status": app.status,
                         "notes": app.notes,
+                        "jobDescription": app.job_description,
                     })
                 except Applications.DoesNotExist:
                     return err("NOT_FOUND", "Application not found", status=404)
 
             status_filter = request.query_params.get('status')
             company = request.query_params.get('company')
+            query = request.query_params.get('q', '').strip()
             limit = int(request.query_params.get('limit', 10))
             offset = int(request.query_params.get('offset', 0))
             sort_by = request.query_params.get('sortBy', 'created_at')
@@ -846,22 +895,38 @@ def applications(request):
                 qs = qs.filter(status=status_filter)
             if company:
                 qs = qs.filter(company_name__icontains=company)
-            qs = qs.order_by(sort_field)
+            if query:
+                qs = search_applications(qs, query)
+
+            if 'cursor' in request.query_params:
+                # Keyset mode: an empty cursor starts at the first page
+                descending = sort_order == 'desc'
+                try:
+                    apps_page, next_cursor, prev_cursor = paginate(
+                        qs, sort_field.lstrip('-'), descending, request.query_params['cursor'], limit,
+                    )
+                except InvalidCursor as e:
+                    return err("VALIDATION_ERROR", str(e))
+                data = {
+                    "applications": [serialize_application(a) for a in apps_page],
+                    "limit": limit,
+                    "nextCursor": next_cursor,
+                    "prevCursor": prev_cursor,
+                }
+                # Counting every match is the expensive part; only on request
+                if request.query_params.get('includeTotal') == 'true':
+                    data["total"] = qs.count()
+                return ok(data)
+
+            if query and 'sortBy' not in request.query_params:
+                # Search results come most relevant first unless a sort is asked for
+                qs = qs.order_by('-search_rank', sort_field, '-id' if sort_order == 'desc' else 'id')
+            else:
+                qs = qs.order_by(sort_field, '-id' if sort_order == 'desc' else 'id')
             total = qs.count()
             apps_page = qs[offset:offset + limit]
 
-            apps_data = [
-                {
-                    "id": str(a.id),
-                    "jobName": a.job_name,
-                    "companyName": a.company_name,
-                    "jobLink": a.job_link,
-                    "resumeFilePath": a.resume_file_path,
-                    "status": a.status,
-                    "notes": a.notes,
-                }
-                for a in apps_page
-            ]
+            apps_data = [serialize_application(a) for a in apps_page]
             return ok({
                 "applications": apps_data,
                 "total": total,
@@ -886,6 +951,7 @@ def applications(request):
                 resume_file_path=resume_file_path,
                 status=body.get('status', 'Applied'),
                 notes=body.get('notes'),
+                job_description=body.get('jobDescription'),
             )
             app.full_clean()
             app.save()
@@ -898,6 +964,7 @@ def applications(request):
                     "resumeFilePath": app.resume_file_path,
                     "status": app.status,
                     "notes": app.notes,
+                    "jobDescription": app.job_description,
                 },
                 "Application created successfully",
             )
@@ -916,6 +983,7 @@ def applications(request):
                 ('jobLink', 'job_link'),
                 ('status', 'status'),
                 ('notes', 'notes'),
+                ('jobDescription', 'job_description'),
             ]:
                 if field in body:
                     setattr(app, attr, body[field])
@@ -930,6 +998,7 @@ def applications(request):
                     "resumeFilePath": app.resume_file_path,
                     "status": app.status,
                     "notes": app.notes,
+                    "jobDescription": app.job_description,
                 },
                 "Application updated successfully",
             )
@@ -1072,24 +1141,49 @@ def resume_file(request):
 @permission_classes([IsAuthenticated])
 def application_stats(request):
     try:
-        qs = Applications.objects.filter(user=request.user)
-        total = qs.count()
-        status_counts = {
-            s: qs.filter(status=s).count()
-            for s in ['Applied', 'Rejected', 'Timed out', 'Processed', 'Accepted', 'Interview']
-        }
-        successful_count = qs.filter(status__in=['Accepted', 'Interview']).count()
-        success_rate = round(successful_count / total * 100, 2) if total > 0 else 0
-
-        recent_data = [
-            {"id": str(a.id), "jobName": a.job_name, "companyName": a.company_name, "status": a.status}
-            for a in qs.order_by('-created_at')[:5]
-        ]
-        return ok({
-            "total": total,
-            "byStatus": status_counts,
-            "successRate": success_rate,
-            "recentApplications": recent_data,
-        })
+        if settings.APPLICATION_STATS_CACHE:
+            return ok(read_application_stats(request.user))
+        return ok(compute_application_stats(request.user))
     except Exception as e:
         return err("DATABASE_ERROR", "Failed to retrieve application statistics", str(e), 500)
+
+
+# ─── 12. Batch Profile Operations ─────────────────────────────────────────────
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def profile_batch(request):
+    try:
+        results = apply_profile_batch(request.user, request.data.get('operations'))
+        return ok({"results": results}, f"{len(results)} operations applied successfully")
+    except BatchError as e:
+        return err(e.code, e.message, e.details, e.status)
+    except Exception as e:
+        return err("DATABASE_ERROR", "Failed to apply profile operations", str(e), 500)
+
+
+# ─── 13. Search ───────────────────────────────────────────────────────────────
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search(request):
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return err("VALIDATION_ERROR", "q is required")
+    sections = [s for s in request.query_params.get('sections', '').split(',') if s]
+    unknown = [s for s in sections if s not in SEARCH_SECTIONS]
+    if unknown:
+        return err("VALIDATION_ERROR", f"Invalid sections: {', '.join(unknown)}. Use {', '.join(SEARCH_SECTIONS)}")
+    try:
+        limit = int(request.query_params.get('limit', 20))
+    except ValueError:
+        return err("VALIDATION_ERROR", "limit must be a number")
+    if limit < 1:
+        return err("VALIDATION_ERROR", "limit must be at least 1")
+    try:
+        results = search_profile(request.user, query, sections, limit)
+        return ok({"results": results, "query": query})
+    except SearchUnavailable as e:
+        return err("SEARCH_UNAVAILABLE", str(e), status=503)
+    except Exception as e:
+        return err("DATABASE_ERROR", "Failed to search", str(e), 500)
@@ -0,0 +1,64 @@
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryStats:
+    """execute_wrapper that counts queries and the time spent in the database."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+class QueryBudgetMiddleware:
+    """
+    Counts the queries and database time of each request and compares the
+    count with the endpoint's budget (QUERY_BUDGETS by `<URL name>:<METHOD>`,
+    then by URL name, falling back to QUERY_BUDGET_DEFAULT). QUERY_BUDGET_MODE is `off`, `log` (print a
+    warning) or `raise` (fail the request; meant for development and tests).
+    The numbers are also returned in the Server-Timing header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = settings.QUERY_BUDGET_MODE
+        if mode == 'off':
+            return self.get_response(request)
+
+        stats = QueryStats()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+
+        response['Server-Timing'] = f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries"'
+        match = request.resolver_match
+        name = match.url_name if match else None
+        budgets = settings.QUERY_BUDGETS
+        budget = budgets.get(f'{name}:{request.method}', budgets.get(name, settings.QUERY_BUDGET_DEFAULT))
+        if budget and stats.count > budget:
+            message = (
+                f"{request.method} {request.path} ({name}) ran {stats.count} queries "
+                f"in {stats.duration * 1000:.1f}ms, budget is {budget}"
+            )
+            if mode == 'raise':
+                raise QueryBudgetExceeded(message)
+            print(f"Query budget exceeded: {message}")
+        return response
@@ -22,6 +22,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.sites',
+    'django.contrib.postgres',
 
     # Third-party
     'rest_framework',
@@ -47,8 +48,32 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'allauth.account.middleware.AccountMiddleware',
+    'ResumeAnalyzer.middleware.QueryBudgetMiddleware',
 ]
 
+# ─── Query Budgets ────────────────────────────────────────────────────────────
+# Maximum queries per request by URL name (or `name:METHOD`); QUERY_BUDGET_MODE is off, log or
+# raise. BackendApp/tests.py keeps these counts constant as data grows.
+
+QUERY_BUDGET_MODE = os.environ.get('QUERY_BUDGET_MODE', 'log' if DEBUG else 'off')
+QUERY_BUDGET_DEFAULT = int(os.environ.get('QUERY_BUDGET_DEFAULT', 30))
+QUERY_BUDGETS = {
+    'basic_info': 6,
+    'academics': 5,
+    'achievements': 5,
+    'skills': 5,
+    'user_skills': 30,
+    'projects': 40,
+    'experiences': 5,
+    'profile_batch': 40,
+    'complete_applicant_info': 10,
+    'complete_applicant_info:PUT': 60,
+    'applications': 15,
+    'application_stats': 8,
+    'resume_file': 5,
+    'search': 3,
+}
+
 CORS_ALLOW_ALL_ORIGINS = True
 
 ROOT_URLCONF = 'ResumeAnalyzer.urls'
@@ -104,6 +129,14 @@ _db_config['OPTIONS'] = {
 
 DATABASES = {'default': _db_config}
 
+# applicant-info/complete builds its JSON document in one SQL statement on
+# PostgreSQL and SQLite; set to False to assemble it with the ORM instead.
+APPLICANT_INFO_SQL_JSON = os.environ.get('APPLICANT_INFO_SQL_JSON', 'True') == 'True'
+
+# applications/stats serves each user's statistics from a cached row that
+# application writes mark stale; set to False to compute them on every request.
+APPLICATION_STATS_CACHE = os.environ.get('APPLICATION_STATS_CACHE', 'True') == 'True'
+
 
 # ─── Password Validation ──────────────────────────────────────────────────────
 
@@ -218,3 +251,49 @@ REST_FRAMEWORK = {
         'rest_framework.parsers.FormParser',
     ],
 }
+
+
+# ─── LLM Token Quotas ─────────────────────────────────────────────────────────
+# Per-user limits on tokens spent in analyzer/* generations. 0 disables a limit.
+# Each generation reserves an estimate of its tokens (prompt plus max_tokens),
+# capped at what is left, and is settled to the usage reported by the provider
+# once it finishes. LLM_QUOTA_RESERVE_TOKENS is reserved when no estimate is given.
+
+LLM_TOKEN_ACCOUNTING = os.environ.get('LLM_TOKEN_ACCOUNTING', 'True') == 'True'
+LLM_DAILY_TOKEN_QUOTA = int(os.environ.get('LLM_DAILY_TOKEN_QUOTA', 0))
+LLM_MONTHLY_TOKEN_QUOTA = int(os.environ.get('LLM_MONTHLY_TOKEN_QUOTA', 0))
+LLM_QUOTA_RESERVE_TOKENS = int(os.environ.get('LLM_QUOTA_RESERVE_TOKENS', 4000))
+
+# Default for the analyzer `mode` parameter: llm, template (local, no LLM call)
+# or auto (LLM with template fallback on errors and exhausted quotas).
+ANALYZER_GENERATION_MODE = os.environ.get('ANALYZER_GENERATION_MODE', 'llm')
+
+# analyzer/suggest reports needs_llm when the suggested history bullets cover
+# less than this share of the job description's keyword weight.
+BULLET_SUGGEST_MIN_COVERAGE = float(os.environ.get('BULLET_SUGGEST_MIN_COVERAGE', 0.6))
+
+
+# ─── Speculative Pre-generation ───────────────────────────────────────────────
+# Applications created with a job description get their resume sections
+# generated in the background. Rate is LLM calls per minute per worker process.
+
+ANALYZER_PREGENERATE = os.environ.get('ANALYZER_PREGENERATE', 'True') == 'True'
+ANALYZER_PREGENERATE_RATE = float(os.environ.get('ANALYZER_PREGENERATE_RATE', 6))
+ANALYZER_PREGENERATE_BURST = int(os.environ.get('ANALYZER_PREGENERATE_BURST', 3))
+ANALYZER_PREGENERATE_WAIT = float(os.environ.get('ANALYZER_PREGENERATE_WAIT', 60))
+
+# Bullets per experience and per project the generator pages start from, served
+# to them by analyzer/defaults. Pre-generation uses the same counts so its
+# stored result matches the first request the page sends.
+ANALYZER_EXPERIENCE_POINTS = int(os.environ.get('ANALYZER_EXPERIENCE_POINTS', 5))
+ANALYZER_PROJECT_POINTS = int(os.environ.get('ANALYZER_PROJECT_POINTS', 3))
+
+
+# ─── Generation Audit Log ─────────────────────────────────────────────────────
+# Generation events are buffered per worker and written in batches; events
+# beyond AUDIT_BUFFER_SIZE are dropped rather than delaying requests.
+
+AUDIT_LOG_ENABLED = os.environ.get('AUDIT_LOG_ENABLED', 'True') == 'True'
+AUDIT_BUFFER_SIZE = int(os.environ.get('AUDIT_BUFFER_SIZE', 10000))
+AUDIT_FLUSH_SIZE = int(os.environ.get('AUDIT_FLUSH_SIZE', 100))
+AUDIT_FLUSH_INTERVAL = float(os.environ.get('AUDIT_FLUSH_INTERVAL', 5))
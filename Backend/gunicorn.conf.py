@@ -76,3 +76,10 @@ def worker_int(worker):
 def worker_abort(worker):
     """Called when a worker received the SIGABRT signal."""
     worker.log.info(f"Worker {worker.pid} received SIGABRT signal")
+
+
+def worker_exit(server, worker):
+    """Called just after a worker has been exited, in the worker process."""
+    # Write generation events still buffered in this worker
+    from AnalyzerApp import audit
+    audit.shutdown()
@@ -1,4 +1,5 @@
 import React, { useState, useEffect, useRef, useCallback } from 'react';
+import { useNavigate } from 'react-router-dom';
 import { applicationsApi, resumeFileApi, ApplicationData } from '../services/api';
 import styles from './Applications.module.css';
 
@@ -12,6 +13,7 @@ interface FormState {
   jobLink: string;
   status: AppStatus;
   notes: string;
+  jobDescription: string;
 }
 
 // ─── Status config ───────────────────────────────────────────────────────────
@@ -59,6 +61,7 @@ const BLANK_FORM: FormState = {
   jobLink: '',
   status: 'Applied',
   notes: '',
+  jobDescription: '',
 };
 
 // ─── Sub-components ──────────────────────────────────────────────────────────
@@ -78,7 +81,7 @@ const ApplicationModal: React.FC<ModalProps> = ({ open, editing, onClose, onSave
   useEffect(() => {
     if (open) {
       setForm(editing
-        ? { jobName: editing.jobName, companyName: editing.companyName, jobLink: editing.jobLink, status: editing.status, notes: editing.notes ?? '' }
+        ? { jobName: editing.jobName, companyName: editing.companyName, jobLink: editing.jobLink, status: editing.status, notes: editing.notes ?? '', jobDescription: editing.jobDescription ?? '' }
         : BLANK_FORM
       );
     }
@@ -143,6 +146,12 @@ const ApplicationModal: React.FC<ModalProps> = ({ open, editing, onClose, onSave
             </div>
           </div>
 
+          <div className={styles.field}>
+            <label htmlFor="jobDescription">Job Description</label>
+            <textarea id="jobDescription" name="jobDescription" rows={5} placeholder="Paste the job posting to pre-generate a tailored resume…"
+              value={form.jobDescription} onChange={handleChange} />
+          </div>
+
           <div className={styles.field}>
             <label htmlFor="notes">Notes</label>
             <textarea id="notes" name="notes" rows={3} placeholder="Any notes about this role, recruiter name, next steps…"
@@ -216,6 +225,7 @@ const ResumeCell: React.FC<UploadCellProps> = ({ app, uploading, onUpload, onDow
 // ─── Main Component ───────────────────────────────────────────────────────────
 
 const Applications: React.FC = () => {
+  const navigate = useNavigate();
   const [applications, setApplications] = useState<ApplicationData[]>([]);
   const [loading, setLoading] = useState(true);
   const [pageError, setPageError] = useState<string | null>(null);
@@ -273,7 +283,15 @@ const Applications: React.FC = () => {
   // ── CRUD handlers ─────────────────────────────────────────────────────────
 
   const openAdd = () => { setEditingApp(null); setModalError(null); setModalOpen(true); };
-  const openEdit = (app: ApplicationData) => { setEditingApp(app); setModalError(null); setModalOpen(true); };
+  const openEdit = (app: ApplicationData) => {
+    setEditingApp(app);
+    setModalError(null);
+    setModalOpen(true);
+    // The list leaves out job descriptions; load the full application for the form
+    applicationsApi.getById(app.id)
+      .then(full => setEditingApp(current => current?.id === full.id ? full : current))
+      .catch(err => console.error('Error loading application:', err));
+  };
   const closeModal = () => { setModalOpen(false); setEditingApp(null); };
 
   const handleSave = async (form: FormState) => {
@@ -281,7 +299,10 @@ const Applications: React.FC = () => {
     setModalError(null);
     try {
       if (editingApp) {
-        const updated = await applicationsApi.update(editingApp.id, form);
+        // Without the stored description, an empty field means "unchanged", not "clear it"
+        const { jobDescription, ...rest } = form;
+        const changes = editingApp.jobDescription === undefined && !jobDescription ? rest : form;
+        const updated = await applicationsApi.update(editingApp.id, changes);
         setApplications(prev => prev.map(a => a.id === updated.id ? updated : a));
       } else {
         const created = await applicationsApi.create(form);
@@ -538,6 +559,7 @@ const Applications: React.FC = () => {
                     </div>
                   ) : (
                     <>
+                      <button className={styles.actionEdit} onClick={() => navigate(`/resume-generator?applicationId=${app.id}`)} title="Tailor resume">📝</button>
                       <button className={styles.actionEdit} onClick={() => openEdit(app)} title="Edit">✏️</button>
                       <button className={styles.actionDelete} onClick={() => handleDeleteRequest(app.id)} title="Delete">🗑️</button>
                     </>
@@ -1,12 +1,13 @@
 import React, { useState, useEffect } from 'react';
 import { useResume } from '../../context/ResumeContext';
-import { experiencesApi, ExperienceData, experienceGeneratorApi } from '../../services/api';
+import { experiencesApi, ExperienceData, experienceGeneratorApi, generationDefaultsApi } from '../../services/api';
 import { GeneratedExperience } from '../../types/resume';
 import styles from './Generator.module.css';
 
 interface SharedGeneratorData {
   jobRole: string;
   jobRequirements: string;
+  applicationId?: string;
 }
 
 interface ExperienceGeneratorProps {
@@ -39,10 +40,10 @@ const ExperienceGenerator: React.FC<ExperienceGeneratorProps> = ({ onComplete, s
     try {
       setLoading(true);
       setError(null);
-      const data = await experiencesApi.getAll();
+      const [data, defaults] = await Promise.all([experiencesApi.getAll(), generationDefaultsApi.get()]);
       setExperiences(data);
-      // Initialize bullet counts with default value of 5 for each experience
-      setBulletCounts(data.map(() => 5));
+      // Start every experience at the server's default bullet count
+      setBulletCounts(data.map(() => defaults.experience_points));
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to load experiences');
       console.error('Error loading experiences:', err);
@@ -77,6 +78,7 @@ const ExperienceGenerator: React.FC<ExperienceGeneratorProps> = ({ onComplete, s
         job_description: jobRequirements,
         points_count: bulletCounts,
         additional_instruction: sidePrompt,
+        application_id: sharedData.applicationId,
       });
 
       // Store the raw API response for the Skills Generator
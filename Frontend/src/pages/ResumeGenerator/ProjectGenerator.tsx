@@ -1,12 +1,13 @@
 import React, { useState, useEffect } from 'react';
 import { useResume } from '../../context/ResumeContext';
-import { projectsApi, ProjectData, projectGeneratorApi } from '../../services/api';
+import { projectsApi, ProjectData, projectGeneratorApi, generationDefaultsApi } from '../../services/api';
 import { GeneratedProject } from '../../types/resume';
 import styles from './Generator.module.css';
 
 interface SharedGeneratorData {
   jobRole: string;
   jobRequirements: string;
+  applicationId?: string;
 }
 
 interface ProjectGeneratorProps {
@@ -41,10 +42,10 @@ const ProjectGenerator: React.FC<ProjectGeneratorProps> = ({ onComplete, sharedD
     try {
       setLoading(true);
       setError(null);
-      const data = await projectsApi.getAll();
+      const [data, defaults] = await Promise.all([projectsApi.getAll(), generationDefaultsApi.get()]);
       setProjects(data);
-      // Initialize line counts with default value of 3 for each project
-      setLineCounts(data.map(() => 3));
+      // Start every project at the server's default line count
+      setLineCounts(data.map(() => defaults.project_points));
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to load projects');
       console.error('Error loading projects:', err);
@@ -77,6 +78,7 @@ const ProjectGenerator: React.FC<ProjectGeneratorProps> = ({ onComplete, sharedD
         job_description: jobRequirements,
         points_count: lineCounts,
         additional_instruction: sidePrompt,
+        application_id: sharedData.applicationId,
       });
 
       // Store the raw API response for the Skills Generator
@@ -1,9 +1,11 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect } from 'react';
+import { useSearchParams } from 'react-router-dom';
 import ExperienceGenerator from './ExperienceGenerator';
 import ProjectGenerator from './ProjectGenerator';
 import SkillsGenerator from './SkillsGenerator';
 import ResumeOutput from './ResumeOutput';
 import { GeneratorStepStatus } from '../../types/resume';
+import { applicationsApi } from '../../services/api';
 import styles from './ResumeGenerator.module.css';
 
 type GeneratorStep = 'experience' | 'project' | 'skills' | 'resumeOutput';
@@ -11,6 +13,7 @@ type GeneratorStep = 'experience' | 'project' | 'skills' | 'resumeOutput';
 interface SharedGeneratorData {
   jobRole: string;
   jobRequirements: string;
+  applicationId?: string;
 }
 
 const STEPS = [
@@ -32,6 +35,23 @@ const ResumeGenerator: React.FC = () => {
     jobRole: '',
     jobRequirements: '',
   });
+  const [searchParams] = useSearchParams();
+  const applicationId = searchParams.get('applicationId');
+  const [loadingApplication, setLoadingApplication] = useState(!!applicationId);
+
+  // Opened from an application: start from its job and link the generations to it,
+  // so sections pre-generated for the application are served from the store
+  useEffect(() => {
+    if (!applicationId) return;
+    applicationsApi.getById(applicationId)
+      .then(app => setSharedData({
+        jobRole: app.jobName,
+        jobRequirements: app.jobDescription ?? '',
+        applicationId: app.id,
+      }))
+      .catch(err => console.error('Error loading application:', err))
+      .finally(() => setLoadingApplication(false));
+  }, [applicationId]);
 
   const completedCount = Object.values(stepStatus).filter(Boolean).length;
   const progressPct    = Math.round((completedCount / (STEPS.length-1)) * 100);
@@ -106,7 +126,7 @@ const ResumeGenerator: React.FC = () => {
 
       {/* ── Content ── */}
       <div className={styles.content}>
-        {activeStep === 'experience' && (
+        {!loadingApplication && activeStep === 'experience' && (
           <ExperienceGenerator
             onComplete={() => handleStepComplete('experience')}
             sharedData={sharedData}
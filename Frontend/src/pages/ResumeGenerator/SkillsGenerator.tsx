@@ -7,6 +7,7 @@ import styles from './Generator.module.css';
 interface SharedGeneratorData {
   jobRole: string;
   jobRequirements: string;
+  applicationId?: string;
 }
 
 interface SkillsGeneratorProps {
@@ -74,6 +75,7 @@ const SkillsGenerator: React.FC<SkillsGeneratorProps> = ({ onComplete, sharedDat
         include_web_research: includeWebResearch,
         experience_data: rawExperienceData,
         project_data: rawProjectData,
+        application_id: sharedData.applicationId,
       });
 
       // Transform the API response to the frontend format (category-based object)
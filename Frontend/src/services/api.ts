@@ -328,6 +328,7 @@ export interface ApplicationData {
   resumeFilePath?: string;
   status: 'Applied' | 'Rejected' | 'Timed out' | 'Processed' | 'Accepted' | 'Interview';
   notes?: string;
+  jobDescription?: string;
 }
 
 export const applicationsApi = {
@@ -347,6 +348,11 @@ export const applicationsApi = {
     return handleResponse<{ applications: ApplicationData[]; total: number; page: number; limit: number }>(res);
   },
 
+  getById: async (id: string): Promise<ApplicationData> => {
+    const res = await authFetch(`${API_BASE_URL}/applications?id=${encodeURIComponent(id)}`);
+    return handleResponse<ApplicationData>(res);
+  },
+
   create: async (data: Omit<ApplicationData, 'id' | 'resumeFilePath'>): Promise<ApplicationData> => {
     const res = await authFetch(`${API_BASE_URL}/applications`, {
       method: 'POST',
@@ -455,11 +461,27 @@ export const completeInfoApi = {
 
 // ─── AI Generator APIs ─────────────────────────────────────────────────────
 
+// Starting inputs for the generator pages, shared with background pre-generation
+export interface GenerationDefaults {
+  experience_points: number;
+  project_points: number;
+}
+
+export const generationDefaultsApi = {
+  get: async (): Promise<GenerationDefaults> => {
+    const res = await authFetch(`${ANALYZER_BASE_URL}/defaults`);
+    const result = await res.json();
+    if (!res.ok || result.status !== 'success') throw new Error(result.message || 'Failed to load generation defaults');
+    return result.output;
+  },
+};
+
 export interface ExperienceGeneratorRequest {
   job_role: string;
   job_description: string;
   points_count: number[];
   additional_instruction: string;
+  application_id?: string;
 }
 
 export interface GeneratedExperienceItem {
@@ -495,6 +517,7 @@ export interface ProjectGeneratorRequest {
   job_description: string;
   points_count: number[];
   additional_instruction: string;
+  application_id?: string;
 }
 
 export interface GeneratedProjectItem {
@@ -530,6 +553,7 @@ export interface SkillsGeneratorRequest {
   include_web_research: boolean;
   experience_data: GeneratedExperienceItem[];
   project_data: GeneratedProjectItem[];
+  application_id?: string;
 }
 
 export interface GeneratedSkillCategory {